@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+import os
+import sys
+
+from pipelines.deployments import require_configs, selected_deployments
+from pipelines.synth_cache import SynthCache
+
+# Both deployment styles unless narrowed: `cdk synth -c deployments=rolling` or CDK_DEPLOYMENTS=bluegreen
+DEPLOYMENTS = selected_deployments()
+
+# Checks each deployment's .env up front: a bad setting fails here, before the jsii runtime starts
+require_configs(DEPLOYMENTS)
+
+# Checked before importing aws_cdk, so a cache hit costs no jsii start-up
+synth_cache = SynthCache.from_environment(os.path.dirname(os.path.abspath(__file__)), DEPLOYMENTS)
+if __name__ == "__main__" and synth_cache.hit():
+    sys.exit(0)
+
+from pipelines.app import build_app  # noqa: E402
+from pipelines.template_budget import TemplateBudgetError  # noqa: E402
+
+
+def main(outdir=None):
+    build_app(DEPLOYMENTS, outdir=outdir)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except TemplateBudgetError as exc:
+        sys.exit(str(exc))
+    synth_cache.store()
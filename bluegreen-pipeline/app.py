@@ -1,35 +1,35 @@
 #!/usr/bin/env python3
-from aws_cdk import App, Environment
-from utils.config import get_config
-from stacks.base_stack import BaseStack      # Example: if you named base stack so
-from stacks.app_stack import AppStack
-
-def main():
-    app = App()                # Now App will be recognized
-    config = get_config()
-    env_name = config["ENV"]
-    cdk_env = Environment(account=config["ACCOUNT"], region=config["REGION"])
-
-    base_stack = BaseStack(
-        app,
-        f"{config['PROJECT_NAME']}-{env_name}-BaseStack",
-        config=config,
-        env_name=env_name,
-        env=cdk_env,
-    )
-
-    app_stack = AppStack(
-        app,
-        f"{config['PROJECT_NAME']}-{env_name}-AppStack",
-        config=config,
-        env_name=env_name,
-        env=cdk_env,
-        base_stack=base_stack,
-    )
-
-    app_stack.add_dependency(base_stack)
-
-    app.synth()
+import os
+import sys
+
+# The stacks live in the shared package at the repository root; ../app.py synthesizes both styles at once
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(APP_DIR))
+
+from pipelines.deployments import require_configs  # noqa: E402
+from pipelines.synth_cache import SynthCache  # noqa: E402
+
+DEPLOYMENTS = ("bluegreen",)
+
+# Checks each deployment's .env up front: a bad setting fails here, before the jsii runtime starts
+require_configs(DEPLOYMENTS)
+
+# Checked before importing aws_cdk, so a cache hit costs no jsii start-up
+synth_cache = SynthCache.from_environment(APP_DIR, DEPLOYMENTS)
+if __name__ == "__main__" and synth_cache.hit():
+    sys.exit(0)
+
+from pipelines.app import build_app  # noqa: E402
+from pipelines.template_budget import TemplateBudgetError  # noqa: E402
+
+
+def main(outdir=None):
+    build_app(DEPLOYMENTS, outdir=outdir)
+
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    except TemplateBudgetError as exc:
+        sys.exit(str(exc))
+    synth_cache.store()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The stacks live in the shared package at the repository root, as in ../app.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
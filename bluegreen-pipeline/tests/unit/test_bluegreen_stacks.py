@@ -0,0 +1,49 @@
+import aws_cdk as core
+import aws_cdk.assertions as assertions
+import pytest
+
+from pipelines.app import add_deployment
+
+
+@pytest.fixture
+def bluegreen(monkeypatch):
+    """Builds the blue/green deployment from .env, with any settings given on top."""
+    def build(**settings):
+        for name, value in settings.items():
+            monkeypatch.setenv(name, value)
+        return add_deployment(core.App(), "bluegreen")
+    return build
+
+
+def test_task_count_bounds_come_from_config(bluegreen):
+    _, app_stack = bluegreen(DESIRED_COUNT="3", MIN_CAPACITY="2", MAX_CAPACITY="8",
+                             TASK_CPU="1024", TASK_MEMORY_MIB="2048")
+    template = assertions.Template.from_stack(app_stack.ecs_stack)
+    template.has_resource_properties("AWS::ECS::Service", {
+        "DesiredCount": 3,
+        "DeploymentController": {"Type": "CODE_DEPLOY"},
+    })
+    template.has_resource_properties("AWS::ApplicationAutoScaling::ScalableTarget", {
+        "MinCapacity": 2,
+        "MaxCapacity": 8,
+        "ScalableDimension": "ecs:service:DesiredCount",
+    })
+    template.has_resource_properties("AWS::ECS::TaskDefinition", {"Cpu": "1024", "Memory": "2048"})
+
+
+def test_blue_and_green_target_groups(bluegreen):
+    base_stack, _ = bluegreen()
+    template = assertions.Template.from_stack(base_stack.alb_stack)
+    template.resource_count_is("AWS::ElasticLoadBalancingV2::TargetGroup", 2)
+
+
+def test_service_is_deployed_by_codedeploy(bluegreen):
+    _, app_stack = bluegreen()
+    assertions.Template.from_stack(app_stack.deploy_stack).resource_count_is("AWS::CodeDeploy::DeploymentGroup", 1)
+
+
+def test_subnets_are_planned_for_two_task_sets(bluegreen):
+    # CodeDeploy runs both task sets in full whatever the setting says
+    base_stack, _ = bluegreen(MAX_CAPACITY="150", DEPLOYMENT_MAX_PERCENT="100")
+    plan = base_stack.network_stack.subnet_plan
+    assert plan.peak_tasks == 300
@@ -0,0 +1,88 @@
+import argparse
+import fnmatch
+import json
+import sys
+from dataclasses import asdict
+
+from pipelines.template_budget import (
+    DEFAULT_BUDGETS, DEFAULT_HISTORY, METRICS, check, collect, format_report, load_budgets, load_history, record,
+    trend,
+)
+
+COMMANDS = ("check", "history")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Template size and resource-count budgets of a synthesized app")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    check_parser = commands.add_parser(
+        "check", help="Report every template's size and counts against the budgets and CloudFormation limits")
+    check_parser.add_argument("cdk_out", nargs="?", default="cdk.out", help="Cloud assembly directory")
+    check_parser.add_argument("--budgets", default=DEFAULT_BUDGETS, help="JSON budgets (default: template-budgets.json)")
+    check_parser.add_argument("--history", default=DEFAULT_HISTORY, help="JSON-lines history of template stats")
+    check_parser.add_argument("--record", action="store_true", help="Append to the history if anything changed")
+    check_parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+
+    history_parser = commands.add_parser("history", help="Show how templates grew over recorded runs")
+    history_parser.add_argument("--history", default=DEFAULT_HISTORY)
+    history_parser.add_argument("--stack", default="*", help="fnmatch pattern of stack names")
+    history_parser.add_argument("--metric", choices=METRICS, default="size_bytes")
+
+    args = parser.parse_args(argv)
+    if args.command == "check":
+        try:
+            args.budgets = load_budgets(args.budgets)
+        except ValueError as exc:
+            parser.error(str(exc))
+    return args
+
+
+def check_command(args):
+    stats = collect(args.cdk_out)
+    if not stats:
+        sys.exit(f"No templates in {args.cdk_out}; run cdk synth first")
+    findings = check(stats, args.budgets)
+    history = load_history(args.history)
+    changes = trend(stats, history)
+    if args.record:
+        record(stats, args.history, history)
+
+    if args.json:
+        json.dump({
+            "templates": [asdict(template) for template in stats],
+            "findings": [asdict(finding) for finding in findings],
+            "changes": changes,
+        }, sys.stdout, indent=2)
+        print()
+    else:
+        print(format_report(stats, findings, changes))
+    if any(finding.level != "warn" for finding in findings):
+        sys.exit(1)
+
+
+def history_command(args):
+    rows = {}
+    for run in load_history(args.history):
+        for template in run["templates"]:
+            if fnmatch.fnmatchcase(template["stack"], args.stack):
+                rows.setdefault(template["stack"], []).append((run["commit"] or "?", template[args.metric]))
+    for stack, values in sorted(rows.items()):
+        print(stack)
+        previous = None
+        for commit, value in values:
+            change = "" if previous is None else f" ({value - previous:+d})"
+            print(f"  {commit:<10} {value:>9}{change}")
+            previous = value
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    {
+        "check": check_command,
+        "history": history_command,
+    }[args.command](args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import argparse
+import json
+import sys
+
+from synthbench.runner import (
+    DEFAULT_APPS, DEFAULT_RESULTS, append_result, baseline_for, benchmark_app, compare, format_comparison,
+    format_record, load_results,
+)
+
+COMMANDS = ("synth", "history")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks for the CDK apps")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    synth_parser = commands.add_parser(
+        "synth", help="Time cold and warm synthesis of CDK apps, phase by phase, and record the results")
+    synth_parser.add_argument("--app", action="append", metavar="DIR",
+                              help="CDK app directory (repeatable, default: this one, ../bluegreen-pipeline "
+                                   "and the shared app in ..)")
+    synth_parser.add_argument("--runs", type=int, default=5, help="Fresh processes per app (cold syntheses)")
+    synth_parser.add_argument("--warm", type=int, default=3,
+                              help="Further syntheses in each process after the cold one")
+    synth_parser.add_argument("--results", default=DEFAULT_RESULTS, help="JSON-lines history of results")
+    synth_parser.add_argument("--no-record", action="store_true", help="Do not append to the history")
+    synth_parser.add_argument("--threshold-pct", type=float, default=10.0,
+                              help="Slow-down against the previous commit that counts as a regression")
+    synth_parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+
+    history_parser = commands.add_parser("history", help="Show recorded synth timings over commits")
+    history_parser.add_argument("--results", default=DEFAULT_RESULTS)
+    history_parser.add_argument("--app", help="Only this app (directory name)")
+    history_parser.add_argument("--mode", choices=("cold", "warm"), default="cold")
+    return parser.parse_args(argv)
+
+
+def synth_command(args):
+    history = load_results(args.results)
+    reports = []
+    regressions = 0
+    for app_dir in args.app or DEFAULT_APPS:
+        record = benchmark_app(app_dir, args.runs, args.warm)
+        baseline = baseline_for(history, record)
+        rows = compare(baseline, record, args.threshold_pct) if baseline else []
+        regressions += sum(row["regression"] for row in rows)
+        reports.append({"result": record, "baseline": baseline and baseline["commit"], "comparison": rows})
+        if not args.no_record:
+            append_result(args.results, record)
+
+    if args.json:
+        json.dump(reports, sys.stdout, indent=2)
+        print()
+    else:
+        for report in reports:
+            print(format_record(report["result"]))
+            if report["baseline"]:
+                print(f"  against {report['baseline']}:")
+                print(format_comparison(report["comparison"]))
+            print()
+    if regressions:
+        print(f"{regressions} synth timing regression(s) against the previous commit", file=sys.stderr)
+        sys.exit(1)
+
+
+def history_command(args):
+    print(f"{'app':<20} {'commit':<10} {'cdk':<9} {'import_cdk':>10} {'import_app':>10} "
+          f"{'construct':>10} {'synth':>10} {'total':>10}")
+    for record in load_results(args.results, args.app):
+        summary = record.get(args.mode)
+        if summary is None:
+            continue
+        commit = record["commit"] + ("+" if record["dirty"] else "")
+        print(f"{record['app']:<20} {commit:<10} {record['cdk_version'] or '?':<9} "
+              f"{summary.get('import_aws_cdk', 0):>9.3f}s {summary.get('import_app', 0):>9.3f}s "
+              f"{summary['construct']:>9.3f}s {summary['synth']:>9.3f}s {summary['total']:>9.3f}s")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    {
+        "synth": synth_command,
+        "history": history_command,
+    }[args.command](args)
+
+
+if __name__ == "__main__":
+    main()
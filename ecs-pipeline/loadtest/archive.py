@@ -0,0 +1,139 @@
+"""Compact binary archive of one load-test run.
+
+Layout (all integers little-endian):
+
+    magic             8 bytes  b"LTRUN\\x00\\x01\\x00"
+    metadata          u32 length + UTF-8 JSON (config, totals, per-task/version/node breakdowns, interval length)
+    corrected         u32 length + sparse histogram (see Histogram.to_bytes)
+    uncorrected       u32 length + sparse histogram
+    interval columns  one array per field, n entries each, in COLUMNS order
+    interval latency  concatenated sparse histograms, lengths in the "latency_len" column
+
+Per-interval values are stored column-wise in ``array`` buffers, so an
+hour-long run at one-second intervals takes a few hundred KB.
+"""
+import json
+import struct
+import sys
+from array import array
+from dataclasses import asdict, fields
+
+from loadtest.engine import LoadTestConfig, RunResult
+from loadtest.histogram import Histogram
+from loadtest.stats import Stats
+from loadtest.timeseries import Interval, IntervalSeries
+
+MAGIC = b"LTRUN\x00\x01\x00"
+_LENGTH = struct.Struct("<I")
+
+# (column name, array typecode)
+COLUMNS = (
+    ("index", "I"),
+    ("start", "d"),
+    ("requests", "Q"),
+    ("connect", "Q"),
+    ("timeout", "Q"),
+    ("5xx", "Q"),
+    ("other", "Q"),
+    ("latency_len", "I"),
+)
+ERROR_COLUMNS = ("connect", "timeout", "5xx", "other")
+
+
+def _little_endian(values: array) -> array:
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+def save(path: str, config: LoadTestConfig, result: RunResult):
+    intervals = [] if result.intervals is None else [
+        result.intervals.intervals[i] for i in sorted(result.intervals.intervals)
+    ]
+    columns = {name: array(code) for name, code in COLUMNS}
+    blobs = []
+    for interval in intervals:
+        blob = interval.latency.to_bytes()
+        interval.freeze()
+        blobs.append(blob)
+        columns["index"].append(interval.index)
+        columns["start"].append(interval.start)
+        columns["requests"].append(interval.stats.requests)
+        for name in ERROR_COLUMNS:
+            columns[name].append(interval.stats.errors[name])
+        columns["latency_len"].append(len(blob))
+
+    metadata = json.dumps({
+        "config": asdict(config),
+        "started_at": result.started_at,
+        "elapsed": result.elapsed,
+        "connections_opened": result.connections_opened,
+        "stats": result.stats.state(),
+        "meta": result.meta,
+        "breakdowns": result.breakdown_state(),
+        "interval_length": config.interval,
+        "intervals": len(intervals),
+    }).encode()
+
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        for section in (metadata, result.corrected.to_bytes(), result.uncorrected.to_bytes()):
+            f.write(_LENGTH.pack(len(section)))
+            f.write(section)
+        for name, _ in COLUMNS:
+            f.write(_little_endian(columns[name]).tobytes())
+        for blob in blobs:
+            f.write(blob)
+
+
+def load(path: str):
+    """Read an archive back as ``(LoadTestConfig, RunResult)``."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[: len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not a load-test archive")
+    offset = len(MAGIC)
+
+    sections = []
+    for _ in range(3):
+        (length,) = _LENGTH.unpack_from(data, offset)
+        offset += _LENGTH.size
+        sections.append(data[offset : offset + length])
+        offset += length
+    metadata = json.loads(sections[0])
+
+    # Ignore config keys this version does not know about
+    known = {field.name for field in fields(LoadTestConfig)}
+    config = LoadTestConfig(**{k: v for k, v in metadata["config"].items() if k in known})
+
+    result = RunResult()
+    result.started_at = metadata["started_at"]
+    result.elapsed = metadata["elapsed"]
+    result.connections_opened = metadata["connections_opened"]
+    result.stats = Stats.from_state(metadata["stats"])
+    result.meta = metadata.get("meta", {})
+    result.load_breakdowns(metadata.get("breakdowns", {}))
+    result.corrected = Histogram.from_bytes(sections[1])
+    result.uncorrected = Histogram.from_bytes(sections[2])
+
+    n = metadata["intervals"]
+    columns = {}
+    for name, code in COLUMNS:
+        values = array(code)
+        size = values.itemsize * n
+        values.frombytes(data[offset : offset + size])
+        columns[name] = _little_endian(values)
+        offset += size
+
+    result.intervals = series = IntervalSeries(metadata["interval_length"], result.started_at)
+    for i in range(n):
+        interval = Interval(columns["index"][i], columns["start"][i])
+        interval.stats.requests = columns["requests"][i]
+        for name in ERROR_COLUMNS:
+            interval.stats.errors[name] = columns[name][i]
+        length = columns["latency_len"][i]
+        interval.latency.merge(Histogram.from_bytes(data[offset : offset + length]))
+        interval.freeze()
+        offset += length
+        series.add(interval)
+    return config, result
@@ -0,0 +1,351 @@
+import asyncio
+import socket
+from collections import Counter
+from typing import NamedTuple, Optional
+from urllib.parse import urlsplit
+
+
+class ConnectError(ConnectionError):
+    """Raised when a new connection to the target cannot be established."""
+
+
+class Target(NamedTuple):
+    host: str
+    port: int
+    path: str
+
+    @classmethod
+    def from_url(cls, url: str) -> "Target":
+        parts = urlsplit(url)
+        if parts.scheme != "http":
+            raise ValueError(f"Only plain http:// targets are supported, got {url!r}")
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        return cls(parts.hostname, parts.port or 80, path)
+
+    def build_request(self, path: Optional[str] = None) -> bytes:
+        return (
+            f"GET {path or self.path} HTTP/1.1\r\n"
+            f"Host: {self.host}\r\n"
+            "User-Agent: ecs-pipeline-loadtest\r\n"
+            "Accept: */*\r\n"
+            "\r\n"
+        ).encode("latin-1")
+
+
+class Response(NamedTuple):
+    status: int
+    headers: dict
+    body: bytes
+    address: Optional[str] = None  # IP the connection was opened to
+
+
+class HttpConnection(asyncio.Protocol):
+    """A single keep-alive HTTP/1.1 connection with one request in flight."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, address: Optional[str] = None):
+        self._loop = loop
+        self.address = address
+        self._transport = None
+        self._buffer = bytearray()
+        self._waiter = None
+        self._timer = None
+        self._head = None
+        self._remaining = 0
+        self._chunked = False
+        self._body = bytearray()
+        self.reusable = True
+
+    # asyncio.Protocol callbacks
+
+    def connection_made(self, transport):
+        self._transport = transport
+
+    def connection_lost(self, exc):
+        self.reusable = False
+        self._transport = None
+        if self._waiter is not None and not self._waiter.done():
+            # Responses without a length are delimited by the server closing
+            if self._head is not None and self._remaining is None:
+                self._body += self._buffer
+                self._finish()
+            else:
+                self._fail(exc or ConnectionResetError("Connection closed by server"))
+
+    def data_received(self, data):
+        self._buffer += data
+        if self._waiter is not None:
+            self._parse()
+
+    # Request/response handling
+
+    async def request(self, raw_request: bytes, timeout: float) -> Response:
+        if self._transport is None:
+            raise ConnectionResetError("Connection is closed")
+        self._waiter = self._loop.create_future()
+        self._timer = self._loop.call_later(timeout, self._on_timeout)
+        self._transport.write(raw_request)
+        return await self._waiter
+
+    def close(self):
+        self.reusable = False
+        if self._transport is not None:
+            self._transport.close()
+
+    def _on_timeout(self):
+        self._timer = None
+        self._fail(asyncio.TimeoutError("Request timed out"))
+        self.close()
+
+    def _fail(self, exc):
+        waiter, self._waiter = self._waiter, None
+        self._reset()
+        if waiter is not None and not waiter.done():
+            waiter.set_exception(exc)
+
+    def _reset(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._head = None
+        self._chunked = False
+        self._body = bytearray()
+
+    def _finish(self):
+        status, headers = self._head
+        response = Response(status, headers, bytes(self._body), self.address)
+        if headers.get("connection", "").lower() == "close":
+            self.reusable = False
+        waiter, self._waiter = self._waiter, None
+        self._reset()
+        if waiter is not None and not waiter.done():
+            waiter.set_result(response)
+
+    def _parse(self):
+        buf = self._buffer
+        if self._head is None:
+            end = buf.find(b"\r\n\r\n")
+            if end < 0:
+                return
+            lines = buf[:end].decode("latin-1").split("\r\n")
+            del buf[: end + 4]
+            try:
+                status = int(lines[0].split(" ", 2)[1])
+            except (IndexError, ValueError):
+                self._fail(ConnectionError(f"Malformed status line: {lines[0]!r}"))
+                self.close()
+                return
+            headers = {}
+            for line in lines[1:]:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            self._head = (status, headers)
+            if "chunked" in headers.get("transfer-encoding", "").lower():
+                self._chunked = True
+                self._remaining = 0
+            elif "content-length" in headers:
+                self._remaining = int(headers["content-length"])
+            elif status in (204, 304) or 100 <= status < 200:
+                self._remaining = 0
+            else:
+                # Body runs until the server closes the connection
+                self._remaining = None
+                self.reusable = False
+
+        if self._remaining is None:
+            self._body += buf
+            buf.clear()
+            return
+
+        if self._chunked:
+            self._parse_chunks()
+            return
+
+        take = min(self._remaining, len(buf))
+        self._body += buf[:take]
+        del buf[:take]
+        self._remaining -= take
+        if self._remaining == 0:
+            self._finish()
+
+    def _parse_chunks(self):
+        buf = self._buffer
+        while True:
+            if self._remaining > 0:
+                # Chunk data plus its trailing CRLF
+                if len(buf) < self._remaining + 2:
+                    return
+                self._body += buf[: self._remaining]
+                del buf[: self._remaining + 2]
+                self._remaining = 0
+            end = buf.find(b"\r\n")
+            if end < 0:
+                return
+            size = int(bytes(buf[:end]).split(b";", 1)[0], 16)
+            if size == 0:
+                # Last chunk: skip optional trailers up to the blank line
+                if len(buf) < end + 4:
+                    return
+                if buf[end + 2 : end + 4] == b"\r\n":
+                    del buf[: end + 4]
+                else:
+                    trailer_end = buf.find(b"\r\n\r\n", end + 2)
+                    if trailer_end < 0:
+                        return
+                    del buf[: trailer_end + 4]
+                self._finish()
+                return
+            del buf[: end + 2]
+            self._remaining = size
+
+
+class ConnectionPool:
+    """Bounded pool of keep-alive connections to a single target.
+
+    At most ``max_connections`` requests are in flight, one per connection,
+    and the pool never holds more sockets than that. Idle connections are
+    reused most-recently-released first, so a light load keeps few sockets.
+
+    The target host is resolved up front and again every ``resolve_interval``
+    seconds (never when None). Requests take turns over the resolved
+    addresses, opening a connection to the next one when it has none idle, so
+    load spreads evenly over every node behind a DNS name such as an ALB's.
+    Connections to addresses that drop out of DNS are closed. Only addresses of
+    ``family`` are used: IPv4 by default, since a dual-stack name also returns
+    IPv6 addresses that a host without an IPv6 route cannot connect to.
+    """
+
+    def __init__(self, target: Target, max_connections: int, timeout: float,
+                 resolve_interval: Optional[float] = None, family: int = socket.AF_INET):
+        self.target = target
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.resolve_interval = resolve_interval
+        self.family = family
+        self.opened = 0
+        self.opened_per_address = Counter()
+        self.addresses = []
+        self.resolutions = 0
+        self._slots = asyncio.Semaphore(max_connections)
+        self._idle = {}  # address -> stack of idle connections
+        self._connections = set()
+        self._opening = 0
+        self._turn = 0
+        self._next_resolve = None
+        self._resolving = None
+
+    async def _resolve(self):
+        loop = asyncio.get_running_loop()
+        try:
+            infos = await asyncio.wait_for(
+                loop.getaddrinfo(self.target.host, self.target.port, family=self.family, type=socket.SOCK_STREAM),
+                self.timeout,
+            )
+            addresses = sorted({info[4][0] for info in infos})
+            if addresses:
+                self.addresses = addresses
+                self.resolutions += 1
+                for address in [a for a in self._idle if a not in addresses]:
+                    for conn in self._idle.pop(address):
+                        conn.close()
+                        self._connections.discard(conn)
+        finally:
+            self._resolving = None
+            if self.resolve_interval:
+                self._next_resolve = loop.time() + self.resolve_interval
+
+    async def _ensure_resolved(self):
+        # Openers racing for the first lookup all wait on the same one
+        if self.addresses:
+            return
+        if self._resolving is None:
+            self._resolving = asyncio.ensure_future(self._resolve())
+        try:
+            await asyncio.shield(self._resolving)
+        except (OSError, asyncio.TimeoutError) as exc:
+            raise ConnectError(f"Cannot resolve {self.target.host}: {exc!r}") from exc
+        if not self.addresses:
+            raise ConnectError(f"{self.target.host} resolved to no addresses")
+
+    def _maybe_refresh(self):
+        # Re-resolution runs in the background; on failure the old addresses stay
+        if (self._next_resolve is not None and self._resolving is None
+                and asyncio.get_running_loop().time() >= self._next_resolve):
+            self._resolving = asyncio.ensure_future(self._resolve())
+            self._resolving.add_done_callback(lambda task: task.cancelled() or task.exception())
+
+    async def _open(self, address: str) -> HttpConnection:
+        loop = asyncio.get_running_loop()
+        self._opening += 1
+        try:
+            _, conn = await asyncio.wait_for(
+                loop.create_connection(
+                    lambda: HttpConnection(loop, address), address, self.target.port
+                ),
+                self.timeout,
+            )
+        except (OSError, asyncio.TimeoutError) as exc:
+            raise ConnectError(f"Cannot connect to {self.target.host} ({address}):{self.target.port}: {exc!r}") from exc
+        finally:
+            self._opening -= 1
+        self.opened += 1
+        self.opened_per_address[address] += 1
+        self._connections.add(conn)
+        return conn
+
+    def _pop_idle(self, address: str) -> Optional[HttpConnection]:
+        stack = self._idle.get(address)
+        while stack:
+            conn = stack.pop()
+            if conn.reusable:
+                return conn
+            self._connections.discard(conn)
+        return None
+
+    async def acquire(self) -> HttpConnection:
+        await self._slots.acquire()
+        try:
+            await self._ensure_resolved()
+            address = self.addresses[self._turn % len(self.addresses)]
+            self._turn += 1
+            conn = self._pop_idle(address)
+            if conn is not None:
+                return conn
+            if len(self._connections) + self._opening >= self.max_connections:
+                # Every socket is taken: reuse an idle one to another address
+                for other in list(self._idle):
+                    conn = self._pop_idle(other)
+                    if conn is not None:
+                        return conn
+            return await self._open(address)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, conn: HttpConnection):
+        if conn.reusable and conn.address in self.addresses:
+            self._idle.setdefault(conn.address, []).append(conn)
+        else:
+            conn.close()
+            self._connections.discard(conn)
+        self._slots.release()
+        self._maybe_refresh()
+
+    async def request(self, raw_request: bytes) -> Response:
+        conn = await self.acquire()
+        try:
+            return await conn.request(raw_request, self.timeout)
+        except BaseException:
+            conn.close()
+            raise
+        finally:
+            self.release(conn)
+
+    def close(self):
+        if self._resolving is not None:
+            self._resolving.cancel()
+        for conn in list(self._connections):
+            conn.close()
+        self._connections.clear()
+        self._idle.clear()
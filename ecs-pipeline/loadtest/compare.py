@@ -0,0 +1,170 @@
+import math
+from collections import OrderedDict
+
+from loadtest.engine import LoadTestConfig, RunResult
+from loadtest.histogram import Histogram
+from loadtest.timeseries import INTERVAL_SUB_BUCKET_BITS
+
+# (metric, True when higher is better)
+LATENCY_PERCENTILES = (50, 90, 99)
+METRICS = (("throughput_rps", True),) + tuple((f"p{p}_ms", False) for p in LATENCY_PERCENTILES)
+
+
+class PhaseSummary:
+    """Totals and per-interval samples of one profile phase (or the whole run)."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.requests = 0
+        self.errors = 0
+        self.duration = 0.0
+        self.latency = Histogram(INTERVAL_SUB_BUCKET_BITS)
+        self.samples = {metric: [] for metric, _ in METRICS}
+
+    def add(self, interval, length: float):
+        latency = interval.latency
+        self.requests += interval.stats.requests
+        self.errors += sum(interval.stats.errors.values())
+        self.duration += length
+        self.latency.merge(latency)
+        self.samples["throughput_rps"].append(interval.stats.requests / length)
+        if latency.total:
+            for p in LATENCY_PERCENTILES:
+                self.samples[f"p{p}_ms"].append(latency.value_at_percentile(p) / 1000)
+        interval.freeze()
+
+    def value(self, metric: str) -> float:
+        if metric == "throughput_rps":
+            return self.requests / self.duration if self.duration else 0.0
+        percentile = float(metric[1:-3])
+        return self.latency.value_at_percentile(percentile) / 1000
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.requests if self.requests else 0.0
+
+
+def summarize_phases(config: LoadTestConfig, result: RunResult) -> "OrderedDict[str, PhaseSummary]":
+    profile = config.load_profile()
+    length = config.interval
+    phases = OrderedDict()
+    series = result.intervals.intervals if result.intervals is not None else {}
+    for index in sorted(series):
+        offset = index * length
+        # A partial last interval would drag the throughput samples down
+        if offset + length > result.elapsed + 1e-6:
+            continue
+        if profile is not None:
+            phase_index = profile.phase_index_at(offset)
+            name = f"{phase_index + 1}-{profile.phases[phase_index].name}"
+        else:
+            name = "run"
+        if name not in phases:
+            phases[name] = PhaseSummary(name)
+        phases[name].add(series[index], length)
+    return phases
+
+
+def mann_whitney_p(a, b) -> float:
+    """Two-sided Mann-Whitney U test p-value (normal approximation, tie corrected)."""
+    n1, n2 = len(a), len(b)
+    n = n1 + n2
+    values = sorted([(v, 0) for v in a] + [(v, 1) for v in b])
+    rank_sum_a = 0.0
+    tie_term = 0.0
+    i = 0
+    while i < n:
+        j = i
+        while j + 1 < n and values[j + 1][0] == values[i][0]:
+            j += 1
+        rank = (i + j) / 2 + 1
+        ties = j - i + 1
+        tie_term += ties ** 3 - ties
+        rank_sum_a += rank * sum(1 for k in range(i, j + 1) if values[k][1] == 0)
+        i = j + 1
+    u = rank_sum_a - n1 * (n1 + 1) / 2
+    sigma = math.sqrt(n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1))))
+    if sigma == 0:
+        return 1.0
+    z = max(abs(u - n1 * n2 / 2) - 0.5, 0.0) / sigma
+    return math.erfc(z / math.sqrt(2))
+
+
+def can_reach_alpha(n1: int, n2: int, alpha: float) -> bool:
+    """Whether samples of these sizes can be significant at ``alpha`` at all.
+
+    The smallest p-value two samples can give is that of a complete
+    separation; at ``alpha=0.01`` that takes 6 intervals per run.
+    """
+    return n1 > 0 and n2 > 0 and mann_whitney_p(range(n1), range(n1, n1 + n2)) < alpha
+
+
+def error_rate_p(errors_a: int, total_a: int, errors_b: int, total_b: int) -> float:
+    """One-sided two-proportion z-test p-value that run b has a higher error rate."""
+    if not total_a or not total_b:
+        return 1.0
+    pooled = (errors_a + errors_b) / (total_a + total_b)
+    sigma = math.sqrt(pooled * (1 - pooled) * (1 / total_a + 1 / total_b))
+    if sigma == 0:
+        return 1.0
+    z = (errors_b / total_b - errors_a / total_a) / sigma
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def compare_phases(baseline, candidate, threshold_pct: float = 5.0, alpha: float = 0.01) -> list:
+    """Rows for every metric of every phase present in both runs.
+
+    A row is a regression when the candidate is worse by more than
+    ``threshold_pct`` percent and the difference is significant at ``alpha``.
+    """
+    rows = []
+    for name, base in baseline.items():
+        cand = candidate.get(name)
+        if cand is None:
+            continue
+        for metric, higher_is_better in METRICS:
+            base_value, cand_value = base.value(metric), cand.value(metric)
+            change = (cand_value - base_value) / base_value * 100 if base_value else 0.0
+            worse = -change if higher_is_better else change
+            a, b = base.samples[metric], cand.samples[metric]
+            # Too few intervals can never show a significant change; such rows are not a pass
+            insufficient = not can_reach_alpha(len(a), len(b), alpha)
+            p_value = None if insufficient else mann_whitney_p(a, b)
+            rows.append({
+                "phase": name,
+                "metric": metric,
+                "baseline": round(base_value, 3),
+                "candidate": round(cand_value, 3),
+                "change_pct": round(change, 2),
+                "p_value": None if p_value is None else round(p_value, 5),
+                "regression": worse > threshold_pct and p_value is not None and p_value < alpha,
+                "insufficient_samples": insufficient,
+            })
+
+        base_rate, cand_rate = base.error_rate, cand.error_rate
+        p_value = error_rate_p(base.errors, base.requests, cand.errors, cand.requests)
+        relative = (cand_rate - base_rate) / base_rate * 100 if base_rate else (100.0 if cand_rate else 0.0)
+        rows.append({
+            "phase": name,
+            "metric": "error_rate_pct",
+            "baseline": round(base_rate * 100, 4),
+            "candidate": round(cand_rate * 100, 4),
+            "change_pct": round(relative, 2),
+            "p_value": round(p_value, 5),
+            "regression": relative > threshold_pct and p_value < alpha,
+            "insufficient_samples": False,
+        })
+    return rows
+
+
+def format_rows(rows: list) -> str:
+    header = f"{'phase':<20} {'metric':<16} {'baseline':>12} {'candidate':>12} {'change':>9} {'p-value':>9}"
+    lines = [header, "-" * len(header)]
+    for row in rows:
+        p_value = "n/a" if row["p_value"] is None else f"{row['p_value']:.4f}"
+        flag = "  REGRESSION" if row["regression"] else "  INSUFFICIENT SAMPLES" if row["insufficient_samples"] else ""
+        lines.append(
+            f"{row['phase']:<20} {row['metric']:<16} {row['baseline']:>12} {row['candidate']:>12} "
+            f"{row['change_pct']:>+8.1f}% {p_value:>9}{flag}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,123 @@
+import re
+from typing import Optional
+
+from loadtest.client import Response
+from loadtest.tasks import TaskBreakdown
+
+# Response header set by the blue/green image (see bluegreen-pipeline/nginx.conf.template)
+VERSION_HEADER = "X-App-Version"
+# Green counts as fully shifted once it serves this share of an interval
+SHIFTED_PCT = 99.0
+
+
+class VersionClassifier:
+    """Reads the app version marker from a response header or, with a pattern, the body.
+
+    ``pattern`` is a regular expression whose first group (or whole match)
+    is the version, for images that only differ in the page they serve.
+    """
+
+    def __init__(self, header: str = VERSION_HEADER, pattern: Optional[str] = None):
+        self.header = header.lower()
+        self.pattern = re.compile(pattern.encode()) if pattern else None
+
+    @property
+    def source(self) -> str:
+        return f"body /{self.pattern.pattern.decode()}/" if self.pattern else self.header
+
+    def __call__(self, response: Response) -> Optional[str]:
+        if self.pattern is None:
+            return response.headers.get(self.header)
+        match = self.pattern.search(response.body)
+        if match is None:
+            return None
+        return (match.group(1) if match.groups() else match.group(0)).decode("utf-8", "replace")
+
+
+def _colors(versions: TaskBreakdown, blue: Optional[str], green: Optional[str]):
+    # Unless given, blue is whatever answered first and green the busiest other version
+    seen = sorted(versions.tasks, key=lambda v: versions.tasks[v].first_seen)
+    if blue is None and seen:
+        blue = seen[0]
+    if green is None:
+        others = [v for v in seen if v != blue]
+        if others:
+            green = max(others, key=lambda v: versions.tasks[v].requests)
+    return blue, green
+
+
+def _window(name: str, points: list, interval_length: float) -> dict:
+    requests = sum(p["requests"] for p in points)
+    errors = sum(p["errors"] for p in points)
+    p99 = [p["p99_ms"] for p in points if p["p99_ms"] is not None]
+    return {
+        "window": name,
+        "seconds": round(len(points) * interval_length, 3),
+        "requests": requests,
+        "errors": errors,
+        "error_rate_pct": round(100.0 * errors / requests, 3) if requests else 0.0,
+        "median_p99_ms": sorted(p99)[len(p99) // 2] if p99 else None,
+        "max_p99_ms": max(p99) if p99 else None,
+    }
+
+
+def cutover_report(versions: TaskBreakdown, intervals: list, interval_length: float, source: str,
+                   blue: Optional[str] = None, green: Optional[str] = None) -> dict:
+    """Traffic split, errors and tail latency per interval around a blue/green shift.
+
+    ``intervals`` is the report's interval list, in index order.
+    """
+    blue, green = _colors(versions, blue, green)
+    curve = []
+    for point in intervals:
+        index = int(round(point["offset_s"] / interval_length))
+        counts = {"blue": 0, "green": 0, "other": 0}
+        for version, task in versions.tasks.items():
+            color = "blue" if version == blue else "green" if version == green else "other"
+            counts[color] += task.per_interval.get(index, 0)
+        classified = counts["blue"] + counts["green"]
+        latency = point["latency_ms"]
+        curve.append({
+            "offset_s": point["offset_s"],
+            **counts,
+            "green_pct": round(100.0 * counts["green"] / classified, 2) if classified else None,
+            "requests": point["requests"],
+            "errors": sum(point["errors"].values()),
+            # Intervals with only connect errors or timeouts have no latency samples
+            "p99_ms": latency["p99"] if latency["max"] else None,
+            "max_ms": latency["max"] if latency["max"] else None,
+        })
+
+    first_green = next((i for i, p in enumerate(curve) if p["green"]), None)
+    last_blue = max((i for i, p in enumerate(curve) if p["blue"]), default=None)
+    shifted = None
+    if first_green is not None:
+        shifted = next((i for i in range(first_green, len(curve))
+                        if curve[i]["green_pct"] is not None and curve[i]["green_pct"] >= SHIFTED_PCT), None)
+
+    if first_green is None:
+        windows = [_window("before", curve, interval_length)]
+    else:
+        # "during" spans from the first green response to the last blue one
+        end = max(first_green, last_blue if last_blue is not None else first_green) + 1
+        windows = [
+            _window("before", curve[:first_green], interval_length),
+            _window("during", curve[first_green:end], interval_length),
+            _window("after", curve[end:], interval_length),
+        ]
+
+    def offset(i):
+        return curve[i]["offset_s"] if i is not None else None
+
+    return {
+        "source": source,
+        "blue": blue,
+        "green": green,
+        "first_green_s": offset(first_green),
+        "last_blue_s": offset(last_blue),
+        "shifted_s": offset(shifted),
+        "shift_duration_s": round(offset(shifted) - offset(first_green), 3) if shifted is not None else None,
+        "unclassified": versions.untagged,
+        "windows": windows,
+        "curve": curve,
+    }
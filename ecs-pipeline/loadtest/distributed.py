@@ -0,0 +1,277 @@
+"""Coordinator/worker mode for spreading one load test over several hosts.
+
+Workers connect to the coordinator over plain TCP and exchange one JSON
+object per line:
+
+    worker       -> coordinator   {"type": "hello", "worker": name}
+    coordinator  -> worker        {"type": "ping", "t0": ...}            (clock sync, repeated)
+    worker       -> coordinator   {"type": "pong", "t0": ..., "t1": ...}
+    coordinator  -> worker        {"type": "start", "config": {...}, "start_at": ...}
+    worker       -> coordinator   {"type": "interval", ...}              (one per closed interval)
+    coordinator  -> worker        {"type": "stop"}                       (wind down early)
+    worker       -> coordinator   {"type": "result", ...}
+    worker       -> coordinator   {"type": "error", "message": ...}
+
+Histograms travel in their sparse binary encoding, base64 wrapped.
+"""
+import asyncio
+import base64
+import json
+import socket
+import sys
+import time
+from dataclasses import asdict
+from typing import Callable, Optional
+
+from loadtest.engine import STOP_POLL_INTERVAL, LoadTestConfig, RunResult, run_load
+from loadtest.histogram import Histogram
+from loadtest.live import LiveMerger
+from loadtest.multiproc import shard_config
+from loadtest.stats import Stats
+from loadtest.timeseries import Interval, IntervalSeries
+
+# Interval snapshots and results can be larger than asyncio's default 64 KiB line limit
+STREAM_LIMIT = 16 * 1024 * 1024
+CLOCK_SYNC_ROUNDS = 5
+# Grace period between sending start messages and the synchronized start
+START_DELAY = 2.0
+
+
+def parse_address(address: str, default_host: str = "0.0.0.0"):
+    host, _, port = address.rpartition(":")
+    return host or default_host, int(port)
+
+
+def _encode_histogram(hist: Histogram) -> str:
+    return base64.b64encode(hist.to_bytes()).decode("ascii")
+
+
+def _decode_histogram(data: str) -> Histogram:
+    return Histogram.from_bytes(base64.b64decode(data))
+
+
+def encode_interval(interval: Interval) -> dict:
+    message = {
+        "type": "interval",
+        "index": interval.index,
+        "start": interval.start,
+        "stats": interval.stats.state(),
+        "in_flight": interval.in_flight,
+        "latency": _encode_histogram(interval.latency),
+    }
+    interval.freeze()
+    return message
+
+
+def decode_interval(message: dict) -> Interval:
+    interval = Interval(message["index"], message["start"])
+    interval.stats = Stats.from_state(message["stats"])
+    interval.in_flight = message.get("in_flight", 0)
+    interval.latency.merge(_decode_histogram(message["latency"]))
+    interval.freeze()
+    return interval
+
+
+def encode_result(result: RunResult) -> dict:
+    # Intervals are streamed separately while the run is in progress
+    return {
+        "type": "result",
+        "stats": result.stats.state(),
+        "corrected": _encode_histogram(result.corrected),
+        "uncorrected": _encode_histogram(result.uncorrected),
+        "started_at": result.started_at,
+        "elapsed": result.elapsed,
+        "connections_opened": result.connections_opened,
+        "breakdowns": result.breakdown_state(),
+    }
+
+
+def decode_result(message: dict) -> RunResult:
+    result = RunResult()
+    result.stats = Stats.from_state(message["stats"])
+    result.corrected = _decode_histogram(message["corrected"])
+    result.uncorrected = _decode_histogram(message["uncorrected"])
+    result.started_at = message["started_at"]
+    result.elapsed = message["elapsed"]
+    result.connections_opened = message["connections_opened"]
+    result.load_breakdowns(message.get("breakdowns", {}))
+    return result
+
+
+async def _send(writer: asyncio.StreamWriter, message: dict):
+    writer.write(json.dumps(message).encode() + b"\n")
+    await writer.drain()
+
+
+async def _receive(reader: asyncio.StreamReader) -> dict:
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("Peer closed the connection")
+    return json.loads(line)
+
+
+class Coordinator:
+    """Waits for ``workers`` connections, shards the run and merges what they stream back."""
+
+    def __init__(self, config: LoadTestConfig, workers: int, listen: str = "0.0.0.0:7070",
+                 on_interval: Optional[Callable[[Interval], None]] = None,
+                 should_stop: Optional[Callable[[], bool]] = None):
+        self.config = config
+        self.shards = shard_config(config, workers)
+        if len(self.shards) < workers:
+            raise ValueError(f"--concurrency {config.concurrency} is too small to shard over {workers} workers")
+        self.host, self.port = parse_address(listen)
+        self.merged = RunResult()
+        self.live = LiveMerger(len(self.shards), on_interval) if on_interval else None
+        self.should_stop = should_stop
+        self._writers = []
+        self._stopping = False
+        self._joined = []
+        self._all_joined = None
+        self._start_at = None
+
+    async def _sync_clock(self, reader, writer) -> float:
+        # NTP-style offset estimate from the round trip with the lowest delay
+        best = None
+        for _ in range(CLOCK_SYNC_ROUNDS):
+            t0 = time.time()
+            await _send(writer, {"type": "ping", "t0": t0})
+            pong = await _receive(reader)
+            t2 = time.time()
+            rtt = t2 - t0
+            offset = pong["t1"] - (t0 + rtt / 2)
+            if best is None or rtt < best[0]:
+                best = (rtt, offset)
+        return best[1]
+
+    async def _session(self, reader, writer):
+        hello = await _receive(reader)
+        if hello.get("type") != "hello":
+            raise ConnectionError(f"Expected hello, got {hello!r}")
+        name = hello.get("worker", "?")
+        if len(self._joined) >= len(self.shards):
+            await _send(writer, {"type": "error", "message": "All worker slots are taken"})
+            return
+        index = len(self._joined)
+        self._joined.append(name)
+        print(f"Worker {index} joined: {name}", file=sys.stderr)
+        if len(self._joined) == len(self.shards):
+            self._start_at = time.time() + START_DELAY
+            self._all_joined.set()
+        await self._all_joined.wait()
+
+        offset = await self._sync_clock(reader, writer)
+        self._writers.append(writer)
+        await _send(writer, {
+            "type": "start",
+            "config": asdict(self.shards[index]),
+            "start_at": self._start_at + offset,
+        })
+
+        while True:
+            message = await _receive(reader)
+            kind = message.get("type")
+            if kind == "interval":
+                self.merged.intervals.add(decode_interval(message))
+                if self.live is not None:
+                    # Merging mutates intervals, so the live view gets its own copy
+                    self.live.add(index, decode_interval(message))
+            elif kind == "result":
+                self.merged.merge(decode_result(message))
+                return
+            elif kind == "error":
+                raise RuntimeError(f"Worker {name} failed: {message.get('message')}")
+
+    async def run(self) -> RunResult:
+        self._all_joined = asyncio.Event()
+        self.merged.intervals = IntervalSeries(self.config.interval, 0.0)
+        sessions = []
+
+        def on_connect(reader, writer):
+            sessions.append(asyncio.ensure_future(self._serve(reader, writer)))
+
+        server = await asyncio.start_server(on_connect, self.host, self.port, limit=STREAM_LIMIT)
+        print(f"Coordinator listening on {self.host}:{self.port}, waiting for "
+              f"{len(self.shards)} workers", file=sys.stderr)
+        async with server:
+            while len(sessions) < len(self.shards) or not all(s.done() for s in sessions):
+                await asyncio.sleep(STOP_POLL_INTERVAL)
+                if self.should_stop is not None and not self._stopping and self.should_stop():
+                    self._stopping = True
+                    for writer in self._writers:
+                        if not writer.is_closing():
+                            writer.write(json.dumps({"type": "stop"}).encode() + b"\n")
+                for session in sessions:
+                    if not session.done():
+                        continue
+                    # exception() raises CancelledError on a cancelled session
+                    if session.cancelled():
+                        raise RuntimeError("A worker session was cancelled before it sent its result")
+                    if session.exception() is not None:
+                        raise session.exception()
+
+        if self.live is not None:
+            self.live.flush()
+        self.merged.intervals.started_at = self.merged.started_at
+        self.merged.meta["workers"] = self._joined
+        return self.merged
+
+    async def _serve(self, reader, writer):
+        try:
+            await self._session(reader, writer)
+        finally:
+            writer.close()
+
+
+async def run_worker(coordinator: str, name: Optional[str] = None):
+    host, port = parse_address(coordinator, default_host="127.0.0.1")
+    reader, writer = await asyncio.open_connection(host, port, limit=STREAM_LIMIT)
+    await _send(writer, {"type": "hello", "worker": name or socket.gethostname()})
+    try:
+        while True:
+            message = await _receive(reader)
+            kind = message.get("type")
+            if kind == "ping":
+                await _send(writer, {"type": "pong", "t0": message["t0"], "t1": time.time()})
+            elif kind == "start":
+                break
+            elif kind == "error":
+                raise RuntimeError(f"Coordinator refused worker: {message.get('message')}")
+
+        config = LoadTestConfig(**message["config"])
+        await asyncio.sleep(max(0.0, message["start_at"] - time.time()))
+
+        def stream_interval(interval: Interval):
+            writer.write(json.dumps(encode_interval(interval)).encode() + b"\n")
+
+        stopped = asyncio.Event()
+
+        async def listen():
+            try:
+                while not stopped.is_set():
+                    if (await _receive(reader)).get("type") == "stop":
+                        stopped.set()
+            except ConnectionError:
+                pass
+
+        listening = asyncio.ensure_future(listen())
+        try:
+            result = await run_load(config, stream_interval, stopped.is_set)
+        except Exception as exc:
+            await _send(writer, {"type": "error", "message": repr(exc)})
+            raise
+        finally:
+            listening.cancel()
+        await _send(writer, encode_result(result))
+    finally:
+        writer.close()
+
+
+def worker_main(coordinator: str, name: Optional[str] = None):
+    asyncio.run(run_worker(coordinator, name))
+
+
+def run_coordinator(config: LoadTestConfig, workers: int, listen: str,
+                    on_interval: Optional[Callable[[Interval], None]] = None,
+                    should_stop: Optional[Callable[[], bool]] = None) -> RunResult:
+    return asyncio.run(Coordinator(config, workers, listen, on_interval, should_stop).run())
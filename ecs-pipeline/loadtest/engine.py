@@ -0,0 +1,404 @@
+import asyncio
+import socket
+import time
+from collections import Counter
+from dataclasses import dataclass, asdict
+from typing import Callable, Optional
+
+from loadtest.client import ConnectionPool, Target
+from loadtest.cutover import VERSION_HEADER, VersionClassifier, cutover_report
+from loadtest.histogram import Histogram
+from loadtest.profiles import LoadProfile
+from loadtest.replay import LogReplay
+from loadtest.scheduler import ArrivalProcess
+from loadtest.stats import Stats
+from loadtest.tasks import TASK_HEADER, TaskBreakdown
+from loadtest.timeseries import Interval, IntervalSeries
+
+# While a profile asks for no load, the scheduler re-checks the rate this often
+IDLE_POLL_INTERVAL = 0.05
+# How often a run checks whether it was asked to stop early
+STOP_POLL_INTERVAL = 0.1
+
+
+@dataclass
+class LoadTestConfig:
+    url: str = "http://65.2.40.5/"
+    concurrency: int = 50
+    connections: Optional[int] = None  # defaults to one per concurrent worker
+    duration: float = 60.0
+    requests: Optional[int] = None  # stop early after this many requests
+    timeout: float = 10.0
+    # Intended gap between requests of one worker, used for coordinated-omission
+    # correction. When unset each worker uses its own running mean latency.
+    expected_interval_ms: Optional[float] = None
+    # Open model: issue requests at this arrival rate (req/s) regardless of
+    # response latency. concurrency then caps the requests in flight.
+    rate: Optional[float] = None
+    arrival: str = "constant"
+    late_threshold_ms: float = 10.0  # sends delayed longer than this count as late
+    seed: Optional[int] = None
+    # Declarative load profile (see loadtest.profiles); overrides rate and duration
+    profile: Optional[dict] = None
+    interval: float = 1.0  # seconds per reported time-series interval
+    # Replay an ALB or nginx access log (plain or gzipped) with its original
+    # paths and timing, sped up by replay_speed; duration still caps the run
+    replay: Optional[str] = None
+    replay_speed: float = 1.0
+    # Fraction of the target rate generated by this process when sharded,
+    # and which slice of a replayed log it sends
+    share: float = 1.0
+    shard_index: int = 0
+    shard_count: int = 1
+    # Seconds between DNS lookups of the target host; new connections spread
+    # over every address returned (0: resolve once)
+    resolve_interval: float = 30.0
+    # Also connect to the target's IPv6 addresses; IPv4 only by default
+    ipv6: bool = False
+    # Response header naming the task that served a request, for the per-task report
+    task_header: str = TASK_HEADER
+    # Blue/green cutover mode: classify responses by the app version found in
+    # version_header, or in the body via version_pattern. blue/green_version
+    # default to the first version seen and the busiest other one.
+    cutover: bool = False
+    version_header: str = VERSION_HEADER
+    version_pattern: Optional[str] = None
+    blue_version: Optional[str] = None
+    green_version: Optional[str] = None
+
+    @property
+    def pool_size(self) -> int:
+        return self.connections or self.concurrency
+
+    @property
+    def open_model(self) -> bool:
+        return bool(self.rate or self.profile or self.replay)
+
+    def load_profile(self) -> Optional[LoadProfile]:
+        return LoadProfile.from_spec(self.profile) if self.profile else None
+
+    def version_classifier(self) -> VersionClassifier:
+        return VersionClassifier(self.version_header, self.version_pattern)
+
+    @property
+    def run_duration(self) -> float:
+        profile = self.load_profile()
+        return profile.duration if profile else self.duration
+
+
+class WorkerRecorder:
+    """Latency histograms owned by a single worker, merged after the run."""
+
+    def __init__(self, expected_interval_us: Optional[int]):
+        self.expected_interval_us = expected_interval_us
+        self.corrected = Histogram()
+        self.uncorrected = Histogram()
+
+    def record(self, latency_us: int):
+        self.uncorrected.record(latency_us)
+        interval = self.expected_interval_us or int(self.uncorrected.mean)
+        self.corrected.record_corrected(latency_us, interval)
+
+    def record_scheduled(self, intended_latency_us: int, latency_us: int):
+        # Measured from the intended send time the latency already includes
+        # any delay the client added, so no correction is needed.
+        self.corrected.record(intended_latency_us)
+        self.uncorrected.record(latency_us)
+
+
+class RunResult:
+    """Everything a run measured, kept mergeable across workers and processes."""
+
+    # Per-label splits of the responses: serving task, app version
+    # (cutover mode only) and the ALB node address the connection went to
+    BREAKDOWNS = ("tasks", "versions", "nodes")
+
+    def __init__(self):
+        self.stats = Stats()
+        self.corrected = Histogram()
+        self.uncorrected = Histogram()
+        self.started_at = 0.0
+        self.elapsed = 0.0
+        self.connections_opened = 0
+        self.intervals = None
+        self.tasks = None
+        self.versions = None
+        self.nodes = None
+        self.node_connections = Counter()
+        # Extra top-level report fields, e.g. the process count or worker names
+        self.meta = {}
+
+    def add_recorder(self, recorder: WorkerRecorder):
+        self.corrected.merge(recorder.corrected)
+        self.uncorrected.merge(recorder.uncorrected)
+
+    def merge(self, other: "RunResult"):
+        self.stats.merge(other.stats)
+        self.corrected.merge(other.corrected)
+        self.uncorrected.merge(other.uncorrected)
+        if not self.started_at or other.started_at < self.started_at:
+            self.started_at = other.started_at
+        self.elapsed = max(self.elapsed, other.elapsed)
+        self.connections_opened += other.connections_opened
+        if self.intervals is None:
+            self.intervals = other.intervals
+        elif other.intervals is not None:
+            self.intervals.merge(other.intervals)
+        self.node_connections.update(other.node_connections)
+        for name in self.BREAKDOWNS:
+            mine, theirs = getattr(self, name), getattr(other, name)
+            if mine is None:
+                setattr(self, name, theirs)
+            elif theirs is not None:
+                mine.merge(theirs)
+
+    def breakdown_state(self) -> dict:
+        """JSON-safe per-task, per-version and per-node data, read back by ``load_breakdowns``."""
+        state = {name: getattr(self, name).state() for name in self.BREAKDOWNS if getattr(self, name) is not None}
+        state["node_connections"] = dict(self.node_connections)
+        return state
+
+    def load_breakdowns(self, state: dict):
+        for name in self.BREAKDOWNS:
+            if state.get(name) is not None:
+                setattr(self, name, TaskBreakdown.from_state(state[name]))
+        self.node_connections.update(state.get("node_connections", {}))
+
+    def to_dict(self, config: LoadTestConfig) -> dict:
+        report = {
+            "config": asdict(config),
+            "started_at": self.started_at,
+            "elapsed_s": round(self.elapsed, 3),
+            "connections_opened": self.connections_opened,
+            "throughput_rps": round(self.stats.requests / self.elapsed, 1) if self.elapsed else 0.0,
+            **self.stats.to_dict(),
+            "latency_ms": self.corrected.summary(),
+            "latency_uncorrected_ms": self.uncorrected.summary(),
+        }
+        report.update(self.meta)
+        if config.replay:
+            report["replay"] = {
+                "log": config.replay,
+                "speed": config.replay_speed,
+                "skipped_lines": self.stats.skipped,
+            }
+        if config.open_model:
+            scheduled = self.stats.requests + self.stats.dropped
+            if config.profile or config.replay:
+                # The rate varies over the run: report what the schedule generated on average
+                target_rps = round(scheduled / self.elapsed, 1) if self.elapsed else 0.0
+            else:
+                target_rps = config.rate
+            report["schedule"] = {
+                "arrival": "replay" if config.replay else config.arrival,
+                "target_rps": target_rps,
+                "scheduled": scheduled,
+                "dropped": self.stats.dropped,
+                "late": self.stats.late,
+            }
+        tasks = self.tasks.to_dict(self.elapsed) if self.tasks is not None else None
+        if tasks is not None:
+            report["tasks"] = tasks
+        nodes = self.nodes.to_dict(self.elapsed) if self.nodes is not None else None
+        if nodes is not None:
+            for address, node in nodes["tasks"].items():
+                node["connections_opened"] = self.node_connections[address]
+            report["alb_nodes"] = {
+                "node_count": nodes["task_count"],
+                "skew": nodes["skew"],
+                "hot_nodes": nodes["hot_tasks"],
+                "nodes": nodes["tasks"],
+            }
+        if self.intervals is not None:
+            report["intervals"] = self.intervals.to_list(self.elapsed, config.load_profile(), config.rate)
+            if tasks is not None:
+                skew = self.tasks.interval_skew()
+                for index, interval in zip(sorted(self.intervals.intervals), report["intervals"]):
+                    if index in skew:
+                        interval["task_skew"], interval["active_tasks"] = skew[index]
+            if self.versions is not None:
+                report["cutover"] = cutover_report(
+                    self.versions, report["intervals"], config.interval,
+                    config.version_classifier().source, config.blue_version, config.green_version,
+                )
+        return report
+
+
+async def run_load(config: LoadTestConfig,
+                   on_interval: Optional[Callable[[Interval], None]] = None,
+                   should_stop: Optional[Callable[[], bool]] = None) -> RunResult:
+    """Generate load as configured; ``on_interval`` is called as each interval closes.
+
+    Once ``should_stop`` returns true the run winds down as if its duration
+    had elapsed: no new requests are sent and those in flight complete.
+    """
+    loop = asyncio.get_running_loop()
+    target = Target.from_url(config.url)
+    raw_request = target.build_request()
+    pool = ConnectionPool(target, config.pool_size, config.timeout, config.resolve_interval or None,
+                          socket.AF_UNSPEC if config.ipv6 else socket.AF_INET)
+    result = RunResult()
+    stats = result.stats
+    remaining = config.requests
+    expected_us = int(config.expected_interval_ms * 1000) if config.expected_interval_ms else None
+    recorders = []
+    in_flight = 0
+
+    profile = config.load_profile()
+    result.started_at = time.time()
+    result.intervals = series = IntervalSeries(config.interval, result.started_at)
+    result.tasks = tasks = TaskBreakdown(config.interval, config.task_header)
+    result.nodes = nodes = TaskBreakdown(config.interval, "peer-address")
+    versions = classify_version = None
+    if config.cutover:
+        result.versions = versions = TaskBreakdown(config.interval, config.version_header)
+        classify_version = config.version_classifier()
+    start = loop.time()
+    deadline = start + config.run_duration
+
+    def rate_at(elapsed: float) -> float:
+        rate = profile.rate_at(elapsed) if profile else config.rate
+        return rate * config.share
+
+    def record_latency(recorder: WorkerRecorder, sent: float, done: float, intended: Optional[float]) -> int:
+        latency_us = int((done - sent) * 1_000_000)
+        if intended is None:
+            recorder.record(latency_us)
+            return latency_us
+        intended_latency_us = int((done - intended) * 1_000_000)
+        recorder.record_scheduled(intended_latency_us, latency_us)
+        return intended_latency_us
+
+    async def send(recorder: WorkerRecorder, request: bytes, intended: Optional[float] = None):
+        nonlocal in_flight
+        stats.requests += 1
+        in_flight += 1
+        sent = loop.time()
+        try:
+            response = await pool.request(request)
+        except Exception as exc:
+            in_flight -= 1
+            # A failure is a latency too: leaving timeouts out would flatter the tail
+            done = loop.time()
+            stats.record_error(exc)
+            series.record_error(done - start, exc, record_latency(recorder, sent, done, intended))
+            return
+        in_flight -= 1
+        done = loop.time()
+        latency_us = record_latency(recorder, sent, done, intended)
+        stats.record_status(response.status)
+        series.record_response(done - start, response.status, latency_us)
+        tasks.record(done - start, response.headers, response.status, latency_us)
+        nodes.record_name(done - start, response.address, response.status, latency_us)
+        if versions is not None:
+            versions.record_name(done - start, classify_version(response), response.status, latency_us)
+
+    async def worker():
+        nonlocal remaining
+        recorder = WorkerRecorder(expected_us)
+        recorders.append(recorder)
+        while loop.time() < deadline:
+            if remaining is not None:
+                if remaining <= 0:
+                    return
+                remaining -= 1
+            await send(recorder, raw_request)
+
+    def rate_schedule():
+        arrivals = ArrivalProcess(config.arrival, config.seed)
+        offset = 0.0
+        while offset < deadline - start:
+            rate = rate_at(offset)
+            if rate <= 0:
+                offset += IDLE_POLL_INTERVAL
+                continue
+            yield offset, raw_request
+            offset += arrivals.gap(rate)
+
+    async def open_loop(schedule):
+        nonlocal remaining
+        recorder = WorkerRecorder(None)
+        recorders.append(recorder)
+        late = config.late_threshold_ms / 1000.0
+        pending = set()
+
+        for offset, request in schedule:
+            intended = start + offset
+            if intended >= deadline:
+                break
+            if remaining is not None:
+                if remaining <= 0:
+                    break
+                remaining -= 1
+            now = loop.time()
+            # Sleep in short steps so an early stop is noticed during long gaps
+            while intended > now and now < deadline:
+                await asyncio.sleep(min(intended - now, STOP_POLL_INTERVAL))
+                now = loop.time()
+            if now >= deadline:
+                break
+            # When the loop wakes up late, the requests already due go out back to back
+            if len(pending) >= config.concurrency:
+                stats.dropped += 1
+                continue
+            if now - intended > late:
+                stats.late += 1
+            task = loop.create_task(send(recorder, request, intended))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+
+        if pending:
+            await asyncio.gather(*pending)
+
+    async def ticker():
+        while True:
+            elapsed = loop.time() - start
+            # Wake just after the next interval boundary
+            await asyncio.sleep(config.interval - elapsed % config.interval + 0.001)
+            for interval in series.pop_closed(loop.time() - start):
+                interval.in_flight = in_flight
+                on_interval(interval)
+
+    async def watch_stop():
+        nonlocal deadline
+        while not should_stop():
+            await asyncio.sleep(STOP_POLL_INTERVAL)
+        deadline = min(deadline, loop.time())
+
+    ticking = loop.create_task(ticker()) if on_interval else None
+    watching = loop.create_task(watch_stop()) if should_stop else None
+    try:
+        if config.replay:
+            replay = LogReplay(config.replay, target, config.replay_speed,
+                               config.shard_index, config.shard_count)
+            try:
+                await open_loop(replay)
+            finally:
+                stats.skipped += replay.skipped
+        elif config.open_model:
+            await open_loop(rate_schedule())
+        else:
+            await asyncio.gather(*(worker() for _ in range(config.concurrency)))
+    finally:
+        pool.close()
+        if ticking is not None:
+            ticking.cancel()
+        if watching is not None:
+            watching.cancel()
+
+    result.elapsed = loop.time() - start
+    if on_interval:
+        for interval in series.pop_closed():
+            on_interval(interval)
+    result.connections_opened = pool.opened
+    result.node_connections.update(pool.opened_per_address)
+    series.freeze()
+    for recorder in recorders:
+        result.add_recorder(recorder)
+    return result
+
+
+def run(config: LoadTestConfig,
+        on_interval: Optional[Callable[[Interval], None]] = None,
+        should_stop: Optional[Callable[[], bool]] = None) -> RunResult:
+    return asyncio.run(run_load(config, on_interval, should_stop))
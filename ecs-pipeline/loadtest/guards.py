@@ -0,0 +1,111 @@
+import math
+import re
+from collections import deque
+from typing import List, Optional
+
+from loadtest.histogram import Histogram
+from loadtest.profiles import parse_duration
+from loadtest.timeseries import INTERVAL_SUB_BUCKET_BITS, Interval
+
+LATENCY_METRICS = {"p50": 50.0, "p90": 90.0, "p99": 99.0, "p99.9": 99.9, "max": 100.0}
+# Error-rate metrics, in percent of the requests in the window
+RATE_METRICS = ("5xx", "errors")
+DEFAULT_WINDOW = 30.0
+# A window with fewer requests than this is too noisy to judge
+MIN_REQUESTS = 50
+
+# "p99>500ms", "5xx>1%/60s", "errors>5%/2m"
+_GUARD = re.compile(r"^\s*(p50|p90|p99|p99\.9|max|5xx|errors)\s*>\s*([0-9.]+)\s*(ms|%)?\s*(?:/\s*(\S+))?\s*$")
+
+
+class Guard:
+    """One SLO limit on the intervals inside a sliding window."""
+
+    def __init__(self, metric: str, threshold: float, window: float = DEFAULT_WINDOW):
+        if metric not in LATENCY_METRICS and metric not in RATE_METRICS:
+            raise ValueError(f"Unknown guard metric {metric!r}")
+        self.metric = metric
+        self.threshold = threshold
+        self.window = window
+
+    @classmethod
+    def parse(cls, spec: str) -> "Guard":
+        match = _GUARD.match(spec)
+        if match is None:
+            raise ValueError(f"Cannot parse guard {spec!r}, expected e.g. 'p99>500ms/30s' or '5xx>1%/60s'")
+        metric, threshold, unit, window = match.groups()
+        expected = "%" if metric in RATE_METRICS else "ms"
+        if unit not in (None, expected):
+            raise ValueError(f"Guard {spec!r}: {metric} is measured in {expected}")
+        return cls(metric, float(threshold), parse_duration(window) if window else DEFAULT_WINDOW)
+
+    def __str__(self) -> str:
+        unit = "%" if self.metric in RATE_METRICS else "ms"
+        return f"{self.metric}>{self.threshold:g}{unit}/{self.window:g}s"
+
+    def value(self, requests: int, errors: dict, latency: Histogram) -> Optional[float]:
+        if self.metric == "5xx":
+            return 100.0 * errors["5xx"] / requests
+        if self.metric == "errors":
+            return 100.0 * sum(errors.values()) / requests
+        if not latency.total:
+            return None
+        return latency.value_at_percentile(LATENCY_METRICS[self.metric]) / 1000
+
+
+class GuardMonitor:
+    """Checks every guard as intervals close and remembers the first breach.
+
+    Used as (part of) a run's ``on_interval`` callback; ``tripped`` tells the
+    runner to stop.
+    """
+
+    def __init__(self, guards: List[Guard], interval: float):
+        self.guards = guards
+        self.interval = interval
+        longest = max((guard.window for guard in guards), default=interval)
+        self._window = deque(maxlen=max(1, math.ceil(longest / interval)))
+        self.breach = None
+        self._started_at = None
+
+    def tripped(self) -> bool:
+        return self.breach is not None
+
+    def __call__(self, interval: Interval):
+        if self._started_at is None:
+            self._started_at = interval.start - interval.index * self.interval
+        self._window.append(interval)
+        if self.breach is not None:
+            return
+        for guard in self.guards:
+            value = self._evaluate(guard, interval.index)
+            if value is not None and value > guard.threshold:
+                end = interval.start + self.interval
+                self.breach = {
+                    "guard": str(guard),
+                    "value": round(value, 3),
+                    "t": round(end, 3),
+                    "offset_s": round(end - self._started_at, 3),
+                }
+                return
+
+    def _evaluate(self, guard: Guard, last: int) -> Optional[float]:
+        first = last - math.ceil(guard.window / self.interval) + 1
+        requests = 0
+        errors = {"connect": 0, "timeout": 0, "5xx": 0, "other": 0}
+        latency = Histogram(INTERVAL_SUB_BUCKET_BITS)
+        for interval in self._window:
+            if interval.index < first:
+                continue
+            requests += interval.stats.requests
+            for kind, n in interval.stats.errors.items():
+                errors[kind] += n
+            if guard.metric in LATENCY_METRICS:
+                latency.merge(interval.latency)
+                interval.freeze()
+        if requests < MIN_REQUESTS:
+            return None
+        return guard.value(requests, errors, latency)
+
+    def report(self) -> dict:
+        return {"guards": [str(guard) for guard in self.guards], "tripped": self.breach}
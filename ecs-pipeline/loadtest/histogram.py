@@ -0,0 +1,141 @@
+import struct
+import sys
+from array import array
+
+# sub_bucket_bits, max_value_bits, total, sum, min, max, non-empty buckets
+_HEADER = struct.Struct("<BBQQQQI")
+
+
+class Histogram:
+    """Fixed-memory log-linear latency histogram in the style of HdrHistogram.
+
+    Values are integers (microseconds by convention). Each power-of-two range
+    is split into ``2 ** (sub_bucket_bits - 1)`` linear sub-buckets, so every
+    recorded value is kept with a relative error below ``2 ** -(sub_bucket_bits - 1)``
+    (0.8% with the defaults) regardless of magnitude. Values above
+    ``2 ** max_value_bits`` are clamped into the last bucket.
+    """
+
+    def __init__(self, sub_bucket_bits: int = 8, max_value_bits: int = 36):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.max_value_bits = max_value_bits
+        self._half = 1 << (sub_bucket_bits - 1)
+        self._max_value = (1 << max_value_bits) - 1
+        buckets = max_value_bits - sub_bucket_bits + 1
+        self.counts = array("Q", bytes(8 * (buckets + 1) * self._half))
+        self.total = 0
+        self.sum = 0
+        self.min = 0
+        self.max = 0
+
+    def _index(self, value: int) -> int:
+        bucket = value.bit_length() - self.sub_bucket_bits
+        if bucket <= 0:
+            return value
+        return bucket * self._half + (value >> bucket)
+
+    def _highest_equivalent(self, index: int) -> int:
+        bucket = index // self._half - 1
+        if bucket <= 0:
+            return index
+        sub = index - bucket * self._half
+        return ((sub + 1) << bucket) - 1
+
+    def record(self, value: int, count: int = 1):
+        if value < 0:
+            value = 0
+        elif value > self._max_value:
+            value = self._max_value
+        self.counts[self._index(value)] += count
+        if self.total == 0 or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.total += count
+        self.sum += value * count
+
+    def record_corrected(self, value: int, expected_interval: int):
+        # Coordinated-omission correction: a response that took longer than
+        # the intended send interval delayed the requests that should have
+        # been sent meanwhile, so record those missing samples as well.
+        self.record(value)
+        if expected_interval <= 0:
+            return
+        missing = value - expected_interval
+        while missing >= expected_interval:
+            self.record(missing)
+            missing -= expected_interval
+
+    def merge(self, other: "Histogram"):
+        if (other.sub_bucket_bits, other.max_value_bits) != (self.sub_bucket_bits, self.max_value_bits):
+            raise ValueError("Cannot merge histograms with different layouts")
+        if other.total == 0:
+            return
+        counts = self.counts
+        for index, count in enumerate(other.counts):
+            if count:
+                counts[index] += count
+        if self.total == 0 or other.min < self.min:
+            self.min = other.min
+        self.max = max(self.max, other.max)
+        self.total += other.total
+        self.sum += other.sum
+
+    def to_bytes(self) -> bytes:
+        """Sparse binary encoding: the header plus (index, count) of non-empty buckets."""
+        indexes = array("I")
+        counts = array("Q")
+        for index, count in enumerate(self.counts):
+            if count:
+                indexes.append(index)
+                counts.append(count)
+        if sys.byteorder != "little":
+            indexes.byteswap()
+            counts.byteswap()
+        header = _HEADER.pack(
+            self.sub_bucket_bits, self.max_value_bits, self.total,
+            self.sum, self.min, self.max, len(indexes),
+        )
+        return header + indexes.tobytes() + counts.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Histogram":
+        sub_bits, max_bits, total, total_sum, low, high, n = _HEADER.unpack_from(data)
+        hist = cls(sub_bits, max_bits)
+        offset = _HEADER.size
+        indexes = array("I", data[offset : offset + 4 * n])
+        counts = array("Q", data[offset + 4 * n : offset + 12 * n])
+        if sys.byteorder != "little":
+            indexes.byteswap()
+            counts.byteswap()
+        for index, count in zip(indexes, counts):
+            hist.counts[index] = count
+        hist.total, hist.sum, hist.min, hist.max = total, total_sum, low, high
+        return hist
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.total if self.total else 0.0
+
+    def value_at_percentile(self, percentile: float) -> int:
+        if self.total == 0:
+            return 0
+        rank = max(1, round(self.total * percentile / 100.0))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self._highest_equivalent(index), self.max)
+        return self.max
+
+    def summary(self, scale: float = 1000.0) -> dict:
+        """Percentile summary; with the default scale microseconds become ms."""
+        result = {
+            "count": self.total,
+            "min": round(self.min / scale, 3),
+            "mean": round(self.mean / scale, 3),
+        }
+        for percentile in (50, 90, 99, 99.9):
+            result[f"p{percentile:g}"] = round(self.value_at_percentile(percentile) / scale, 3)
+        result["max"] = round(self.max / scale, 3)
+        return result
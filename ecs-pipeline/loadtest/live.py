@@ -0,0 +1,99 @@
+import json
+import sys
+from typing import Callable, Optional
+
+from loadtest.timeseries import Interval
+
+
+def snapshot(interval: Interval, length: float, started_at: float) -> dict:
+    """One live sample: what completed in ``interval`` and the requests in flight when it closed."""
+    latency = interval.latency
+    stats = interval.stats
+    sample = {
+        "t": round(interval.start, 3),
+        "offset_s": round(interval.start - started_at, 3),
+        "throughput_rps": round(stats.requests / length, 1),
+        "in_flight": interval.in_flight,
+        "requests": stats.requests,
+        "errors": dict(stats.errors),
+        "p50_ms": round(latency.value_at_percentile(50) / 1000, 3),
+        "p99_ms": round(latency.value_at_percentile(99) / 1000, 3),
+    }
+    interval.freeze()
+    return sample
+
+
+class LiveMerger:
+    """Merges the intervals several shards stream and emits each index once all of them moved past it.
+
+    Shards skip intervals in which nothing completed, so an index counts as
+    complete for a shard as soon as that shard reports the same or a later one.
+    """
+
+    def __init__(self, sources: int, emit: Callable[[Interval], None]):
+        self.emit = emit
+        self._latest = [-1] * sources
+        self._pending = {}
+
+    def add(self, source: int, interval: Interval):
+        existing = self._pending.get(interval.index)
+        if existing is None:
+            self._pending[interval.index] = interval
+        else:
+            existing.merge(interval)
+        self._latest[source] = max(self._latest[source], interval.index)
+        done = min(self._latest)
+        for index in sorted(i for i in self._pending if i <= done):
+            self.emit(self._pending.pop(index))
+
+    def flush(self):
+        for index in sorted(self._pending):
+            self.emit(self._pending.pop(index))
+
+
+class LiveOutput:
+    """Writes live samples as JSON lines and/or a compact one-line-per-interval terminal view."""
+
+    HEADER = f"{'offset':>8} {'rps':>9} {'in-flight':>9} {'p50 ms':>9} {'p99 ms':>9}  errors (connect/timeout/5xx/other)"
+    HEADER_EVERY = 25
+
+    def __init__(self, length: float, path: Optional[str] = None, view: bool = False):
+        self.length = length
+        self.started_at = None
+        self.view = view
+        self._lines = 0
+        self._file = None
+        self._close = False
+        if path == "-":
+            self._file = sys.stdout
+        elif path:
+            self._file = open(path, "w")
+            self._close = True
+
+    def __call__(self, interval: Interval):
+        if self.started_at is None:
+            # Interval starts are wall-clock times; the first one anchors the offsets
+            self.started_at = interval.start - interval.index * self.length
+        sample = snapshot(interval, self.length, self.started_at)
+        if self._file is not None:
+            self._file.write(json.dumps(sample) + "\n")
+            self._file.flush()
+        if self.view:
+            self._print(sample)
+
+    def _print(self, sample: dict):
+        if self._lines % self.HEADER_EVERY == 0:
+            print(self.HEADER, file=sys.stderr)
+        self._lines += 1
+        errors = sample["errors"]
+        print(
+            f"{sample['offset_s']:>7.0f}s {sample['throughput_rps']:>9.1f} {sample['in_flight']:>9}"
+            f" {sample['p50_ms']:>9.2f} {sample['p99_ms']:>9.2f}"
+            f"  {errors['connect']}/{errors['timeout']}/{errors['5xx']}/{errors['other']}",
+            file=sys.stderr,
+            flush=True,
+        )
+
+    def close(self):
+        if self._close:
+            self._file.close()
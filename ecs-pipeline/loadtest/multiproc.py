@@ -0,0 +1,117 @@
+import asyncio
+import multiprocessing
+import os
+import queue
+import traceback
+from dataclasses import replace
+from typing import Callable, List, Optional
+
+from loadtest.engine import STOP_POLL_INTERVAL, LoadTestConfig, RunResult, run_load
+from loadtest.live import LiveMerger
+from loadtest.timeseries import Interval
+
+# How long worker processes wait for each other before giving up on the start barrier
+START_BARRIER_TIMEOUT = 60.0
+
+
+def split_evenly(total: int, parts: int) -> List[int]:
+    base, extra = divmod(total, parts)
+    return [base + (1 if i < extra else 0) for i in range(parts)]
+
+
+def shard_config(config: LoadTestConfig, processes: int) -> List[LoadTestConfig]:
+    """Split one run into per-process configs whose totals add up to the original.
+
+    Every process needs at least one connection, so there are never more
+    processes than workers or pooled connections.
+    """
+    processes = max(1, min(processes, config.concurrency, config.pool_size))
+    concurrency = split_evenly(config.concurrency, processes)
+    connections = split_evenly(config.pool_size, processes)
+    requests = split_evenly(config.requests, processes) if config.requests is not None else None
+
+    shards = []
+    for i in range(processes):
+        shards.append(
+            replace(
+                config,
+                concurrency=concurrency[i],
+                connections=connections[i],
+                requests=requests[i] if requests is not None else None,
+                share=config.share / processes,
+                shard_index=config.shard_index + i * config.shard_count,
+                shard_count=config.shard_count * processes,
+                seed=config.seed + i if config.seed is not None else None,
+            )
+        )
+    return shards
+
+
+def _worker_main(index: int, config: LoadTestConfig, barrier, results, live: bool, stop):
+    def stream_interval(interval: Interval):
+        interval.freeze()
+        results.put((index, "interval", interval))
+
+    try:
+        # Line every process up so the shards start loading at the same moment
+        barrier.wait(START_BARRIER_TIMEOUT)
+        result = asyncio.run(run_load(config, stream_interval if live else None, stop.is_set))
+    except BaseException:
+        results.put((index, "error", traceback.format_exc()))
+    else:
+        results.put((index, "ok", result))
+
+
+def run_multiprocess(config: LoadTestConfig, processes: Optional[int] = None,
+                     on_interval: Optional[Callable[[Interval], None]] = None,
+                     should_stop: Optional[Callable[[], bool]] = None) -> RunResult:
+    """Run one event-loop worker process per shard and merge their results.
+
+    With ``on_interval`` the shards also stream their closed intervals, which
+    are merged across processes and passed on as each one completes. When
+    ``should_stop`` turns true every shard is told to wind down early.
+    """
+    shards = shard_config(config, processes or os.cpu_count() or 1)
+    ctx = multiprocessing.get_context()
+    barrier = ctx.Barrier(len(shards))
+    results = ctx.Queue()
+    stop = ctx.Event()
+    workers = [
+        ctx.Process(target=_worker_main, args=(i, shard, barrier, results, on_interval is not None, stop),
+                    daemon=True)
+        for i, shard in enumerate(shards)
+    ]
+    for worker in workers:
+        worker.start()
+
+    merged = RunResult()
+    live = LiveMerger(len(shards), on_interval) if on_interval else None
+    pending = set(range(len(workers)))
+    try:
+        while pending:
+            if should_stop is not None and not stop.is_set() and should_stop():
+                stop.set()
+            try:
+                index, status, payload = results.get(timeout=STOP_POLL_INTERVAL)
+            except queue.Empty:
+                dead = [i for i in pending if not workers[i].is_alive()]
+                if dead:
+                    raise RuntimeError(f"Load worker process {dead[0]} exited without a result")
+                continue
+            if status == "interval":
+                live.add(index, payload)
+                continue
+            if status == "error":
+                raise RuntimeError(f"Load worker process {index} failed:\n{payload}")
+            merged.merge(payload)
+            pending.discard(index)
+    finally:
+        for worker in workers:
+            if worker.is_alive() and pending:
+                worker.terminate()
+            worker.join()
+
+    if live is not None:
+        live.flush()
+    merged.meta["processes"] = len(shards)
+    return merged
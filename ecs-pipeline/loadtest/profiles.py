@@ -0,0 +1,164 @@
+import bisect
+import json
+from typing import List
+
+# Multipliers for duration strings such as "90s", "15m" or "4h"
+_DURATION_UNITS = {"s": 1, "m": 60, "h": 3600}
+
+
+def parse_duration(value) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    value = str(value).strip().lower()
+    if value and value[-1] in _DURATION_UNITS:
+        return float(value[:-1]) * _DURATION_UNITS[value[-1]]
+    return float(value)
+
+
+_REQUIRED = object()
+
+
+def _field(spec: dict, key: str, parse=float, default=_REQUIRED):
+    """``spec[key]`` parsed, or a ValueError naming the phase and the key."""
+    phase = spec.get("name", spec.get("type"))
+    value = spec.get(key, default)
+    if value is _REQUIRED:
+        raise ValueError(f"Phase {phase!r} is missing {key!r}")
+    try:
+        return parse(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Phase {phase!r} has an invalid {key!r}: {value!r}") from None
+
+
+class Phase:
+    """One segment of a load profile; ``rate_at`` takes seconds since the phase began."""
+
+    kind = None
+
+    def __init__(self, spec: dict):
+        self.name = spec.get("name", self.kind)
+        self.duration = _field(spec, "duration", parse_duration)
+        if self.duration <= 0:
+            raise ValueError(f"Phase {self.name!r} must have a positive duration")
+
+    def rate_at(self, t: float) -> float:
+        raise NotImplementedError
+
+
+class RampPhase(Phase):
+    # {"type": "ramp", "from_rps": 10, "to_rps": 500, "duration": "10m"}
+    kind = "ramp"
+
+    def __init__(self, spec: dict):
+        super().__init__(spec)
+        self.from_rps = _field(spec, "from_rps")
+        self.to_rps = _field(spec, "to_rps")
+
+    def rate_at(self, t: float) -> float:
+        return self.from_rps + (self.to_rps - self.from_rps) * min(t / self.duration, 1.0)
+
+
+class StepsPhase(Phase):
+    # {"type": "steps", "start_rps": 100, "step_rps": 100, "steps": 5, "step_duration": "2m"}
+    kind = "steps"
+
+    def __init__(self, spec: dict):
+        self.step_duration = _field(spec, "step_duration", parse_duration)
+        self.steps = _field(spec, "steps", int)
+        super().__init__({**spec, "duration": self.step_duration * self.steps})
+        self.start_rps = _field(spec, "start_rps")
+        self.step_rps = _field(spec, "step_rps")
+
+    def rate_at(self, t: float) -> float:
+        step = min(int(t // self.step_duration), self.steps - 1)
+        return self.start_rps + self.step_rps * step
+
+
+class SpikePhase(Phase):
+    # {"type": "spike", "base_rps": 100, "spike_rps": 2000, "duration": "5m",
+    #  "spike_at": "2m", "spike_duration": "30s"}
+    kind = "spike"
+
+    def __init__(self, spec: dict):
+        super().__init__(spec)
+        self.base_rps = _field(spec, "base_rps")
+        self.spike_rps = _field(spec, "spike_rps")
+        self.spike_at = _field(spec, "spike_at", parse_duration, self.duration / 2)
+        self.spike_duration = _field(spec, "spike_duration", parse_duration)
+        if self.spike_at < 0 or self.spike_duration <= 0 or self.spike_at + self.spike_duration > self.duration:
+            raise ValueError(f"Phase {self.name!r}: the spike ({self.spike_at:g}s + {self.spike_duration:g}s) "
+                             f"must lie within the phase's {self.duration:g}s")
+
+    def rate_at(self, t: float) -> float:
+        if self.spike_at <= t < self.spike_at + self.spike_duration:
+            return self.spike_rps
+        return self.base_rps
+
+
+class SoakPhase(Phase):
+    # {"type": "soak", "rps": 200, "duration": "4h"}
+    kind = "soak"
+
+    def __init__(self, spec: dict):
+        super().__init__(spec)
+        self.rps = _field(spec, "rps")
+
+    def rate_at(self, t: float) -> float:
+        return self.rps
+
+
+PHASE_TYPES = {cls.kind: cls for cls in (RampPhase, StepsPhase, SpikePhase, SoakPhase)}
+
+
+class LoadProfile:
+    """A sequence of phases executed back to back."""
+
+    def __init__(self, phases: List[Phase]):
+        if not phases:
+            raise ValueError("A load profile needs at least one phase")
+        self.phases = phases
+        self._starts = []
+        offset = 0.0
+        for phase in phases:
+            self._starts.append(offset)
+            offset += phase.duration
+        self.duration = offset
+
+    @classmethod
+    def from_spec(cls, spec) -> "LoadProfile":
+        phases = spec.get("phases") if isinstance(spec, dict) else spec
+        if not isinstance(phases, list):
+            raise ValueError("A load profile is a list of phases, or an object with a \"phases\" list")
+        result = []
+        for phase in phases:
+            if not isinstance(phase, dict):
+                raise ValueError(f"A phase must be an object, got {phase!r}")
+            kind = phase.get("type")
+            if kind not in PHASE_TYPES:
+                raise ValueError(f"Unknown phase type {kind!r}, expected one of {sorted(PHASE_TYPES)}")
+            result.append(PHASE_TYPES[kind](phase))
+        return cls(result)
+
+    def phase_index_at(self, t: float) -> int:
+        return max(0, bisect.bisect_right(self._starts, min(t, self.duration)) - 1)
+
+    def _locate(self, t: float):
+        index = self.phase_index_at(t)
+        return self.phases[index], t - self._starts[index]
+
+    def rate_at(self, t: float) -> float:
+        if t >= self.duration:
+            return 0.0
+        phase, offset = self._locate(t)
+        return phase.rate_at(offset)
+
+    def phase_at(self, t: float) -> str:
+        return self._locate(min(t, self.duration))[0].name
+
+
+def load_profile_spec(path: str) -> dict:
+    with open(path) as f:
+        spec = json.load(f)
+    # Parse once up front so a bad file fails before any load is generated
+    LoadProfile.from_spec(spec)
+    return spec
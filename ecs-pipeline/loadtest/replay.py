@@ -0,0 +1,115 @@
+import gzip
+import re
+from datetime import datetime
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+from loadtest.client import Target
+
+# ALB access log: type time elb client:port target:port request_processing_time
+# target_processing_time response_processing_time elb_status_code
+# target_status_code received_bytes sent_bytes "request" ...
+ALB_LINE = re.compile(r'^\S+ (\S+) (?:\S+ ){10}"(\S+) (\S+) ')
+# nginx "combined": remote_addr - remote_user [time_local] "request" ...
+NGINX_LINE = re.compile(r'^\S+ \S+ \S+ \[([^\]]+)\] "(\S+) (\S+)')
+
+REPLAYED_METHODS = ("GET",)
+
+
+def open_log(path: str):
+    """Open a plain or gzip-compressed log for streaming, whatever its extension."""
+    with open(path, "rb") as f:
+        compressed = f.read(2) == b"\x1f\x8b"
+    if compressed:
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, "r", encoding="utf-8", errors="replace")
+
+
+def _alb_time(value: str) -> float:
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+@lru_cache(maxsize=1024)
+def _nginx_time(value: str) -> float:
+    # Many consecutive lines share the same second, hence the cache
+    return datetime.strptime(value, "%d/%b/%Y:%H:%M:%S %z").timestamp()
+
+
+def parse_line(line: str):
+    """Return ``(epoch_seconds, method, path)`` for an ALB or nginx log line, or None."""
+    match = ALB_LINE.match(line)
+    if match:
+        timestamp, method, url = match.groups()
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        try:
+            return _alb_time(timestamp), method, path
+        except ValueError:
+            return None
+    match = NGINX_LINE.match(line)
+    if match:
+        timestamp, method, path = match.groups()
+        try:
+            return _nginx_time(timestamp), method, path
+        except ValueError:
+            return None
+    return None
+
+
+class LogReplay:
+    """Streams a log as ``(offset_seconds, raw_request)`` pairs for the open-model scheduler.
+
+    Offsets are relative to the first replayed line and divided by ``speed``.
+    With ``shard_count`` > 1 only every shard_count-th line is replayed, so
+    several processes together reproduce the whole log.
+    """
+
+    def __init__(self, path: str, target: Target, speed: float = 1.0,
+                 shard_index: int = 0, shard_count: int = 1):
+        if speed <= 0:
+            raise ValueError("Replay speed must be positive")
+        self.path = path
+        self.speed = speed
+        self.shard_index = shard_index
+        self.shard_count = shard_count
+        self.skipped = 0
+        self._build_request = lru_cache(maxsize=4096)(target.build_request)
+
+    def _entries(self):
+        with open_log(self.path) as log:
+            for line_no, line in enumerate(log):
+                if line_no % self.shard_count != self.shard_index:
+                    continue
+                parsed = parse_line(line)
+                if parsed is None or parsed[1] not in REPLAYED_METHODS:
+                    self.skipped += 1
+                    continue
+                yield parsed[0], parsed[2]
+
+    def __iter__(self):
+        first = None
+        group_time = None
+        group = []
+        for timestamp, path in self._entries():
+            if first is None:
+                first = timestamp
+            # Access logs are only roughly ordered; never schedule backwards
+            if group_time is not None and timestamp <= group_time:
+                group.append(path)
+                continue
+            yield from self._spread(group, group_time, timestamp, first)
+            group_time, group = timestamp, [path]
+        yield from self._spread(group, group_time, None, first)
+
+    def _spread(self, paths, timestamp, next_timestamp, first):
+        # nginx only logs whole seconds, so lines sharing a timestamp are
+        # spread evenly up to the next timestamp instead of sent as one burst
+        if not paths:
+            return
+        width = min(next_timestamp - timestamp, 1.0) if next_timestamp is not None else 1.0
+        step = width / len(paths)
+        for i, path in enumerate(paths):
+            offset = (timestamp - first + i * step) / self.speed
+            yield offset, self._build_request(path)
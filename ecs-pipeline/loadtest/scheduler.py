@@ -0,0 +1,26 @@
+import random
+from typing import Optional
+
+ARRIVALS = ("constant", "poisson")
+
+
+class ArrivalProcess:
+    """Produces the gaps between intended request send times.
+
+    ``constant`` spaces requests exactly ``1 / rate`` apart, ``poisson`` draws
+    exponentially distributed gaps with the same mean, which is what
+    independent users arriving at the service look like.
+    """
+
+    def __init__(self, kind: str = "constant", seed: Optional[int] = None):
+        if kind not in ARRIVALS:
+            raise ValueError(f"Unknown arrival process {kind!r}, expected one of {ARRIVALS}")
+        self.kind = kind
+        self._random = random.Random(seed)
+
+    def gap(self, rate: float) -> float:
+        if rate <= 0:
+            raise ValueError("Arrival rate must be positive")
+        if self.kind == "poisson":
+            return self._random.expovariate(rate)
+        return 1.0 / rate
@@ -0,0 +1,102 @@
+"""Benchmarks the load tester against the local stand-in server.
+
+Three measurements tell whether a real run is limited by the client:
+
+* ``max_rate``: closed-model throughput against an instant server, i.e. the
+  most the given client processes can generate.
+* ``overhead``: open-model run at a fraction of that rate against a server
+  with a fixed injected latency; the observed latency minus the injected one
+  is what the client (and loopback) adds to every measurement.
+* ``record_cost``: time spent recording one response in stats, histograms
+  and the interval series, measured in isolation.
+"""
+import os
+import time
+from dataclasses import dataclass, replace
+from typing import Optional
+
+from loadtest.engine import LoadTestConfig, RunResult, WorkerRecorder, run
+from loadtest.multiproc import run_multiprocess
+from loadtest.server import ServerConfig, free_port, start_servers, stop_servers
+from loadtest.stats import Stats
+from loadtest.timeseries import IntervalSeries
+
+# The overhead run targets this fraction of the measured maximum rate
+OVERHEAD_LOAD = 0.5
+RECORD_SAMPLES = 200_000
+
+
+@dataclass
+class SelfBenchConfig:
+    duration: float = 5.0
+    processes: int = 1  # client processes
+    server_processes: Optional[int] = None  # default: the cores left over
+    concurrency: int = 50
+    latency_ms: float = 10.0  # injected for the overhead run
+
+
+def _load(config: LoadTestConfig, processes: int) -> RunResult:
+    return run(config) if processes == 1 else run_multiprocess(config, processes)
+
+
+def record_cost() -> float:
+    """Microseconds spent recording one response on the hot path."""
+    recorder = WorkerRecorder(None)
+    stats = Stats()
+    series = IntervalSeries(1.0, 0.0)
+    started = time.perf_counter()
+    for i in range(RECORD_SAMPLES):
+        latency_us = 1000 + (i & 1023)
+        stats.requests += 1
+        stats.record_status(200)
+        recorder.record(latency_us)
+        series.record_response(i / 100_000, 200, latency_us)
+    return (time.perf_counter() - started) / RECORD_SAMPLES * 1_000_000
+
+
+def run_selfbench(config: SelfBenchConfig) -> dict:
+    server_processes = config.server_processes or max(1, (os.cpu_count() or 2) - config.processes)
+    server = ServerConfig(port=free_port(), processes=server_processes)
+    servers = start_servers(server)
+    try:
+        url = f"http://{server.host}:{server.port}/"
+        closed = LoadTestConfig(url=url, concurrency=config.concurrency, duration=config.duration)
+        maximum = _load(closed, config.processes)
+        max_rps = maximum.stats.requests / maximum.elapsed if maximum.elapsed else 0.0
+
+        rate = max(1.0, round(max_rps * OVERHEAD_LOAD))
+        open_model = replace(
+            closed,
+            url=f"{url}?latency_ms={config.latency_ms:g}",
+            rate=rate,
+            concurrency=max(config.concurrency, int(rate * (config.latency_ms / 1000.0) * 4) + 1),
+        )
+        measured = _load(open_model, config.processes)
+    finally:
+        stop_servers(servers)
+
+    injected_us = config.latency_ms * 1000.0
+    latency = measured.uncorrected
+    scheduled = measured.stats.requests + measured.stats.dropped
+    return {
+        "client_processes": config.processes,
+        "server_processes": server_processes,
+        "max_rate": {
+            "concurrency": config.concurrency,
+            "requests": maximum.stats.requests,
+            "errors": sum(maximum.stats.errors.values()),
+            "throughput_rps": round(max_rps, 1),
+            "per_process_rps": round(max_rps / config.processes, 1),
+        },
+        "overhead": {
+            "target_rps": rate,
+            "achieved_rps": round(measured.stats.requests / measured.elapsed, 1) if measured.elapsed else 0.0,
+            "injected_latency_ms": config.latency_ms,
+            "added_p50_ms": round((latency.value_at_percentile(50) - injected_us) / 1000, 3),
+            "added_p99_ms": round((latency.value_at_percentile(99) - injected_us) / 1000, 3),
+            "added_max_ms": round((latency.max - injected_us) / 1000, 3),
+            "late_pct": round(100.0 * measured.stats.late / scheduled, 3) if scheduled else 0.0,
+            "dropped": measured.stats.dropped,
+        },
+        "record_cost_us": round(record_cost(), 3),
+    }
@@ -0,0 +1,182 @@
+"""Local stand-in for the nginx container, for benchmarking without AWS.
+
+Serves one page (the project's index.html) over keep-alive HTTP/1.1 with
+optional injected latency and errors. The defaults given on the command line
+can be overridden per request through the query string, e.g.
+``/?latency_ms=20&error_rate=0.1``.
+"""
+import asyncio
+import multiprocessing
+import os
+import random
+import socket
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import parse_qsl
+
+INDEX_HTML = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "index.html")
+# Stop reading a request head beyond this size
+MAX_HEAD = 64 * 1024
+
+
+@dataclass
+class ServerConfig:
+    host: str = "127.0.0.1"
+    port: int = 8080
+    index: str = INDEX_HTML
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0  # uniform extra latency in [0, jitter_ms)
+    error_rate: float = 0.0  # fraction answered with 503
+    reset_rate: float = 0.0  # fraction answered by dropping the connection
+    version: str = "local"  # sent as X-App-Version, for --cutover
+    processes: int = 1
+
+
+class StandInProtocol(asyncio.Protocol):
+    def __init__(self, config: ServerConfig, page: bytes, served_by: bytes):
+        self._config = config
+        self._page = page
+        self._served_by = served_by
+        self._loop = asyncio.get_running_loop()
+        self._transport = None
+        self._buffer = bytearray()
+        # Responses leave in request order even when their latencies differ
+        self._last_send = 0.0
+
+    def connection_made(self, transport):
+        self._transport = transport
+
+    def connection_lost(self, exc):
+        self._transport = None
+
+    def data_received(self, data):
+        buf = self._buffer
+        buf += data
+        while True:
+            end = buf.find(b"\r\n\r\n")
+            if end < 0:
+                if len(buf) > MAX_HEAD:
+                    self._transport.abort()
+                return
+            head = bytes(buf[:end])
+            del buf[: end + 4]
+            self._handle(head)
+
+    def _handle(self, head: bytes):
+        request_line, _, headers = head.partition(b"\r\n")
+        parts = request_line.split(b" ")
+        target = parts[1].decode("latin-1") if len(parts) > 1 else "/"
+        keep_alive = not (
+            b"HTTP/1.0" in request_line or b"connection: close" in headers.lower()
+        )
+
+        config = self._config
+        latency_ms, error_rate, reset_rate = config.latency_ms, config.error_rate, config.reset_rate
+        _, _, query = target.partition("?")
+        if query:
+            params = dict(parse_qsl(query))
+            latency_ms = float(params.get("latency_ms", latency_ms))
+            error_rate = float(params.get("error_rate", error_rate))
+            reset_rate = float(params.get("reset_rate", reset_rate))
+
+        roll = random.random()
+        if roll < reset_rate:
+            action = None
+        elif roll < reset_rate + error_rate:
+            action = self._response(b"503 Service Unavailable", b"", keep_alive)
+        else:
+            action = self._response(b"200 OK", self._page, keep_alive)
+
+        delay = (latency_ms + random.random() * config.jitter_ms) / 1000.0
+        if delay <= 0 and self._last_send <= self._loop.time():
+            self._send(action, keep_alive)
+            return
+        send_at = max(self._loop.time() + delay, self._last_send)
+        self._last_send = send_at
+        self._loop.call_at(send_at, self._send, action, keep_alive)
+
+    def _response(self, status: bytes, body: bytes, keep_alive: bool) -> bytes:
+        return b"".join((
+            b"HTTP/1.1 ", status, b"\r\n",
+            b"Content-Type: text/html\r\n",
+            b"Content-Length: ", str(len(body)).encode(), b"\r\n",
+            b"Connection: ", b"keep-alive" if keep_alive else b"close", b"\r\n",
+            b"X-Served-By: ", self._served_by, b"\r\n",
+            b"X-App-Version: ", self._config.version.encode(), b"\r\n",
+            b"\r\n", body,
+        ))
+
+    def _send(self, response: Optional[bytes], keep_alive: bool):
+        transport = self._transport
+        if transport is None:
+            return
+        if response is None:
+            transport.abort()
+            return
+        transport.write(response)
+        if not keep_alive:
+            transport.close()
+
+
+async def serve(config: ServerConfig, ready=None):
+    with open(config.index, "rb") as f:
+        page = f.read()
+    served_by = f"{socket.gethostname()}-{os.getpid()}".encode()
+    loop = asyncio.get_running_loop()
+    server = await loop.create_server(
+        lambda: StandInProtocol(config, page, served_by),
+        config.host, config.port,
+        reuse_port=config.processes > 1,
+        backlog=4096,
+    )
+    if ready is not None:
+        ready.set()
+    async with server:
+        await server.serve_forever()
+
+
+def _serve_main(config: ServerConfig, ready=None):
+    try:
+        asyncio.run(serve(config, ready))
+    except KeyboardInterrupt:
+        pass
+
+
+def start_servers(config: ServerConfig) -> list:
+    """Start ``config.processes`` background server processes sharing one port."""
+    ctx = multiprocessing.get_context()
+    servers = []
+    for _ in range(config.processes):
+        ready = ctx.Event()
+        process = ctx.Process(target=_serve_main, args=(config, ready), daemon=True)
+        process.start()
+        if not ready.wait(10.0):
+            stop_servers(servers + [process])
+            raise RuntimeError(f"Stand-in server did not start on {config.host}:{config.port}")
+        servers.append(process)
+    return servers
+
+
+def stop_servers(servers: list):
+    for process in servers:
+        process.terminate()
+    for process in servers:
+        process.join()
+
+
+def free_port(host: str = "127.0.0.1") -> int:
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+def run_server(config: ServerConfig):
+    if config.processes == 1:
+        _serve_main(config)
+        return
+    servers = start_servers(config)
+    try:
+        for process in servers:
+            process.join()
+    except KeyboardInterrupt:
+        stop_servers(servers)
@@ -0,0 +1,70 @@
+import asyncio
+from collections import Counter
+
+from loadtest.client import ConnectError
+
+
+def classify_error(exc: BaseException) -> str:
+    if isinstance(exc, ConnectError):
+        return "connect"
+    if isinstance(exc, asyncio.TimeoutError):
+        return "timeout"
+    return "other"
+
+
+class Stats:
+    def __init__(self):
+        self.requests = 0
+        self.statuses = Counter()
+        self.errors = Counter({"connect": 0, "timeout": 0, "5xx": 0, "other": 0})
+        # Open-model schedule misses: no free slot at the intended send time,
+        # or sent later than the late threshold
+        self.dropped = 0
+        self.late = 0
+        # Replay: log lines that could not be parsed or replayed
+        self.skipped = 0
+
+    def record_status(self, status: int):
+        self.statuses[status] += 1
+        if status >= 500:
+            self.errors["5xx"] += 1
+
+    def record_error(self, exc: BaseException):
+        self.errors[classify_error(exc)] += 1
+
+    def merge(self, other: "Stats"):
+        self.requests += other.requests
+        self.dropped += other.dropped
+        self.late += other.late
+        self.skipped += other.skipped
+        self.statuses.update(other.statuses)
+        self.errors.update(other.errors)
+
+    def state(self) -> dict:
+        """JSON-safe snapshot that round-trips through ``from_state``."""
+        return {
+            "requests": self.requests,
+            "statuses": {str(code): n for code, n in self.statuses.items()},
+            "errors": dict(self.errors),
+            "dropped": self.dropped,
+            "late": self.late,
+            "skipped": self.skipped,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "Stats":
+        stats = cls()
+        stats.requests = state["requests"]
+        stats.statuses.update({int(code): n for code, n in state["statuses"].items()})
+        stats.errors.update(state["errors"])
+        stats.dropped = state["dropped"]
+        stats.late = state["late"]
+        stats.skipped = state.get("skipped", 0)
+        return stats
+
+    def to_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "statuses": {str(code): n for code, n in sorted(self.statuses.items())},
+            "errors": dict(self.errors),
+        }
@@ -0,0 +1,176 @@
+import base64
+from collections import Counter
+from typing import Optional
+
+from loadtest.histogram import Histogram
+from loadtest.timeseries import INTERVAL_SUB_BUCKET_BITS
+
+# Response header set by the container's nginx config (see nginx.conf)
+TASK_HEADER = "X-Served-By"
+# A task is hot when its request rate since it first answered exceeds the
+# fair share by this factor, and has caught up once an interval reaches
+# this fraction of the fair share
+HOT_TASK_FACTOR = 1.25
+FAIR_SHARE_FRACTION = 0.9
+
+
+class TaskStats:
+    """Requests and latencies answered by a single task."""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0  # 5xx responses
+        self.first_seen = None  # seconds since the start of the run
+        self.latency = Histogram(INTERVAL_SUB_BUCKET_BITS)
+        self.per_interval = Counter()
+
+    def merge(self, other: "TaskStats"):
+        self.requests += other.requests
+        self.errors += other.errors
+        if self.first_seen is None or (other.first_seen is not None and other.first_seen < self.first_seen):
+            self.first_seen = other.first_seen
+        self.latency.merge(other.latency)
+        self.per_interval.update(other.per_interval)
+
+    def state(self) -> dict:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "first_seen": self.first_seen,
+            "latency": base64.b64encode(self.latency.to_bytes()).decode("ascii"),
+            "per_interval": {str(index): n for index, n in self.per_interval.items()},
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "TaskStats":
+        task = cls()
+        task.requests = state["requests"]
+        task.errors = state["errors"]
+        task.first_seen = state["first_seen"]
+        task.latency.merge(Histogram.from_bytes(base64.b64decode(state["latency"])))
+        task.per_interval.update({int(index): n for index, n in state["per_interval"].items()})
+        return task
+
+
+class TaskBreakdown:
+    """Splits responses by the task that served them, as named in a response header.
+
+    The header name is matched case-insensitively; responses without it are
+    only counted as ``untagged``. ``record_name`` takes the label directly,
+    e.g. an app version parsed from the body.
+    """
+
+    def __init__(self, interval: float, header: str = TASK_HEADER):
+        self.interval = interval
+        self.header = header.lower()
+        self.tasks = {}
+        self.untagged = 0
+
+    def record(self, elapsed: float, headers: dict, status: int, latency_us: int):
+        self.record_name(elapsed, headers.get(self.header), status, latency_us)
+
+    def record_name(self, elapsed: float, name: Optional[str], status: int, latency_us: int):
+        if name is None:
+            self.untagged += 1
+            return
+        task = self.tasks.get(name)
+        if task is None:
+            task = self.tasks[name] = TaskStats()
+            task.first_seen = elapsed
+        task.requests += 1
+        if status >= 500:
+            task.errors += 1
+        task.latency.record(latency_us)
+        task.per_interval[int(elapsed // self.interval)] += 1
+
+    def merge(self, other: "TaskBreakdown"):
+        self.untagged += other.untagged
+        for name, task in other.tasks.items():
+            if name in self.tasks:
+                self.tasks[name].merge(task)
+            else:
+                self.tasks[name] = task
+
+    def state(self) -> dict:
+        return {
+            "interval": self.interval,
+            "header": self.header,
+            "untagged": self.untagged,
+            "tasks": {name: task.state() for name, task in self.tasks.items()},
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "TaskBreakdown":
+        breakdown = cls(state["interval"], state["header"])
+        breakdown.untagged = state["untagged"]
+        breakdown.tasks = {name: TaskStats.from_state(s) for name, s in state["tasks"].items()}
+        return breakdown
+
+    def _interval_totals(self):
+        # Tagged requests per interval and the tasks that answered in it, so a
+        # task drained earlier no longer counts towards the fair share
+        totals = Counter()
+        active = Counter()
+        for task in self.tasks.values():
+            totals.update(task.per_interval)
+            active.update(index for index, n in task.per_interval.items() if n)
+        return totals, active
+
+    def interval_skew(self) -> dict:
+        """``{index: (busiest task over fair share, active tasks)}`` per interval.
+
+        The fair share of an interval is its tagged requests divided by the
+        tasks that answered in it.
+        """
+        totals, active = self._interval_totals()
+        skew = {}
+        for index, total in totals.items():
+            busiest = max(task.per_interval.get(index, 0) for task in self.tasks.values())
+            skew[index] = (round(busiest * active[index] / total, 2), active[index])
+        return skew
+
+    def _time_to_fair_share(self, task: TaskStats, totals: Counter, active: Counter) -> Optional[float]:
+        first = int(task.first_seen // self.interval)
+        if first == 0:
+            return 0.0
+        for index in sorted(task.per_interval):
+            if task.per_interval[index] >= FAIR_SHARE_FRACTION * totals[index] / active[index]:
+                return round((index - first) * self.interval, 3)
+        return None
+
+    def to_dict(self, elapsed: float) -> Optional[dict]:
+        if not self.tasks:
+            return None
+        tagged = sum(task.requests for task in self.tasks.values())
+        # Rate over the span the task answered in, so tasks added by a
+        # scale-out or drained early are not penalised for the time they
+        # did not exist
+        rates = {}
+        for name, task in self.tasks.items():
+            last = min(elapsed, (max(task.per_interval) + 1) * self.interval)
+            rates[name] = task.requests / max(last - task.first_seen, self.interval)
+        fair_rate = sum(rates.values()) / len(rates)
+        totals, active = self._interval_totals()
+        tasks = {}
+        for name in sorted(self.tasks, key=lambda n: self.tasks[n].first_seen):
+            task = self.tasks[name]
+            tasks[name] = {
+                "requests": task.requests,
+                "share_pct": round(100.0 * task.requests / tagged, 2),
+                "throughput_rps": round(rates[name], 1),
+                "5xx": task.errors,
+                "first_seen_s": round(task.first_seen, 3),
+                "last_interval_s": round(max(task.per_interval) * self.interval, 3),
+                "time_to_fair_share_s": self._time_to_fair_share(task, totals, active),
+                "latency_ms": task.latency.summary(),
+            }
+        hot = [name for name, rate in rates.items() if rate > HOT_TASK_FACTOR * fair_rate]
+        return {
+            "header": self.header,
+            "untagged": self.untagged,
+            "task_count": len(tasks),
+            # Busiest over least busy task, by rate while each was answering
+            "skew": round(max(rates.values()) / min(rates.values()), 2) if min(rates.values()) else None,
+            "hot_tasks": sorted(hot, key=lambda n: -rates[n]),
+            "tasks": tasks,
+        }
@@ -0,0 +1,142 @@
+from typing import Optional
+
+from loadtest.histogram import Histogram
+from loadtest.stats import Stats
+
+# Interval histograms trade a little precision (<1.6%) for a smaller footprint
+INTERVAL_SUB_BUCKET_BITS = 7
+
+
+class Interval:
+    """Counters and latencies of the responses that completed in one time slice."""
+
+    def __init__(self, index: int, start: float):
+        self.index = index
+        self.start = start
+        self.stats = Stats()
+        # Requests still in flight when the interval closed, for live output
+        self.in_flight = 0
+        self._latency = Histogram(INTERVAL_SUB_BUCKET_BITS)
+        self._frozen = None
+
+    @property
+    def latency(self) -> Histogram:
+        if self._latency is None:
+            self._latency = Histogram.from_bytes(self._frozen)
+            self._frozen = None
+        return self._latency
+
+    def freeze(self):
+        # Closed intervals are kept in the sparse encoding so multi-hour runs
+        # hold a few KB per interval instead of a full bucket array.
+        if self._latency is not None:
+            self._frozen = self._latency.to_bytes()
+            self._latency = None
+
+    def merge(self, other: "Interval"):
+        self.start = min(self.start, other.start)
+        self.stats.merge(other.stats)
+        self.in_flight += other.in_flight
+        self.latency.merge(other.latency)
+
+    def to_dict(self, offset: float, length: float, phase: Optional[str] = None,
+                target_rps: Optional[float] = None) -> dict:
+        latency = self.latency
+        result = {
+            "t": round(self.start, 3),
+            "offset_s": round(offset, 3),
+        }
+        if phase is not None:
+            result["phase"] = phase
+        if target_rps is not None:
+            result["target_rps"] = round(target_rps, 1)
+        result.update({
+            "requests": self.stats.requests,
+            "throughput_rps": round(self.stats.requests / length, 1),
+            "errors": dict(self.stats.errors),
+            "latency_ms": {
+                "p50": round(latency.value_at_percentile(50) / 1000, 3),
+                "p90": round(latency.value_at_percentile(90) / 1000, 3),
+                "p99": round(latency.value_at_percentile(99) / 1000, 3),
+                "max": round(latency.max / 1000, 3),
+            },
+        })
+        self.freeze()
+        return result
+
+
+class IntervalSeries:
+    """Fixed-length intervals keyed by their offset from the start of the run."""
+
+    def __init__(self, length: float, started_at: float):
+        self.length = length
+        self.started_at = started_at
+        self.intervals = {}
+        self._current = None
+        self._next_emit = 0
+
+    def _interval(self, elapsed: float) -> Interval:
+        index = max(0, int(elapsed // self.length))
+        current = self._current
+        if current is not None and current.index == index:
+            return current
+        interval = self.intervals.get(index)
+        if interval is None:
+            interval = Interval(index, self.started_at + index * self.length)
+            self.intervals[index] = interval
+        if current is not None and current.index < index:
+            current.freeze()
+        self._current = interval
+        return interval
+
+    def record_response(self, elapsed: float, status: int, latency_us: int):
+        interval = self._interval(elapsed)
+        interval.stats.requests += 1
+        interval.stats.record_status(status)
+        interval.latency.record(latency_us)
+
+    def record_error(self, elapsed: float, exc: BaseException, latency_us: int):
+        interval = self._interval(elapsed)
+        interval.stats.requests += 1
+        interval.stats.record_error(exc)
+        interval.latency.record(latency_us)
+
+    def freeze(self):
+        for interval in self.intervals.values():
+            interval.freeze()
+        self._current = None
+
+    def pop_closed(self, elapsed: Optional[float] = None) -> list:
+        """Intervals that ended before ``elapsed`` (all when None) and were not returned yet."""
+        end = max(self.intervals, default=-1) + 1 if elapsed is None else int(elapsed // self.length)
+        closed = [self.intervals[i] for i in range(self._next_emit, end) if i in self.intervals]
+        self._next_emit = max(self._next_emit, end)
+        return closed
+
+    def add(self, interval: Interval):
+        # Shards start together, so intervals with the same index line up
+        existing = self.intervals.get(interval.index)
+        if existing is None:
+            self.intervals[interval.index] = interval
+        else:
+            existing.merge(interval)
+            existing.freeze()
+
+    def merge(self, other: "IntervalSeries"):
+        self.started_at = min(self.started_at, other.started_at)
+        for interval in other.intervals.values():
+            self.add(interval)
+
+    def to_list(self, elapsed: float, profile=None, rate: Optional[float] = None) -> list:
+        result = []
+        for index in sorted(self.intervals):
+            offset = index * self.length
+            length = max(min(self.length, elapsed - offset), 1e-3)
+            phase = target = None
+            if profile is not None:
+                phase = profile.phase_at(offset)
+                target = profile.rate_at(offset + length / 2)
+            elif rate:
+                target = rate
+            result.append(self.intervals[index].to_dict(offset, length, phase, target))
+        return result
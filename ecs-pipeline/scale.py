@@ -0,0 +1,151 @@
+import argparse
+import csv
+import json
+import os
+import sys
+
+from scaling.capacity import CapacityTarget, env_settings, format_plan, load_sizes, parse_size, plan, write_env
+from scaling.policy import describe, load_policy
+from scaling.simulator import RateSeries, Simulation, TaskModel
+
+# The traffic schedule is shared with the stacks, in ../pipelines
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pipelines.schedule import hourly_minimums, load_traffic_profile, scheduled_minimums  # noqa: E402
+
+COMMANDS = ("simulate", "plan", "schedule")
+SAMPLE_FIELDS = ("t", "rps", "desired", "running", "cpu_pct", "latency_ms", "backlog")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline tools for the ECS service's auto scaling")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    model = TaskModel(capacity_rps=0)
+    simulate_parser = commands.add_parser(
+        "simulate", help="Replay a request-rate series against the step-scaling policy")
+    simulate_parser.add_argument("--policy", required=True,
+                                 help="Synthesized template, cdk.out directory or JSON policy spec")
+    simulate_parser.add_argument("--series", required=True,
+                                 help="Request rate over time: 't,rps' CSV, load profile or load-test result")
+    simulate_parser.add_argument("--task-capacity-rps", type=float, required=True,
+                                 help="Requests per second one task serves at 100%% CPU")
+    simulate_parser.add_argument("--base-cpu-pct", type=float, default=model.base_cpu_pct,
+                                 help="CPU of an idle task")
+    simulate_parser.add_argument("--service-ms", type=float, default=model.service_ms,
+                                 help="Response time of an idle task")
+    simulate_parser.add_argument("--startup", type=float, default=model.startup_s,
+                                 help="Seconds from a scale-out until the new tasks take traffic")
+    simulate_parser.add_argument("--metric-delay", type=float, default=model.metric_delay_s,
+                                 help="Seconds from the end of a period until its datapoint reaches the alarm")
+    simulate_parser.add_argument("--desired", type=int, help="Initial task count (default: min capacity)")
+    simulate_parser.add_argument("--duration", type=float, help="Seconds to simulate (default: the series)")
+    simulate_parser.add_argument("--step", type=float, default=60.0, help="Seconds between output samples")
+    simulate_parser.add_argument("--format", choices=("json", "csv"), default="json")
+    simulate_parser.add_argument("--output", help="Write the result to this file instead of stdout")
+
+    target = CapacityTarget(peak_rps=0)
+    plan_parser = commands.add_parser(
+        "plan", help="Recommend the task size and min/max/desired counts from per-task benchmarks")
+    plan_parser.add_argument("--sizes", help="JSON benchmark file with cpu, memory_mib and rps per task size")
+    plan_parser.add_argument("--size", action="append", default=[], metavar="CPU:MEMORY=RPS",
+                             help="One benchmarked task size, e.g. 256:512=380 (repeatable)")
+    plan_parser.add_argument("--peak-rps", type=float, required=True, help="Peak request rate to serve")
+    plan_parser.add_argument("--headroom-pct", type=float, default=target.headroom_pct,
+                             help="Spare capacity to keep at peak")
+    plan_parser.add_argument("--base-rps", type=float, default=target.base_rps,
+                             help="Lowest expected request rate, sizes the minimum task count")
+    plan_parser.add_argument("--min-tasks", type=int, default=target.min_tasks,
+                             help="Never recommend fewer tasks than this (2 keeps a task in each AZ)")
+    plan_parser.add_argument("--env", help="Environment name, printed with the settings")
+    plan_parser.add_argument("--write-env", metavar="PATH",
+                             help="Store the recommended settings in this .env file")
+    plan_parser.add_argument("--json", action="store_true", help="Print the plan as JSON")
+
+    schedule_parser = commands.add_parser(
+        "schedule", help="Show the scheduled minimum task counts a traffic profile produces")
+    schedule_parser.add_argument("profile", help="JSON traffic profile with hourly rate percentiles")
+    schedule_parser.add_argument("--percentile", help="Percentile to plan for (default: the profile's)")
+    schedule_parser.add_argument("--min-capacity", type=int, default=1)
+    schedule_parser.add_argument("--max-capacity", type=int, default=5)
+
+    args = parser.parse_args(argv)
+    if args.command == "plan":
+        try:
+            args.sizes = (load_sizes(args.sizes) if args.sizes else []) + [parse_size(s) for s in args.size]
+        except ValueError as exc:
+            parser.error(str(exc))
+        if not args.sizes:
+            parser.error("plan needs --sizes or at least one --size")
+    return args
+
+
+def simulate_command(args):
+    config = load_policy(args.policy)
+    model = TaskModel(
+        capacity_rps=args.task_capacity_rps,
+        base_cpu_pct=args.base_cpu_pct,
+        service_ms=args.service_ms,
+        startup_s=args.startup,
+        metric_delay_s=args.metric_delay,
+    )
+    for line in describe(config):
+        print(line, file=sys.stderr)
+    simulation = Simulation(config, model, args.desired)
+    samples = simulation.run(RateSeries.load(args.series), args.duration, args.step)
+    summary = simulation.summary()
+    print(f"{summary['scale_out']} scale-out and {summary['scale_in']} scale-in actions, "
+          f"{summary['reversals']} reversals, up to {summary['max_desired']} tasks, "
+          f"p99 {summary['latency_ms']['p99']} ms", file=sys.stderr)
+
+    out = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        if args.format == "csv":
+            writer = csv.DictWriter(out, SAMPLE_FIELDS)
+            writer.writeheader()
+            writer.writerows(samples)
+        else:
+            json.dump({"summary": summary, "actions": simulation.actions, "samples": samples}, out, indent=2)
+            print(file=out)
+    finally:
+        if args.output:
+            out.close()
+
+
+def plan_command(args):
+    result = plan(args.sizes, CapacityTarget(
+        peak_rps=args.peak_rps,
+        headroom_pct=args.headroom_pct,
+        base_rps=args.base_rps,
+        min_tasks=args.min_tasks,
+    ))
+    if args.json:
+        json.dump(result, sys.stdout, indent=2)
+        print()
+    else:
+        print(format_plan(result, args.env))
+    if args.write_env:
+        write_env(args.write_env, env_settings(result["recommendation"]))
+        print(f"Updated {args.write_env}", file=sys.stderr)
+
+
+def schedule_command(args):
+    profile = load_traffic_profile(args.profile, args.percentile)
+    bounds = {"min_capacity": args.min_capacity, "max_capacity": args.max_capacity}
+    needed = hourly_minimums(profile, **bounds)
+    print(f"hourly minimum ({profile.percentile}): {' '.join(str(n) for n in needed)}")
+    for action in scheduled_minimums(profile, **bounds):
+        print(f"{action.hour:02d}:{action.minute:02d} {profile.timezone or 'UTC'}  "
+              f"min_capacity={action.min_capacity}  ({action.reason})")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    {
+        "simulate": simulate_command,
+        "plan": plan_command,
+        "schedule": schedule_command,
+    }[args.command](args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Task size and task count recommendations from measured per-task throughput.
+
+Benchmarks are a JSON list of task sizes with the rate one task sustained at
+the utilization the service should run at, e.g. from a load test against a
+service pinned to one task::
+
+    {"sizes": [{"cpu": 256, "memory_mib": 512, "rps": 380},
+               {"cpu": 512, "memory_mib": 1024, "rps": 820}]}
+
+The result is expressed as the settings ``pipelines/config.py`` reads, so it can
+be written straight into an environment's ``.env`` file.
+"""
+import json
+import math
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+# Valid Fargate memory settings (MiB) per CPU setting
+FARGATE_MEMORY = {
+    256: (512, 1024, 2048),
+    512: tuple(range(1024, 4096 + 1, 1024)),
+    1024: tuple(range(2048, 8192 + 1, 1024)),
+    2048: tuple(range(4096, 16384 + 1, 1024)),
+    4096: tuple(range(8192, 30720 + 1, 1024)),
+}
+# On-demand Linux/x86 Fargate prices in us-east-1, USD per vCPU-hour and per GB-hour;
+# only used to rank sizes, so regional differences do not change the choice
+VCPU_HOUR = 0.04048
+GB_HOUR = 0.004445
+# Setting name in .env -> recommendation field
+ENV_KEYS = {
+    "TASK_CPU": "cpu",
+    "TASK_MEMORY_MIB": "memory_mib",
+    "DESIRED_COUNT": "desired_count",
+    "MIN_CAPACITY": "min_capacity",
+    "MAX_CAPACITY": "max_capacity",
+}
+
+
+@dataclass
+class TaskSize:
+    cpu: int
+    memory_mib: int
+    rps: float  # measured sustained requests per second of one task
+
+    def __post_init__(self):
+        if self.memory_mib not in FARGATE_MEMORY.get(self.cpu, ()):
+            raise ValueError(f"cpu={self.cpu} memory_mib={self.memory_mib} is not a valid Fargate task size")
+        if self.rps <= 0:
+            raise ValueError(f"cpu={self.cpu} memory_mib={self.memory_mib}: throughput must be positive")
+
+    @property
+    def hourly_cost(self) -> float:
+        return self.cpu / 1024 * VCPU_HOUR + self.memory_mib / 1024 * GB_HOUR
+
+
+@dataclass
+class CapacityTarget:
+    peak_rps: float
+    headroom_pct: float = 30.0  # spare capacity kept at peak
+    base_rps: float = 0.0  # lowest expected traffic, sizes min_capacity
+    min_tasks: int = 1  # floor for min_capacity, e.g. 2 to keep one task per AZ
+
+
+def load_sizes(path: str) -> List[TaskSize]:
+    with open(path) as f:
+        document = json.load(f)
+    sizes = document["sizes"] if isinstance(document, dict) else document
+    return [TaskSize(int(s["cpu"]), int(s["memory_mib"]), float(s["rps"])) for s in sizes]
+
+
+def parse_size(spec: str) -> TaskSize:
+    """``256:512=380`` is 256 CPU units and 512 MiB serving 380 requests/s."""
+    match = re.match(r"^\s*(\d+)\s*:\s*(\d+)\s*=\s*([0-9.]+)\s*$", spec)
+    if match is None:
+        raise ValueError(f"Cannot parse task size {spec!r}, expected CPU:MEMORY=RPS, e.g. 256:512=380")
+    return TaskSize(int(match.group(1)), int(match.group(2)), float(match.group(3)))
+
+
+def _tasks(rps: float, size: TaskSize, headroom_pct: float) -> int:
+    return max(1, math.ceil(rps * (1 + headroom_pct / 100.0) / size.rps))
+
+
+def evaluate(size: TaskSize, target: CapacityTarget) -> dict:
+    max_capacity = max(_tasks(target.peak_rps, size, target.headroom_pct), target.min_tasks)
+    min_capacity = min(max(_tasks(target.base_rps, size, target.headroom_pct), target.min_tasks), max_capacity)
+    return {
+        "cpu": size.cpu,
+        "memory_mib": size.memory_mib,
+        "task_rps": size.rps,
+        "min_capacity": min_capacity,
+        "max_capacity": max_capacity,
+        "desired_count": min_capacity,
+        "peak_utilization_pct": round(100.0 * target.peak_rps / (max_capacity * size.rps), 1),
+        "peak_cost_per_hour": round(max_capacity * size.hourly_cost, 4),
+        "base_cost_per_hour": round(min_capacity * size.hourly_cost, 4),
+    }
+
+
+def plan(sizes: List[TaskSize], target: CapacityTarget) -> dict:
+    """Pick the size that serves the peak with the requested headroom at the lowest cost.
+
+    Ties go to the size with more tasks at peak, which loses less capacity
+    when one task fails or is replaced.
+    """
+    if not sizes:
+        raise ValueError("No task sizes to plan with")
+    if target.peak_rps <= 0:
+        raise ValueError("The target peak rate must be positive")
+    candidates = sorted(
+        (evaluate(size, target) for size in sizes),
+        key=lambda c: (c["peak_cost_per_hour"], -c["max_capacity"], c["base_cost_per_hour"]),
+    )
+    return {
+        "target": {
+            "peak_rps": target.peak_rps,
+            "headroom_pct": target.headroom_pct,
+            "base_rps": target.base_rps,
+            "min_tasks": target.min_tasks,
+        },
+        "recommendation": candidates[0],
+        "candidates": candidates,
+    }
+
+
+def env_settings(recommendation: dict) -> Dict[str, str]:
+    return {key: str(recommendation[field]) for key, field in ENV_KEYS.items()}
+
+
+def write_env(path: str, settings: Dict[str, str]):
+    """Set ``settings`` in a .env file, keeping every other line as it is."""
+    lines = []
+    if os.path.exists(path):
+        with open(path) as f:
+            lines = f.read().splitlines()
+    remaining = dict(settings)
+    for i, line in enumerate(lines):
+        key = line.split("=", 1)[0].strip()
+        if key in remaining:
+            lines[i] = f"{key}={remaining.pop(key)}"
+    lines.extend(f"{key}={value}" for key, value in remaining.items())
+    with open(path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def format_plan(result: dict, env: Optional[str] = None) -> str:
+    header = f"{'cpu':>5} {'memory':>7} {'task rps':>9} {'min':>4} {'max':>4} {'peak util':>9} {'$/h peak':>9}"
+    rows = [header]
+    best = result["recommendation"]
+    for c in result["candidates"]:
+        mark = "  <- recommended" if c is best else ""
+        rows.append(
+            f"{c['cpu']:>5} {c['memory_mib']:>7} {c['task_rps']:>9g} {c['min_capacity']:>4} {c['max_capacity']:>4}"
+            f" {c['peak_utilization_pct']:>8}% {c['peak_cost_per_hour']:>9.4f}{mark}"
+        )
+    rows.append("")
+    if env:
+        rows.append(f"# {env}")
+    rows.extend(f"{key}={value}" for key, value in env_settings(best).items())
+    return "\n".join(rows)
@@ -0,0 +1,238 @@
+"""Step-scaling policies as Application Auto Scaling evaluates them.
+
+Policies are read either from a synthesized template (``cdk synth`` output,
+nested stack templates included) or from a small JSON spec that mirrors the
+``scale_on_metric`` call in ``ECSFargateSimpleStack``::
+
+    {"min_capacity": 1, "max_capacity": 5, "metric": "CPUUtilization",
+     "period": 60, "evaluation_periods": 1, "cooldown": 60,
+     "scaling_steps": [{"change": -1, "upper": 4}, {"change": 1, "lower": 6}]}
+"""
+import glob
+import json
+import os
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+COMPARISONS = {
+    "GreaterThanOrEqualToThreshold": lambda value, threshold: value >= threshold,
+    "GreaterThanThreshold": lambda value, threshold: value > threshold,
+    "LessThanOrEqualToThreshold": lambda value, threshold: value <= threshold,
+    "LessThanThreshold": lambda value, threshold: value < threshold,
+}
+ADJUSTMENT_TYPES = ("ChangeInCapacity", "PercentChangeInCapacity", "ExactCapacity")
+
+
+@dataclass
+class StepAdjustment:
+    # Bounds are relative to the alarm threshold; None is unbounded
+    change: float
+    lower: Optional[float] = None
+    upper: Optional[float] = None
+
+    def matches(self, delta: float) -> bool:
+        # Above the threshold the lower bound is inclusive, below it the upper one
+        if delta >= 0:
+            return (self.lower is None or delta >= self.lower) and (self.upper is None or delta < self.upper)
+        return (self.lower is None or delta > self.lower) and (self.upper is None or delta <= self.upper)
+
+    @property
+    def below_threshold(self) -> bool:
+        return self.upper is not None and self.upper <= 0
+
+
+@dataclass
+class Alarm:
+    metric: str
+    threshold: float
+    comparison: str
+    period: int = 60
+    evaluation_periods: int = 1
+    datapoints_to_alarm: Optional[int] = None
+    statistic: str = "Average"
+
+    def breaching(self, value: float) -> bool:
+        return COMPARISONS[self.comparison](value, self.threshold)
+
+
+@dataclass
+class StepPolicy:
+    name: str
+    alarm: Alarm
+    steps: List[StepAdjustment]
+    adjustment_type: str = "ChangeInCapacity"
+    cooldown: int = 0
+    min_adjustment_magnitude: Optional[int] = None
+
+    def adjustment(self, value: float) -> Optional[StepAdjustment]:
+        delta = value - self.alarm.threshold
+        return next((step for step in self.steps if step.matches(delta)), None)
+
+    def apply(self, step: StepAdjustment, capacity: int) -> int:
+        if self.adjustment_type == "ExactCapacity":
+            return int(step.change)
+        if self.adjustment_type == "PercentChangeInCapacity":
+            change = int(capacity * step.change / 100.0)
+            if self.min_adjustment_magnitude and abs(change) < self.min_adjustment_magnitude:
+                change = self.min_adjustment_magnitude if step.change > 0 else -self.min_adjustment_magnitude
+            return capacity + change
+        return capacity + int(step.change)
+
+    @property
+    def scales_out(self) -> bool:
+        return any(step.change > 0 for step in self.steps)
+
+
+@dataclass
+class ScalingConfig:
+    min_capacity: int
+    max_capacity: int
+    policies: List[StepPolicy] = field(default_factory=list)
+
+
+def from_spec(spec: dict) -> ScalingConfig:
+    """Build the policies the way CDK's ``scale_on_metric`` splits ``scaling_steps``.
+
+    Steps that remove capacity share one alarm at the highest of their upper
+    bounds, steps that add capacity one at the lowest of their lower bounds.
+    """
+    common = {
+        "metric": spec.get("metric", "CPUUtilization"),
+        "period": int(spec.get("period", 60)),
+        "evaluation_periods": int(spec.get("evaluation_periods", 1)),
+        "statistic": spec.get("statistic", "Average"),
+    }
+    adjustment_type = spec.get("adjustment_type", "ChangeInCapacity")
+    if adjustment_type not in ADJUSTMENT_TYPES:
+        raise ValueError(f"Unknown adjustment type {adjustment_type!r}, expected one of {ADJUSTMENT_TYPES}")
+    steps = spec["scaling_steps"]
+    scale_in = [s for s in steps if s["change"] < 0]
+    scale_out = [s for s in steps if s["change"] > 0]
+    policies = []
+    if scale_in:
+        threshold = max(s["upper"] for s in scale_in)
+        policies.append(StepPolicy(
+            "LowerPolicy",
+            Alarm(threshold=threshold, comparison="LessThanOrEqualToThreshold", **common),
+            [StepAdjustment(s["change"],
+                            s["lower"] - threshold if s.get("lower") is not None else None,
+                            s["upper"] - threshold)
+             for s in scale_in],
+            adjustment_type,
+            int(spec.get("cooldown", 0)),
+        ))
+    if scale_out:
+        threshold = min(s["lower"] for s in scale_out)
+        policies.append(StepPolicy(
+            "UpperPolicy",
+            Alarm(threshold=threshold, comparison="GreaterThanOrEqualToThreshold", **common),
+            [StepAdjustment(s["change"],
+                            s["lower"] - threshold,
+                            s["upper"] - threshold if s.get("upper") is not None else None)
+             for s in scale_out],
+            adjustment_type,
+            int(spec.get("cooldown", 0)),
+        ))
+    return ScalingConfig(int(spec["min_capacity"]), int(spec["max_capacity"]), policies)
+
+
+def _template_paths(path: str) -> List[str]:
+    if os.path.isdir(path):
+        return sorted(glob.glob(os.path.join(path, "*.template.json")))
+    return [path]
+
+
+def _ref(value) -> Optional[str]:
+    return value.get("Ref") if isinstance(value, dict) else None
+
+
+def _number(value, default=None):
+    return default if value is None else float(value)
+
+
+def from_template(path: str) -> ScalingConfig:
+    """Read the ECS scalable target and its step-scaling policies from a template or cdk.out directory."""
+    targets = []
+    for template_path in _template_paths(path):
+        with open(template_path) as f:
+            resources = json.load(f).get("Resources", {})
+        alarms = {}
+        for resource in resources.values():
+            if resource.get("Type") != "AWS::CloudWatch::Alarm":
+                continue
+            props = resource["Properties"]
+            for action in props.get("AlarmActions", []):
+                if _ref(action):
+                    alarms[_ref(action)] = props
+
+        for logical_id, resource in resources.items():
+            if resource.get("Type") != "AWS::ApplicationAutoScaling::ScalableTarget":
+                continue
+            props = resource["Properties"]
+            config = ScalingConfig(int(props["MinCapacity"]), int(props["MaxCapacity"]))
+            for policy_id, policy in resources.items():
+                policy_props = policy.get("Properties", {})
+                if (policy.get("Type") != "AWS::ApplicationAutoScaling::ScalingPolicy"
+                        or _ref(policy_props.get("ScalingTargetId")) != logical_id
+                        or policy_props.get("PolicyType") != "StepScaling"):
+                    continue
+                alarm = alarms.get(policy_id)
+                if alarm is None:
+                    continue
+                step_config = policy_props["StepScalingPolicyConfiguration"]
+                config.policies.append(StepPolicy(
+                    policy_id,
+                    Alarm(
+                        metric=alarm.get("MetricName", "?"),
+                        threshold=float(alarm["Threshold"]),
+                        comparison=alarm["ComparisonOperator"],
+                        period=int(alarm.get("Period", 60)),
+                        evaluation_periods=int(alarm.get("EvaluationPeriods", 1)),
+                        datapoints_to_alarm=alarm.get("DatapointsToAlarm"),
+                        statistic=alarm.get("Statistic", "Average"),
+                    ),
+                    [
+                        StepAdjustment(
+                            float(step["ScalingAdjustment"]),
+                            _number(step.get("MetricIntervalLowerBound")),
+                            _number(step.get("MetricIntervalUpperBound")),
+                        )
+                        for step in step_config["StepAdjustments"]
+                    ],
+                    step_config.get("AdjustmentType", "ChangeInCapacity"),
+                    int(step_config.get("Cooldown", 0)),
+                    step_config.get("MinAdjustmentMagnitude"),
+                ))
+            targets.append(config)
+
+    if not targets:
+        raise ValueError(f"No Application Auto Scaling target found in {path}")
+    if len(targets) > 1:
+        raise ValueError(f"{path} defines {len(targets)} scalable targets; pass a single template")
+    return targets[0]
+
+
+def load_policy(path: str) -> ScalingConfig:
+    """Load a policy spec (``.json`` with ``scaling_steps``), a template or a cdk.out directory."""
+    if os.path.isfile(path):
+        with open(path) as f:
+            document = json.load(f)
+        if "scaling_steps" in document:
+            return from_spec(document)
+    return from_template(path)
+
+
+def describe(config: ScalingConfig) -> List[str]:
+    lines = [f"capacity {config.min_capacity}..{config.max_capacity}"]
+    for policy in config.policies:
+        alarm = policy.alarm
+        for step in policy.steps:
+            low = "-inf" if step.lower is None else f"{alarm.threshold + step.lower:g}"
+            high = "+inf" if step.upper is None else f"{alarm.threshold + step.upper:g}"
+            interval = f"({low}, {high}]" if step.below_threshold else f"[{low}, {high})"
+            lines.append(
+                f"{policy.name}: {alarm.statistic} {alarm.metric} in {interval} "
+                f"for {alarm.evaluation_periods}x{alarm.period}s -> {policy.adjustment_type} {step.change:+g}"
+                f" (cooldown {policy.cooldown}s)"
+            )
+    return lines
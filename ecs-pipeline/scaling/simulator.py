@@ -0,0 +1,264 @@
+"""Offline replay of a request-rate series against the service's step-scaling policy.
+
+The model is deliberately small, so it is easy to reason about:
+
+* Each running task serves up to ``capacity_rps``; its CPU is ``base_cpu_pct``
+  plus its share of that capacity, capped at 100%.
+* Latency is ``service_ms`` stretched by M/M/1 queueing while tasks are below
+  saturation, plus the time to drain the backlog that builds up above it.
+* CloudWatch publishes one datapoint per alarm period, ``metric_delay_s``
+  after the period ends. Alarms are evaluated whenever a datapoint lands and,
+  like Application Auto Scaling, re-invoke their policy while in ALARM.
+* New tasks count towards the desired count at once but only take traffic
+  ``startup_s`` later. Removed tasks stop taking traffic immediately.
+"""
+import csv
+import heapq
+import json
+import math
+from dataclasses import dataclass
+from typing import List, Optional
+
+from loadtest.profiles import LoadProfile
+from scaling.policy import ScalingConfig, StepPolicy
+
+# M/M/1 waits grow without bound as utilization approaches 1; cap it here and
+# let the backlog model take over beyond
+MAX_UTILIZATION = 0.99
+REQUEST_COUNT_METRICS = ("RequestCountPerTarget", "ALBRequestCountPerTarget")
+
+
+@dataclass
+class TaskModel:
+    capacity_rps: float  # sustained requests per second one task serves at 100% CPU
+    base_cpu_pct: float = 2.0  # idle CPU of a task
+    service_ms: float = 5.0  # response time of an idle task
+    startup_s: float = 60.0  # from desired-count change to receiving traffic
+    metric_delay_s: float = 60.0  # from the end of a period to the datapoint being visible
+
+
+class RateSeries:
+    """A request rate over time, piecewise constant between samples."""
+
+    def __init__(self, points: List[tuple]):
+        if not points:
+            raise ValueError("A rate series needs at least one sample")
+        self.points = sorted(points)
+        self.duration = self.points[-1][0]
+        self._index = 0
+
+    @classmethod
+    def from_profile(cls, spec, step: float = 1.0) -> "RateSeries":
+        profile = LoadProfile.from_spec(spec)
+        count = int(math.ceil(profile.duration / step))
+        return cls([(i * step, profile.rate_at(i * step)) for i in range(count)] + [(profile.duration, 0.0)])
+
+    @classmethod
+    def load(cls, path: str) -> "RateSeries":
+        """Read a ``t,rps`` CSV, a load profile or a load-test result with intervals."""
+        if path.endswith(".csv"):
+            with open(path) as f:
+                rows = [row for row in csv.reader(f) if row and not row[0].startswith("#")]
+            if rows and not _is_number(rows[0][0]):
+                rows = rows[1:]
+            return cls([(float(row[0]), float(row[1])) for row in rows])
+
+        with open(path) as f:
+            document = json.load(f)
+        if "phases" in document or isinstance(document, list):
+            return cls.from_profile(document)
+        if "intervals" in document:
+            intervals = document["intervals"]
+            # Prefer the offered load over what the target managed to serve
+            points = [(i["offset_s"], i.get("target_rps", i["throughput_rps"])) for i in intervals]
+            if len(intervals) > 1:
+                points.append((2 * points[-1][0] - points[-2][0], 0.0))
+            return cls(points)
+        raise ValueError(f"{path}: expected a CSV, a load profile or a load-test result with intervals")
+
+    def rate_at(self, t: float) -> float:
+        points = self.points
+        # Lookups arrive in time order; walk forward from the last position
+        if self._index and points[self._index][0] > t:
+            self._index = 0
+        while self._index + 1 < len(points) and points[self._index + 1][0] <= t:
+            self._index += 1
+        return points[self._index][1] if points[self._index][0] <= t else 0.0
+
+
+def _is_number(value: str) -> bool:
+    try:
+        float(value)
+    except ValueError:
+        return False
+    return True
+
+
+class _AlarmState:
+    def __init__(self, policy: StepPolicy):
+        self.policy = policy
+        self.datapoints = []
+        self.in_alarm = False
+
+    def evaluate(self, value: float) -> bool:
+        alarm = self.policy.alarm
+        self.datapoints.append(value)
+        recent = self.datapoints[-alarm.evaluation_periods:]
+        required = alarm.datapoints_to_alarm or alarm.evaluation_periods
+        # Too few datapoints leaves the alarm in its current state
+        if len(recent) >= required:
+            self.in_alarm = sum(alarm.breaching(v) for v in recent) >= required
+        return self.in_alarm
+
+
+class Simulation:
+    def __init__(self, config: ScalingConfig, model: TaskModel, desired: Optional[int] = None):
+        self.config = config
+        self.model = model
+        self.desired = min(max(desired or config.min_capacity, config.min_capacity), config.max_capacity)
+        self.running = self.desired
+        self._starting = []  # times at which pending tasks begin taking traffic
+        self.backlog = 0.0
+        self._alarms = [_AlarmState(policy) for policy in config.policies]
+        self._cooldown_until = {}  # scale direction -> end of cooldown
+        self.actions = []
+        # One (desired, latency_ms, saturated) entry per simulated second
+        self.trace = []
+
+    def _utilization(self, rps: float) -> float:
+        return rps / (self.running * self.model.capacity_rps) if self.running else math.inf
+
+    def _cpu(self, rps: float) -> float:
+        if not self.running:
+            return 0.0
+        busy = min(self._utilization(rps), 1.0) * (100.0 - self.model.base_cpu_pct)
+        return self.model.base_cpu_pct + busy
+
+    def _latency_ms(self, rps: float) -> float:
+        model = self.model
+        rho = min(self._utilization(rps), MAX_UTILIZATION)
+        latency = model.service_ms / (1.0 - rho)
+        if self.backlog and self.running:
+            latency += 1000.0 * self.backlog / (self.running * model.capacity_rps)
+        return latency
+
+    def _metric(self, policy: StepPolicy, cpu: float, requests: float) -> float:
+        if policy.alarm.metric in REQUEST_COUNT_METRICS:
+            return requests / max(self.running, 1)
+        return cpu
+
+    def _scale(self, t: float, alarm: _AlarmState, value: float):
+        policy = alarm.policy
+        step = policy.adjustment(value)
+        if step is None:
+            return
+        target = min(max(policy.apply(step, self.desired), self.config.min_capacity), self.config.max_capacity)
+        if target == self.desired:
+            return
+        direction = "out" if target > self.desired else "in"
+        if t < self._cooldown_until.get(direction, -math.inf):
+            return
+        # A scale-out cooldown also holds back scale-in; scale-out ends a scale-in cooldown
+        if direction == "in" and t < self._cooldown_until.get("out", -math.inf):
+            return
+        if direction == "out":
+            self._cooldown_until.pop("in", None)
+        self._cooldown_until[direction] = t + policy.cooldown
+
+        if direction == "out":
+            self._starting.extend([t + self.model.startup_s] * (target - self.desired))
+        else:
+            removed = self.desired - target
+            # Tasks that have not started yet are the first to go
+            while removed and self._starting:
+                self._starting.pop()
+                removed -= 1
+            self.running -= removed
+        self.actions.append({
+            "t": round(t, 3),
+            "policy": policy.name,
+            "metric_value": round(value, 3),
+            "from": self.desired,
+            "to": target,
+        })
+        self.desired = target
+
+    def run(self, series: RateSeries, duration: Optional[float] = None, sample_every: float = 60.0) -> List[dict]:
+        duration = series.duration if duration is None else duration
+        alarm_periods = sorted({alarm.policy.alarm.period for alarm in self._alarms})
+        # (period, index) -> [CPU-seconds, requests, seconds] of that period so far
+        periods = {}
+        # Heap of (visible at, (period, index)) for every datapoint not yet published; with
+        # mixed alarm periods they do not become visible in the order they were opened
+        publishing = []
+        samples = []
+        next_sample = 0.0
+        t = 0.0
+        while t < duration:
+            if self._starting and min(self._starting) <= t:
+                self.running += sum(1 for start in self._starting if start <= t)
+                self._starting = [start for start in self._starting if start > t]
+
+            rps = series.rate_at(t)
+            cpu = self._cpu(rps)
+            latency = self._latency_ms(rps)
+            self.backlog = max(0.0, self.backlog + rps - self.running * self.model.capacity_rps)
+            self.trace.append((self.desired, latency, self.backlog > 0))
+
+            for period in alarm_periods:
+                key = (period, int(t // period))
+                totals = periods.get(key)
+                if totals is None:
+                    totals = periods[key] = [0.0, 0.0, 0]
+                    heapq.heappush(publishing, ((key[1] + 1) * period + self.model.metric_delay_s, key))
+                totals[0] += cpu
+                totals[1] += rps
+                totals[2] += 1
+
+            if t >= next_sample:
+                samples.append({
+                    "t": round(t, 3),
+                    "rps": round(rps, 3),
+                    "desired": self.desired,
+                    "running": self.running,
+                    "cpu_pct": round(cpu, 2),
+                    "latency_ms": round(latency, 3),
+                    "backlog": round(self.backlog, 1),
+                })
+                next_sample += sample_every
+
+            while publishing and publishing[0][0] <= t:
+                _, key = heapq.heappop(publishing)
+                cpu_seconds, requests, seconds = periods.pop(key)
+                for alarm in self._alarms:
+                    if alarm.policy.alarm.period != key[0]:
+                        continue
+                    value = self._metric(alarm.policy, cpu_seconds / seconds, requests)
+                    if alarm.evaluate(value):
+                        self._scale(t, alarm, value)
+            t += 1.0
+        return samples
+
+    def summary(self) -> dict:
+        """Headline numbers of the run, including how often the policy changed its mind."""
+        directions = ["out" if action["to"] > action["from"] else "in" for action in self.actions]
+        seconds = len(self.trace)
+        latencies = sorted(latency for _, latency, _ in self.trace)
+
+        def percentile(pct: float):
+            return round(latencies[min(seconds - 1, int(seconds * pct / 100))], 3) if latencies else None
+
+        return {
+            "seconds": seconds,
+            "scale_out": directions.count("out"),
+            "scale_in": directions.count("in"),
+            # A scale-in followed by a scale-out (or the reverse) is the policy flapping
+            "reversals": sum(1 for a, b in zip(directions, directions[1:]) if a != b),
+            "max_desired": max((desired for desired, _, _ in self.trace), default=self.desired),
+            "task_hours": round(sum(desired for desired, _, _ in self.trace) / 3600.0, 2),
+            "time_at_max_pct": round(
+                100.0 * sum(1 for d, _, _ in self.trace if d == self.config.max_capacity) / seconds, 1
+            ) if seconds else 0.0,
+            "saturated_pct": round(100.0 * sum(1 for _, _, s in self.trace if s) / seconds, 1) if seconds else 0.0,
+            "latency_ms": {"p50": percentile(50), "p99": percentile(99), "max": percentile(100)},
+        }
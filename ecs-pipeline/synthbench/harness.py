@@ -0,0 +1,157 @@
+"""Runs inside a fresh interpreter in a CDK app's directory and times its synthesis.
+
+The first iteration of a process is cold: it pays for importing ``aws_cdk``
+(which starts the jsii runtime) and the app's modules. Further iterations
+build and synthesize a new ``App`` in the same process and are warm.
+
+    python /path/to/synthbench/harness.py OUTPUT [--warm N]
+
+It is run as a script, not a module, and imports nothing but the standard
+library, so the app's ``app.py`` and the ``pipelines`` package it puts on the
+path are the ones found.
+"""
+import argparse
+import importlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from importlib import metadata
+
+# Phase names, in the order they happen
+PHASES = ("import_aws_cdk", "import_app", "construct", "synth")
+
+
+class ConstructionTimer:
+    """Wraps the ``__init__`` of the app's own stack classes to time each construction.
+
+    Stacks construct their nested stacks inside their own ``__init__``, so a
+    stack's inclusive time contains its children; ``self`` excludes them.
+    """
+
+    def __init__(self):
+        self.inclusive = {}
+        self.exclusive = {}
+        self._children = []
+
+    def install(self, base: type):
+        for cls in self._app_subclasses(base):
+            if "__init__" in vars(cls):
+                cls.__init__ = self._wrap(cls.__name__, cls.__init__)
+
+    def _app_subclasses(self, base: type):
+        seen = set()
+        pending = list(base.__subclasses__())
+        while pending:
+            cls = pending.pop()
+            if cls in seen:
+                continue
+            seen.add(cls)
+            pending.extend(cls.__subclasses__())
+            if not cls.__module__.startswith(("aws_cdk", "constructs", "jsii")):
+                yield cls
+
+    def _wrap(self, name: str, init):
+        timer = self
+
+        def timed_init(self, *args, **kwargs):
+            timer._children.append(0.0)
+            started = time.perf_counter()
+            try:
+                init(self, *args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                children = timer._children.pop()
+                if timer._children:
+                    timer._children[-1] += elapsed
+                timer.inclusive[name] = timer.inclusive.get(name, 0.0) + elapsed
+                timer.exclusive[name] = timer.exclusive.get(name, 0.0) + elapsed - children
+        return timed_init
+
+    def reset(self):
+        self.inclusive = {}
+        self.exclusive = {}
+
+
+@contextmanager
+def _outdir():
+    # Keeps every iteration's assembly apart. Passed to the app: the jsii
+    # runtime has already copied the environment, so CDK_OUTDIR set now is ignored
+    path = tempfile.mkdtemp(prefix="synthbench-")
+    try:
+        yield path
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def _iteration(aws_cdk, app_module, timer: ConstructionTimer) -> dict:
+    timings = {}
+    original_synth = aws_cdk.App.synth
+
+    def timed_synth(self, *args, **kwargs):
+        timings["construct_done"] = time.perf_counter()
+        result = original_synth(self, *args, **kwargs)
+        timings["synth"] = time.perf_counter() - timings["construct_done"]
+        return result
+
+    timer.reset()
+    aws_cdk.App.synth = timed_synth
+    try:
+        with _outdir() as outdir:
+            started = time.perf_counter()
+            app_module.main(outdir=outdir)
+    finally:
+        aws_cdk.App.synth = original_synth
+    return {
+        "construct": timings["construct_done"] - started,
+        "synth": timings["synth"],
+        "stacks": {
+            name: {"inclusive": timer.inclusive[name], "self": timer.exclusive[name]}
+            for name in timer.inclusive
+        },
+    }
+
+
+def _cdk_version():
+    # aws_cdk has no __version__; the distribution's metadata has it
+    try:
+        return metadata.version("aws-cdk-lib")
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def measure(warm: int) -> dict:
+    sys.path.insert(0, os.getcwd())
+    started = time.perf_counter()
+    aws_cdk = importlib.import_module("aws_cdk")
+    imported_cdk = time.perf_counter()
+    app_module = importlib.import_module("app")
+    imported_app = time.perf_counter()
+
+    timer = ConstructionTimer()
+    timer.install(aws_cdk.Stack)
+    cold = _iteration(aws_cdk, app_module, timer)
+    cold["import_aws_cdk"] = imported_cdk - started
+    cold["import_app"] = imported_app - imported_cdk
+    return {
+        "cdk_version": _cdk_version(),
+        "cold": cold,
+        "warm": [_iteration(aws_cdk, app_module, timer) for _ in range(warm)],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("output")
+    parser.add_argument("--warm", type=int, default=3)
+    args = parser.parse_args(argv)
+    result = measure(args.warm)
+    with open(args.output, "w") as f:
+        json.dump(result, f)
+
+
+if __name__ == "__main__":
+    main()
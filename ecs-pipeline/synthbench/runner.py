@@ -0,0 +1,174 @@
+"""Runs the synth harness for an app, summarizes the phases and keeps a history per commit."""
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Optional
+
+from synthbench import harness
+from synthbench.harness import PHASES
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_ROOT = os.path.dirname(PACKAGE_ROOT)
+# Each deployment style on its own, and both in the shared app at the repository root
+DEFAULT_APPS = (PACKAGE_ROOT, os.path.join(REPO_ROOT, "bluegreen-pipeline"), REPO_ROOT)
+DEFAULT_RESULTS = os.path.join(PACKAGE_ROOT, "benchmarks", "synth.jsonl")
+# Changes smaller than this many seconds are noise whatever their percentage
+MIN_REGRESSION_S = 0.05
+
+
+def _git(app_dir: str, *args) -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", *args], cwd=app_dir, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _run_harness(app_dir: str, warm: int) -> dict:
+    fd, output = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        started = time.perf_counter()
+        subprocess.run(
+            # Run as a script so this project's packages stay off the app's import path
+            [sys.executable, harness.__file__, output, "--warm", str(warm)],
+            cwd=app_dir, check=True,
+        )
+        wall = time.perf_counter() - started
+        with open(output) as f:
+            result = json.load(f)
+    finally:
+        os.unlink(output)
+    result["cold"]["process"] = wall
+    return result
+
+
+def _median(values: List[float]) -> float:
+    return round(statistics.median(values), 4)
+
+
+def _summarize(iterations: List[dict], process: bool) -> dict:
+    phases = [phase for phase in PHASES if phase in iterations[0]]
+    summary = {phase: _median([i[phase] for i in iterations]) for phase in phases}
+    summary["total"] = _median([sum(i[phase] for phase in phases) for i in iterations])
+    if process:
+        # Everything the developer waits for, interpreter start and exit included
+        summary["process"] = _median([i["process"] for i in iterations])
+    names = sorted({name for i in iterations for name in i["stacks"]})
+    summary["stacks"] = {
+        name: {
+            kind: _median([i["stacks"][name][kind] for i in iterations if name in i["stacks"]])
+            for kind in ("inclusive", "self")
+        }
+        for name in names
+    }
+    return summary
+
+
+def app_name(app_dir: str) -> str:
+    return "combined" if os.path.abspath(app_dir) == REPO_ROOT else os.path.basename(os.path.abspath(app_dir))
+
+
+def benchmark_app(app_dir: str, runs: int = 5, warm: int = 3) -> dict:
+    """``runs`` fresh processes per app, each with one cold and ``warm`` warm syntheses."""
+    app_dir = os.path.abspath(app_dir)
+    results = [_run_harness(app_dir, warm) for _ in range(runs)]
+    record = {
+        "app": app_name(app_dir),
+        "commit": _git(app_dir, "rev-parse", "--short", "HEAD"),
+        # The stacks are shared between the apps, so any change counts
+        "dirty": bool(_git(app_dir, "status", "--porcelain")),
+        "recorded_at": round(time.time(), 3),
+        "host": platform.node(),
+        "python": platform.python_version(),
+        "cdk_version": results[0]["cdk_version"],
+        "runs": runs,
+        "cold": _summarize([r["cold"] for r in results], process=True),
+    }
+    warm_iterations = [i for r in results for i in r["warm"]]
+    if warm_iterations:
+        record["warm"] = _summarize(warm_iterations, process=False)
+    return record
+
+
+def append_result(path: str, record: dict):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "a") as f:
+        f.write(json.dumps(record, sort_keys=True) + "\n")
+
+
+def load_results(path: str, app: Optional[str] = None) -> List[dict]:
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    return [r for r in records if app is None or r["app"] == app]
+
+
+def baseline_for(records: List[dict], record: dict) -> Optional[dict]:
+    """The latest earlier result of the same app from another commit on the same host."""
+    for previous in reversed(records):
+        if (previous["app"] == record["app"] and previous.get("host") == record.get("host")
+                and (previous["commit"] != record["commit"] or previous["dirty"] != record["dirty"])):
+            return previous
+    return None
+
+
+def _flatten(record: dict) -> dict:
+    values = {}
+    for mode in ("cold", "warm"):
+        summary = record.get(mode)
+        if summary is None:
+            continue
+        for phase in (*PHASES, "total", "process"):
+            if phase in summary:
+                values[f"{mode}.{phase}"] = summary[phase]
+        for name, stack in summary["stacks"].items():
+            values[f"{mode}.{name}"] = stack["inclusive"]
+    return values
+
+
+def compare(baseline: dict, candidate: dict, threshold_pct: float) -> List[dict]:
+    before, after = _flatten(baseline), _flatten(candidate)
+    rows = []
+    for key in sorted(set(before) & set(after), key=list(after).index):
+        change = after[key] - before[key]
+        change_pct = 100.0 * change / before[key] if before[key] else 0.0
+        rows.append({
+            "metric": key,
+            "baseline_s": before[key],
+            "candidate_s": after[key],
+            "change_pct": round(change_pct, 1),
+            "regression": change_pct > threshold_pct and change > MIN_REGRESSION_S,
+        })
+    return rows
+
+
+def format_record(record: dict) -> str:
+    lines = [f"{record['app']} @ {record['commit']}{'+' if record['dirty'] else ''} "
+             f"(aws-cdk-lib {record['cdk_version']}, {record['runs']} runs)"]
+    for mode in ("cold", "warm"):
+        summary = record.get(mode)
+        if summary is None:
+            continue
+        phases = "  ".join(f"{phase} {summary[phase]:.3f}s" for phase in (*PHASES, "total", "process")
+                           if phase in summary)
+        lines.append(f"  {mode:<5} {phases}")
+        for name, stack in sorted(summary["stacks"].items(), key=lambda item: -item[1]["inclusive"]):
+            lines.append(f"        {name:<32} {stack['inclusive']:.3f}s (self {stack['self']:.3f}s)")
+    return "\n".join(lines)
+
+
+def format_comparison(rows: List[dict]) -> str:
+    lines = [f"{'metric':<44} {'baseline':>9} {'candidate':>9} {'change':>8}"]
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        lines.append(f"{row['metric']:<44} {row['baseline_s']:>8.3f}s {row['candidate_s']:>8.3f}s "
+                     f"{row['change_pct']:>+7.1f}%{flag}")
+    return "\n".join(lines)
@@ -1,25 +1,350 @@
-import requests
-import threading
+import argparse
+import json
+import multiprocessing
+import os
+import sys
 
-url = "http://65.2.40.5/"
+from loadtest import archive
+from loadtest.compare import compare_phases, format_rows, summarize_phases
+from loadtest.distributed import run_coordinator, worker_main
+from loadtest.engine import LoadTestConfig, run
+from loadtest.guards import Guard, GuardMonitor
+from loadtest.live import LiveOutput
+from loadtest.multiproc import run_multiprocess
+from loadtest.profiles import load_profile_spec
+from loadtest.scheduler import ARRIVALS
+from loadtest.selfbench import SelfBenchConfig, run_selfbench
+from loadtest.server import ServerConfig, run_server
 
-num_requests = 900000
-concurrency = 50
+COMMANDS = ("run", "coordinator", "worker", "compare", "serve", "selfbench")
 
-def worker():
-    for _ in range(num_requests // concurrency):
+
+def add_load_arguments(parser):
+    defaults = LoadTestConfig()
+    parser.add_argument("--url", default=defaults.url, help="Target URL (the ALB listener)")
+    parser.add_argument("--concurrency", type=int, default=defaults.concurrency,
+                        help="Number of concurrent request loops")
+    parser.add_argument("--connections", type=int, default=defaults.connections,
+                        help="Maximum keep-alive connections (default: one per worker)")
+    parser.add_argument("--duration", type=float, default=defaults.duration,
+                        help="Run time in seconds")
+    parser.add_argument("--requests", type=int, default=defaults.requests,
+                        help="Stop after this many requests")
+    parser.add_argument("--timeout", type=float, default=defaults.timeout,
+                        help="Per-request timeout in seconds")
+    parser.add_argument("--expected-interval-ms", type=float, default=defaults.expected_interval_ms,
+                        help="Intended per-worker request interval for coordinated-omission "
+                             "correction (default: each worker's running mean latency)")
+    parser.add_argument("--rate", type=float, default=defaults.rate,
+                        help="Open model: target arrival rate in requests/s; "
+                             "--concurrency then caps requests in flight")
+    parser.add_argument("--arrival", choices=ARRIVALS, default=defaults.arrival,
+                        help="Arrival process for --rate")
+    parser.add_argument("--late-threshold-ms", type=float, default=defaults.late_threshold_ms,
+                        help="Sends delayed past their intended time by more than this count as late")
+    parser.add_argument("--seed", type=int, default=defaults.seed,
+                        help="Random seed for Poisson arrivals")
+    parser.add_argument("--profile",
+                        help="JSON load profile (ramp/steps/spike/soak phases); overrides --rate and --duration")
+    parser.add_argument("--replay",
+                        help="Replay an ALB or nginx access log (plain or .gz) with its original paths and timing")
+    parser.add_argument("--replay-speed", type=float, default=defaults.replay_speed,
+                        help="Speed-up factor for --replay (2 replays an hour of traffic in 30 minutes)")
+    parser.add_argument("--interval", type=float, default=defaults.interval,
+                        help="Seconds per interval in the reported time series")
+    parser.add_argument("--resolve-interval", type=float, default=defaults.resolve_interval,
+                        help="Re-resolve the target host this often (seconds, 0: once) and spread "
+                             "connections over every address, e.g. all ALB nodes")
+    parser.add_argument("--ipv6", action="store_true",
+                        help="Also connect to the target's IPv6 addresses (IPv4 only by default)")
+    parser.add_argument("--task-header", default=defaults.task_header,
+                        help="Response header naming the ECS task that served each request")
+    parser.add_argument("--cutover", action="store_true",
+                        help="Blue/green cutover mode: report the blue/green traffic split, errors and "
+                             "tail latency per interval")
+    parser.add_argument("--version-header", default=defaults.version_header,
+                        help="Response header carrying the app version in --cutover mode")
+    parser.add_argument("--version-pattern",
+                        help="Regex whose first group extracts the version from the response body instead")
+    parser.add_argument("--blue-version", help="Version served before the deployment (default: first seen)")
+    parser.add_argument("--green-version", help="Version being deployed (default: busiest other version)")
+    parser.add_argument("--guard", action="append", default=[], metavar="SPEC",
+                        help="Stop the run early when an SLO is breached over a sliding window, "
+                             "e.g. 'p99>500ms/30s' or '5xx>1%%/60s' (repeatable)")
+    parser.add_argument("--output", help="Write the JSON result to this file instead of stdout")
+    parser.add_argument("--live", metavar="PATH",
+                        help="Stream a JSON line per interval while the run is in progress ('-' for stdout)")
+    parser.add_argument("--live-view", action="store_true",
+                        help="Print a compact line per interval to stderr while the run is in progress")
+    parser.add_argument("--archive",
+                        help="Also store per-interval histograms and counters in this binary run archive")
+
+
+def parse_args(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    # Plain `test.py --url ...` keeps meaning `test.py run --url ...`
+    if not argv or argv[0] not in COMMANDS and argv[0] not in ("-h", "--help"):
+        argv = ["run", *argv]
+
+    parser = argparse.ArgumentParser(description="HTTP load tester for the ECS Fargate service")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Generate load from this machine")
+    add_load_arguments(run_parser)
+    run_parser.add_argument("--processes", type=int, default=1,
+                            help="Worker processes, each with its own event loop (0: one per core)")
+
+    coordinator_parser = commands.add_parser(
+        "coordinator", help="Split a run across remote workers and merge their results")
+    add_load_arguments(coordinator_parser)
+    coordinator_parser.add_argument("--listen", default="0.0.0.0:7070",
+                                    help="Address the workers connect to")
+    coordinator_parser.add_argument("--workers", type=int, required=True,
+                                    help="Number of worker connections to wait for")
+
+    worker_parser = commands.add_parser("worker", help="Generate load on behalf of a coordinator")
+    worker_parser.add_argument("--connect", required=True, help="Coordinator HOST:PORT")
+    worker_parser.add_argument("--processes", type=int, default=1,
+                               help="Worker connections to open from this host, one process each "
+                                    "(0: one per core)")
+    worker_parser.add_argument("--name", help="Worker name shown in the report (default: hostname)")
+
+    compare_parser = commands.add_parser(
+        "compare", help="Compare run archives against the first one and fail on regressions")
+    compare_parser.add_argument("archives", nargs="+", help="Baseline archive followed by one or more candidates")
+    compare_parser.add_argument("--threshold-pct", type=float, default=5.0,
+                                help="Minimum relative change that counts as a regression")
+    compare_parser.add_argument("--alpha", type=float, default=0.01,
+                                help="Significance level for the per-phase tests")
+    compare_parser.add_argument("--json", action="store_true", help="Print the comparison as JSON")
+
+    server_defaults = ServerConfig()
+    serve_parser = commands.add_parser(
+        "serve", help="Serve index.html locally as a stand-in target, with optional latency and errors")
+    serve_parser.add_argument("--host", default=server_defaults.host)
+    serve_parser.add_argument("--port", type=int, default=server_defaults.port)
+    serve_parser.add_argument("--index", default=server_defaults.index, help="Page to serve")
+    serve_parser.add_argument("--latency-ms", type=float, default=server_defaults.latency_ms,
+                              help="Delay before each response")
+    serve_parser.add_argument("--jitter-ms", type=float, default=server_defaults.jitter_ms,
+                              help="Uniform random extra delay up to this much")
+    serve_parser.add_argument("--error-rate", type=float, default=server_defaults.error_rate,
+                              help="Fraction of requests answered with 503")
+    serve_parser.add_argument("--reset-rate", type=float, default=server_defaults.reset_rate,
+                              help="Fraction of requests answered by dropping the connection")
+    serve_parser.add_argument("--version", default=server_defaults.version,
+                              help="Value of the X-App-Version header")
+    serve_parser.add_argument("--processes", type=int, default=server_defaults.processes,
+                              help="Server processes sharing the port")
+
+    bench_defaults = SelfBenchConfig()
+    bench_parser = commands.add_parser(
+        "selfbench", help="Measure the load tester's own maximum rate and overhead against a local server")
+    bench_parser.add_argument("--duration", type=float, default=bench_defaults.duration,
+                              help="Seconds per measurement")
+    bench_parser.add_argument("--processes", type=int, default=bench_defaults.processes,
+                              help="Load generator processes")
+    bench_parser.add_argument("--server-processes", type=int, default=bench_defaults.server_processes,
+                              help="Stand-in server processes (default: the remaining cores)")
+    bench_parser.add_argument("--concurrency", type=int, default=bench_defaults.concurrency)
+    bench_parser.add_argument("--latency-ms", type=float, default=bench_defaults.latency_ms,
+                              help="Server latency injected for the overhead measurement")
+
+    args = parser.parse_args(argv)
+    if args.command == "compare" and len(args.archives) < 2:
+        parser.error("compare needs a baseline and at least one candidate archive")
+    if getattr(args, "live", None) == "-" and not args.output:
+        parser.error("--live - needs --output, the final report cannot share stdout with the stream")
+    try:
+        args.guards = [Guard.parse(spec) for spec in getattr(args, "guard", [])]
+    except ValueError as exc:
+        parser.error(str(exc))
+    # Parsed here so a bad profile is a usage error, before any load is generated
+    args.profile_spec = None
+    if getattr(args, "profile", None):
         try:
-            requests.get(url)
-        except Exception as e:
-            pass
+            args.profile_spec = load_profile_spec(args.profile)
+        except (OSError, ValueError) as exc:
+            parser.error(f"--profile {args.profile}: {exc}")
+    return args
+
+
+def config_from_args(args) -> LoadTestConfig:
+    return LoadTestConfig(
+        url=args.url,
+        concurrency=args.concurrency,
+        connections=args.connections,
+        duration=args.duration,
+        requests=args.requests,
+        timeout=args.timeout,
+        expected_interval_ms=args.expected_interval_ms,
+        rate=args.rate,
+        arrival=args.arrival,
+        late_threshold_ms=args.late_threshold_ms,
+        seed=args.seed,
+        profile=args.profile_spec,
+        replay=args.replay,
+        replay_speed=args.replay_speed,
+        interval=args.interval,
+        resolve_interval=args.resolve_interval,
+        ipv6=args.ipv6,
+        task_header=args.task_header,
+        cutover=args.cutover,
+        version_header=args.version_header,
+        version_pattern=args.version_pattern,
+        blue_version=args.blue_version,
+        green_version=args.green_version,
+    )
+
+
+def write_result(config: LoadTestConfig, result, args, guards=None):
+    if guards is not None:
+        result.meta["slo"] = guards.report()
+    if args.archive:
+        archive.save(args.archive, config, result)
+    report = result.to_dict(config)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    if guards is not None and guards.tripped():
+        breach = guards.breach
+        print(f"SLO guard {breach['guard']} tripped at {breach['offset_s']}s "
+              f"(value {breach['value']}), run stopped early", file=sys.stderr)
+        sys.exit(1)
+
+
+def live_output(config: LoadTestConfig, args):
+    if not args.live and not args.live_view:
+        return None
+    return LiveOutput(config.interval, args.live, args.live_view)
+
+
+def interval_callback(*callbacks):
+    callbacks = [callback for callback in callbacks if callback is not None]
+    if not callbacks:
+        return None
+
+    def on_interval(interval):
+        for callback in callbacks:
+            callback(interval)
+    return on_interval
+
+
+def run_command(args):
+    config = config_from_args(args)
+    live = live_output(config, args)
+    guards = GuardMonitor(args.guards, config.interval) if args.guards else None
+    on_interval = interval_callback(guards, live)
+    should_stop = guards.tripped if guards is not None else None
+    try:
+        if args.processes == 1:
+            result = run(config, on_interval, should_stop)
+        else:
+            result = run_multiprocess(config, args.processes or None, on_interval, should_stop)
+    finally:
+        if live is not None:
+            live.close()
+    write_result(config, result, args, guards)
+
+
+def coordinator_command(args):
+    config = config_from_args(args)
+    live = live_output(config, args)
+    guards = GuardMonitor(args.guards, config.interval) if args.guards else None
+    should_stop = guards.tripped if guards is not None else None
+    try:
+        result = run_coordinator(config, args.workers, args.listen, interval_callback(guards, live), should_stop)
+    finally:
+        if live is not None:
+            live.close()
+    write_result(config, result, args, guards)
+
+
+def compare_command(args):
+    baseline = summarize_phases(*archive.load(args.archives[0]))
+    comparisons = []
+    for path in args.archives[1:]:
+        rows = compare_phases(baseline, summarize_phases(*archive.load(path)), args.threshold_pct, args.alpha)
+        comparisons.append({"baseline": args.archives[0], "candidate": path, "rows": rows})
+
+    if args.json:
+        json.dump(comparisons, sys.stdout, indent=2)
+        print()
+    else:
+        for comparison in comparisons:
+            print(f"{comparison['baseline']} -> {comparison['candidate']}")
+            print(format_rows(comparison["rows"]))
+            print()
+
+    untested = [row for c in comparisons for row in c["rows"] if row["insufficient_samples"]]
+    if untested:
+        print(f"{len(untested)} metric(s) had too few intervals to test at alpha {args.alpha}; "
+              "run longer or use a shorter --interval", file=sys.stderr)
+    regressions = [row for c in comparisons for row in c["rows"] if row["regression"]]
+    if regressions:
+        print(f"{len(regressions)} significant regression(s) found", file=sys.stderr)
+        sys.exit(1)
+
+
+def serve_command(args):
+    config = ServerConfig(
+        host=args.host,
+        port=args.port,
+        index=args.index,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        reset_rate=args.reset_rate,
+        version=args.version,
+        processes=args.processes,
+    )
+    print(f"Serving {config.index} on http://{config.host}:{config.port}/", file=sys.stderr)
+    run_server(config)
+
+
+def selfbench_command(args):
+    report = run_selfbench(SelfBenchConfig(
+        duration=args.duration,
+        processes=args.processes,
+        server_processes=args.server_processes,
+        concurrency=args.concurrency,
+        latency_ms=args.latency_ms,
+    ))
+    json.dump(report, sys.stdout, indent=2)
+    print()
+
+
+def worker_command(args):
+    processes = args.processes or os.cpu_count() or 1
+    if processes == 1:
+        worker_main(args.connect, args.name)
+        return
+    workers = []
+    for i in range(processes):
+        name = f"{args.name}-{i}" if args.name else None
+        worker = multiprocessing.Process(target=worker_main, args=(args.connect, name))
+        worker.start()
+        workers.append(worker)
+    for worker in workers:
+        worker.join()
+    if any(worker.exitcode for worker in workers):
+        sys.exit(1)
+
 
-threads = []
-for i in range(concurrency):
-    t = threading.Thread(target=worker)
-    t.start()
-    threads.append(t)
+def main(argv=None):
+    args = parse_args(argv)
+    {
+        "run": run_command,
+        "coordinator": coordinator_command,
+        "worker": worker_command,
+        "compare": compare_command,
+        "serve": serve_command,
+        "selfbench": selfbench_command,
+    }[args.command](args)
 
-for t in threads:
-    t.join()
 
-print("Load test finished ✅")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
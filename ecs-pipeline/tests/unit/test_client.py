@@ -0,0 +1,92 @@
+import asyncio
+import socket
+
+import pytest
+
+from loadtest.client import ConnectionPool, Target
+from loadtest.server import ServerConfig, free_port, start_servers, stop_servers
+
+
+@pytest.fixture(scope="module")
+def stand_in():
+    # Listening on every interface, so 127.0.0.1 and 127.0.0.2 both reach it
+    config = ServerConfig(host="0.0.0.0", port=free_port())
+    servers = start_servers(config)
+    yield f"http://alb.test:{config.port}/"
+    stop_servers(servers)
+
+
+class FakeDns:
+    """Answers every lookup with ``addresses``, which a test may change."""
+
+    def __init__(self, *addresses):
+        self.addresses = list(addresses)
+
+    async def __call__(self, host, port, family=socket.AF_UNSPEC, **kwargs):
+        infos = [(socket.AF_INET6 if ":" in address else socket.AF_INET, socket.SOCK_STREAM, 6, "", (address, port))
+                 for address in self.addresses]
+        return [info for info in infos if family in (socket.AF_UNSPEC, info[0])]
+
+
+def pool_run(url: str, dns: FakeDns, scenario, **kwargs):
+    async def main():
+        asyncio.get_running_loop().getaddrinfo = dns
+        target = Target.from_url(url)
+        pool = ConnectionPool(target, timeout=5.0, **kwargs)
+        try:
+            return await scenario(pool, target.build_request())
+        finally:
+            pool.close()
+    return asyncio.run(main())
+
+
+def test_requests_take_turns_over_addresses(stand_in):
+    async def scenario(pool, request):
+        return [(await pool.request(request)).address for _ in range(6)]
+
+    addresses = pool_run(stand_in, FakeDns("127.0.0.1", "127.0.0.2"), scenario, max_connections=4)
+    assert addresses == ["127.0.0.1", "127.0.0.2"] * 3
+
+
+def test_addresses_that_leave_dns_are_dropped(stand_in):
+    dns = FakeDns("127.0.0.1", "127.0.0.2")
+
+    async def scenario(pool, request):
+        for _ in range(4):
+            await pool.request(request)
+        dns.addresses = ["127.0.0.2"]
+        await asyncio.sleep(0.1)
+        # This release starts the re-resolution in the background
+        await pool.request(request)
+        await pool._resolving
+        after = [(await pool.request(request)).address for _ in range(4)]
+        return after, pool.addresses, {conn.address for conn in pool._connections}
+
+    after, addresses, connected = pool_run(stand_in, dns, scenario, max_connections=4, resolve_interval=0.05)
+    assert after == ["127.0.0.2"] * 4
+    assert addresses == ["127.0.0.2"]
+    assert connected == {"127.0.0.2"}
+
+
+def test_socket_limit(stand_in):
+    async def scenario(pool, request):
+        responses = await asyncio.gather(*(pool.request(request) for _ in range(20)))
+        return responses, pool.opened, len(pool._connections)
+
+    responses, opened, connections = pool_run(stand_in + "?latency_ms=10", FakeDns("127.0.0.1", "127.0.0.2", "127.0.0.3"),
+                               scenario, max_connections=2)
+    assert [r.status for r in responses] == [200] * 20
+    assert opened == connections == 2
+
+
+@pytest.mark.parametrize("family, expected", [
+    (None, ["127.0.0.1"]),
+    (socket.AF_UNSPEC, ["127.0.0.1", "::1"]),
+])
+def test_ipv4_only_unless_asked(stand_in, family, expected):
+    async def scenario(pool, request):
+        await pool._ensure_resolved()
+        return pool.addresses
+
+    kwargs = {"family": family} if family is not None else {}
+    assert pool_run(stand_in, FakeDns("::1", "127.0.0.1"), scenario, max_connections=1, **kwargs) == expected
@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+import test as cli
+from loadtest import archive
+from loadtest.compare import compare_phases, summarize_phases
+from loadtest.engine import LoadTestConfig, RunResult
+from loadtest.timeseries import IntervalSeries
+
+
+def fake_run(path, latency_ms: float, intervals: int = 20, seed: int = 1) -> str:
+    rng = random.Random(seed)
+    result = RunResult()
+    result.started_at = 1000.0
+    result.elapsed = float(intervals)
+    result.intervals = IntervalSeries(1.0, result.started_at)
+    for second in range(intervals):
+        for i in range(100):
+            latency_us = int(latency_ms * 1000 * rng.uniform(0.9, 1.1))
+            result.intervals.record_response(second + i / 100, 200, latency_us)
+            result.stats.requests += 1
+            result.stats.record_status(200)
+            result.corrected.record(latency_us)
+            result.uncorrected.record(latency_us)
+    archive.save(str(path), LoadTestConfig(interval=1.0), result)
+    return str(path)
+
+
+def test_archive_round_trip(tmp_path):
+    config, result = archive.load(fake_run(tmp_path / "run.ltrun", 10))
+    assert config.interval == 1.0
+    assert result.stats.requests == 2000
+    assert len(result.intervals.intervals) == 20
+    assert result.intervals.intervals[3].latency.total == 100
+
+
+def test_slower_candidate_is_a_regression(tmp_path):
+    baseline = summarize_phases(*archive.load(fake_run(tmp_path / "a.ltrun", 10, seed=1)))
+    same = summarize_phases(*archive.load(fake_run(tmp_path / "b.ltrun", 10, seed=2)))
+    slower = summarize_phases(*archive.load(fake_run(tmp_path / "c.ltrun", 20, seed=3)))
+
+    assert not any(row["regression"] for row in compare_phases(baseline, same))
+    regressions = {row["metric"] for row in compare_phases(baseline, slower) if row["regression"]}
+    assert regressions == {"p50_ms", "p90_ms", "p99_ms"}
+
+
+def test_compare_exits_non_zero_on_regression(tmp_path, capsys):
+    baseline = fake_run(tmp_path / "a.ltrun", 10)
+    slower = fake_run(tmp_path / "b.ltrun", 20)
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main(["compare", baseline, slower])
+    assert exit_info.value.code == 1
+    assert "REGRESSION" in capsys.readouterr().out
+
+
+def test_short_runs_are_not_a_pass(tmp_path):
+    baseline = summarize_phases(*archive.load(fake_run(tmp_path / "a.ltrun", 10, intervals=3)))
+    slower = summarize_phases(*archive.load(fake_run(tmp_path / "b.ltrun", 20, intervals=3)))
+    rows = compare_phases(baseline, slower)
+    assert not any(row["regression"] for row in rows)
+    assert all(row["insufficient_samples"] for row in rows if row["metric"] != "error_rate_pct")
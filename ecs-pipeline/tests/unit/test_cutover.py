@@ -0,0 +1,57 @@
+from loadtest.client import Response
+from loadtest.cutover import VersionClassifier, cutover_report
+from loadtest.engine import LoadTestConfig, run
+from loadtest.tasks import TaskBreakdown
+
+# (blue, green) responses per one-second interval while traffic shifts
+SPLIT = [(100, 0), (100, 0), (75, 25), (25, 75), (0, 100), (0, 100)]
+
+
+def shifting_run():
+    versions = TaskBreakdown(1.0)
+    intervals = []
+    for second, (blue, green) in enumerate(SPLIT):
+        for version, n in (("v1", blue), ("v2", green)):
+            for i in range(n):
+                versions.record_name(second + i / n, version, 200, 2000)
+        intervals.append({
+            "offset_s": float(second),
+            "requests": blue + green,
+            "errors": {"connect": 0, "timeout": 0, "5xx": 0, "other": 1 if second == 3 else 0},
+            "latency_ms": {"p50": 2.0, "p90": 2.0, "p99": 2.0, "max": 2.0},
+        })
+    return versions, intervals
+
+
+def test_classifier_reads_the_header_or_the_body():
+    response = Response(200, {"x-app-version": "abc123"}, b"<p>release 1.4.2</p>")
+    assert VersionClassifier()(response) == "abc123"
+    assert VersionClassifier(pattern=r"release (\S+)</p>")(response) == "1.4.2"
+    assert VersionClassifier(pattern=r"build \d+")(response) is None
+
+
+def test_shift_windows():
+    report = cutover_report(*shifting_run(), 1.0, "x-app-version")
+    assert (report["blue"], report["green"]) == ("v1", "v2")
+    assert [point["green_pct"] for point in report["curve"]] == [0, 0, 25, 75, 100, 100]
+    assert (report["first_green_s"], report["last_blue_s"], report["shifted_s"]) == (2.0, 3.0, 4.0)
+    assert report["shift_duration_s"] == 2.0
+    before, during, after = report["windows"]
+    assert (before["requests"], during["requests"], after["requests"]) == (200, 200, 200)
+    assert during["errors"] == 1
+    assert after["seconds"] == 2.0
+
+
+def test_explicit_colors():
+    report = cutover_report(*shifting_run(), 1.0, "x-app-version", blue="v2", green="v1")
+    assert report["first_green_s"] == 0.0
+    assert report["shifted_s"] == 0.0
+
+
+def test_run_without_a_shift(http_server):
+    config = LoadTestConfig(url=http_server(**{"X-App-Version": "v1"}), concurrency=2, requests=20,
+                            cutover=True)
+    report = run(config).to_dict(config)["cutover"]
+    assert (report["blue"], report["green"]) == ("v1", None)
+    assert [window["window"] for window in report["windows"]] == ["before"]
+    assert report["unclassified"] == 0
@@ -0,0 +1,65 @@
+import asyncio
+import socket
+
+import pytest
+
+import test as cli
+from loadtest import distributed
+from loadtest.distributed import Coordinator, run_worker
+from loadtest.engine import LoadTestConfig
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run_distributed(config: LoadTestConfig, workers: int) -> dict:
+    address = f"127.0.0.1:{free_port()}"
+    coordinator = asyncio.ensure_future(Coordinator(config, workers, address).run())
+    await asyncio.sleep(0.2)
+    await asyncio.gather(*(run_worker(address, f"worker-{i}") for i in range(workers)))
+    return await coordinator
+
+
+def test_workers_share_the_run(http_server, monkeypatch):
+    monkeypatch.setattr(distributed, "START_DELAY", 0.1)
+    config = LoadTestConfig(url=http_server(), concurrency=4, requests=40, duration=30, interval=0.5)
+    report = asyncio.run(run_distributed(config, 2)).to_dict(config)
+    assert sorted(report["workers"]) == ["worker-0", "worker-1"]
+    assert report["requests"] == 40
+    assert report["statuses"] == {"200": 40}
+    assert sum(interval["requests"] for interval in report["intervals"]) == 40
+
+
+def test_too_many_workers_for_the_concurrency():
+    with pytest.raises(ValueError):
+        Coordinator(LoadTestConfig(concurrency=2), workers=3)
+
+
+def test_a_cancelled_session_fails_the_run(monkeypatch):
+    async def cancelled(self, reader, writer):
+        raise asyncio.CancelledError()
+
+    async def scenario():
+        address = f"127.0.0.1:{free_port()}"
+        coordinator = asyncio.ensure_future(Coordinator(LoadTestConfig(), 1, address).run())
+        await asyncio.sleep(0.2)
+        _, writer = await asyncio.open_connection(*address.split(":"))
+        try:
+            return await coordinator
+        finally:
+            writer.close()
+
+    monkeypatch.setattr(Coordinator, "_serve", cancelled)
+    with pytest.raises(RuntimeError, match="cancelled"):
+        asyncio.run(scenario())
+
+
+def test_worker_processes_zero_means_one_per_core(monkeypatch):
+    started = []
+    monkeypatch.setattr(cli, "worker_main", lambda address, name: started.append((address, name)))
+    monkeypatch.setattr(cli.os, "cpu_count", lambda: 1)
+    cli.main(["worker", "--connect", "127.0.0.1:7070", "--processes", "0"])
+    assert started == [("127.0.0.1:7070", None)]
@@ -0,0 +1,49 @@
+import pytest
+
+from loadtest.engine import LoadTestConfig, run
+from loadtest.guards import Guard, GuardMonitor
+from loadtest.timeseries import Interval
+
+
+def interval(index: int, requests: int, latency_ms: float = 10, errors: int = 0) -> Interval:
+    result = Interval(index, 1000.0 + index)
+    result.stats.requests = requests
+    result.stats.errors["5xx"] = errors
+    for _ in range(requests - errors):
+        result.latency.record(int(latency_ms * 1000))
+    return result
+
+
+def test_parse():
+    guard = Guard.parse("p99 > 500ms / 2m")
+    assert (guard.metric, guard.threshold, guard.window) == ("p99", 500, 120)
+    assert str(Guard.parse("5xx>1%")) == "5xx>1%/30s"
+    for spec in ("p99>1%", "p42>10ms", "latency is bad"):
+        with pytest.raises(ValueError):
+            Guard.parse(spec)
+
+
+def test_breach_over_the_window():
+    monitor = GuardMonitor([Guard.parse("p99>100ms/3s"), Guard.parse("5xx>5%/2s")], 1.0)
+    monitor(interval(0, 100, errors=4))
+    monitor(interval(1, 100, latency_ms=50))
+    assert not monitor.tripped()
+    monitor(interval(2, 100, errors=16))
+    assert monitor.tripped()
+    assert monitor.breach["guard"] == "5xx>5%/2s"
+    assert monitor.breach["value"] == 8.0
+    assert monitor.breach["offset_s"] == 3.0
+
+
+def test_quiet_windows_are_not_judged():
+    monitor = GuardMonitor([Guard.parse("errors>1%/1s")], 1.0)
+    monitor(interval(0, 10, errors=10))
+    assert not monitor.tripped()
+
+
+def test_breach_stops_the_run(http_server):
+    config = LoadTestConfig(url=http_server(), concurrency=4, rate=200, duration=30, interval=0.25)
+    monitor = GuardMonitor([Guard.parse("p50>0ms/1s")], config.interval)
+    result = run(config, on_interval=monitor, should_stop=monitor.tripped)
+    assert monitor.tripped()
+    assert result.elapsed < 5
@@ -0,0 +1,109 @@
+import socket
+
+import pytest
+
+from loadtest.engine import LoadTestConfig, run
+from loadtest.histogram import Histogram
+
+
+def uniform(n=10000):
+    hist = Histogram()
+    for value in range(1, n + 1):
+        hist.record(value)
+    return hist
+
+
+def test_percentiles_within_relative_error():
+    hist = uniform()
+    # 8 sub-bucket bits keep every value within 2 ** -7 of what was recorded
+    for percentile, expected in ((50, 5000), (90, 9000), (99, 9900), (99.9, 9990)):
+        assert hist.value_at_percentile(percentile) == pytest.approx(expected, rel=2 ** -7)
+    assert hist.value_at_percentile(100) == hist.max == 10000
+    assert hist.min == 1
+    assert hist.mean == pytest.approx(5000.5)
+
+
+def test_small_values_are_exact():
+    hist = Histogram()
+    for value in (3, 7, 7, 120):
+        hist.record(value)
+    assert [hist.value_at_percentile(p) for p in (25, 50, 75, 100)] == [3, 7, 7, 120]
+
+
+def test_empty_and_clamped_values():
+    hist = Histogram(max_value_bits=20)
+    assert hist.value_at_percentile(50) == 0
+    hist.record(-5)
+    hist.record(1 << 30)
+    assert hist.min == 0
+    assert hist.max == (1 << 20) - 1
+
+
+def test_coordinated_omission_correction_backfills_missed_sends():
+    hist = Histogram()
+    # Sending every 100us, a 1000us stall hid the 9 requests due meanwhile
+    hist.record_corrected(1000, 100)
+    assert hist.total == 10
+    assert hist.min == 100
+    assert hist.sum == sum(range(100, 1001, 100))
+
+
+def test_coordinated_omission_correction_leaves_fast_responses_alone():
+    hist = Histogram()
+    hist.record_corrected(80, 100)
+    hist.record_corrected(150, 100)
+    hist.record_corrected(5000, 0)
+    assert hist.total == 3
+
+
+def test_correction_raises_the_tail():
+    raw, corrected = Histogram(), Histogram()
+    for _ in range(99):
+        raw.record(100)
+        corrected.record_corrected(100, 100)
+    raw.record(10000)
+    corrected.record_corrected(10000, 100)
+    assert raw.value_at_percentile(99) == 100
+    assert corrected.value_at_percentile(99) > 5000
+
+
+def test_merge():
+    a, b = uniform(500), Histogram()
+    b.record(2000, count=3)
+    a.merge(b)
+    assert a.total == 503
+    assert a.max == 2000
+    assert a.value_at_percentile(100) == 2000
+
+
+def test_round_trip():
+    a = uniform(500)
+    a.record(2000, count=3)
+    restored = Histogram.from_bytes(a.to_bytes())
+    assert list(restored.counts) == list(a.counts)
+    assert (restored.total, restored.sum, restored.min, restored.max) == (a.total, a.sum, a.min, a.max)
+
+def test_merge_rejects_other_layouts():
+    with pytest.raises(ValueError):
+        Histogram().merge(Histogram(sub_bucket_bits=6))
+
+
+def test_summary_in_milliseconds():
+    hist = Histogram()
+    hist.record(1500)
+    summary = hist.summary()
+    assert summary["count"] == 1
+    assert summary["p50"] == summary["max"] == 1.5
+
+
+def test_timed_out_requests_count_in_the_latency():
+    # Connections complete in the kernel's backlog, but nothing ever answers
+    with socket.create_server(("127.0.0.1", 0)) as silent:
+        config = LoadTestConfig(url=f"http://127.0.0.1:{silent.getsockname()[1]}/", requests=4,
+                                concurrency=2, timeout=0.2, duration=5.0)
+        report = run(config).to_dict(config)
+    assert report["errors"]["timeout"] == 4
+    latency = report["latency_uncorrected_ms"]
+    assert latency["count"] == 4
+    assert latency["min"] >= 200
+    assert report["intervals"][0]["latency_ms"]["p50"] >= 200
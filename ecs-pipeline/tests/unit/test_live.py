@@ -0,0 +1,52 @@
+import json
+
+from loadtest.engine import LoadTestConfig
+from loadtest.live import LiveMerger, LiveOutput
+from loadtest.multiproc import run_multiprocess
+from loadtest.timeseries import Interval
+
+
+def interval(index: int, requests: int) -> Interval:
+    result = Interval(index, 1000.0 + index)
+    result.stats.requests = requests
+    for _ in range(requests):
+        result.latency.record(2000)
+    return result
+
+
+def test_merger_waits_for_every_source():
+    emitted = []
+    merger = LiveMerger(2, emitted.append)
+    merger.add(0, interval(0, 5))
+    merger.add(0, interval(1, 5))
+    assert emitted == []
+    merger.add(1, interval(0, 3))
+    assert [(i.index, i.stats.requests) for i in emitted] == [(0, 8)]
+    # Source 1 had nothing complete in interval 1 and moved on to 2
+    merger.add(1, interval(2, 4))
+    merger.flush()
+    assert [(i.index, i.stats.requests) for i in emitted] == [(0, 8), (1, 5), (2, 4)]
+
+
+def test_json_lines(tmp_path):
+    path = tmp_path / "live.jsonl"
+    output = LiveOutput(1.0, str(path))
+    first = interval(3, 10)
+    first.in_flight = 2
+    output(first)
+    output(interval(4, 20))
+    output.close()
+    samples = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [s["offset_s"] for s in samples] == [3.0, 4.0]
+    assert [s["throughput_rps"] for s in samples] == [10.0, 20.0]
+    assert samples[0]["in_flight"] == 2
+    assert samples[1]["p50_ms"] == 2.0
+
+
+def test_processes_stream_each_interval_once(http_server):
+    seen = []
+    config = LoadTestConfig(url=http_server(), concurrency=4, rate=200, duration=1.0, interval=0.25)
+    result = run_multiprocess(config, processes=2, on_interval=seen.append)
+    indices = [i.index for i in seen]
+    assert indices == sorted(set(indices))
+    assert sum(i.stats.requests for i in seen) == result.stats.requests
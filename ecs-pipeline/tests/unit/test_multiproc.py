@@ -0,0 +1,30 @@
+from loadtest.engine import LoadTestConfig
+from loadtest.multiproc import run_multiprocess, shard_config
+
+
+def test_shards_add_up_to_the_run():
+    config = LoadTestConfig(concurrency=10, connections=7, requests=101)
+    shards = shard_config(config, 3)
+    assert len(shards) == 3
+    assert sum(shard.concurrency for shard in shards) == 10
+    assert sum(shard.pool_size for shard in shards) == 7
+    assert sum(shard.requests for shard in shards) == 101
+
+
+def test_no_more_processes_than_concurrent_workers():
+    assert len(shard_config(LoadTestConfig(concurrency=4), 16)) == 4
+
+
+def test_no_more_processes_than_pooled_connections():
+    shards = shard_config(LoadTestConfig(concurrency=8, connections=2), 4)
+    assert len(shards) == 2
+    assert [shard.pool_size for shard in shards] == [1, 1]
+    assert sum(shard.concurrency for shard in shards) == 8
+
+
+def test_processes_share_the_request_budget(http_server):
+    config = LoadTestConfig(url=http_server(), concurrency=4, requests=40, duration=30)
+    report = run_multiprocess(config, processes=2).to_dict(config)
+    assert report["processes"] == 2
+    assert report["requests"] == 40
+    assert report["statuses"] == {"200": 40}
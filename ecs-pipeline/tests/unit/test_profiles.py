@@ -0,0 +1,103 @@
+import re
+
+import pytest
+
+import test as cli
+from loadtest.profiles import LoadProfile, parse_duration
+from loadtest.timeseries import IntervalSeries
+
+SPEC = {
+    "phases": [
+        {"type": "soak", "name": "warmup", "rps": 20, "duration": "1m"},
+        {"type": "ramp", "from_rps": 20, "to_rps": 220, "duration": "100s"},
+        {"type": "steps", "start_rps": 100, "step_rps": 50, "steps": 3, "step_duration": 10},
+        {"type": "spike", "base_rps": 100, "spike_rps": 1000, "duration": 60, "spike_at": 20,
+         "spike_duration": "10s"},
+    ]
+}
+
+
+def test_parse_duration():
+    assert parse_duration("90s") == 90
+    assert parse_duration("15m") == 900
+    assert parse_duration("4h") == 14400
+    assert parse_duration(2.5) == 2.5
+    assert parse_duration("30") == 30
+
+
+def test_phases_run_back_to_back():
+    profile = LoadProfile.from_spec(SPEC)
+    assert profile.duration == 60 + 100 + 30 + 60
+    assert profile.phase_at(0) == "warmup"
+    assert profile.phase_at(60) == "ramp"
+    assert profile.phase_at(165) == "steps"
+    assert profile.phase_at(10**6) == "spike"
+
+
+def test_rate_at():
+    profile = LoadProfile.from_spec(SPEC)
+    assert profile.rate_at(30) == 20
+    assert profile.rate_at(110) == pytest.approx(120)
+    assert [profile.rate_at(t) for t in (160, 175, 189)] == [100, 150, 200]
+    assert profile.rate_at(190 + 19) == 100
+    assert profile.rate_at(190 + 25) == 1000
+    assert profile.rate_at(190 + 30) == 100
+    assert profile.rate_at(250) == 0
+
+
+def test_invalid_profiles():
+    with pytest.raises(ValueError):
+        LoadProfile.from_spec({"phases": []})
+    with pytest.raises(ValueError):
+        LoadProfile.from_spec([{"type": "wave", "duration": 10}])
+    with pytest.raises(ValueError):
+        LoadProfile.from_spec([{"type": "soak", "rps": 10, "duration": 0}])
+
+
+@pytest.mark.parametrize("phase, message", [
+    ({"type": "ramp", "name": "warm-up", "to_rps": 50, "duration": "1m"}, "'warm-up' is missing 'from_rps'"),
+    ({"type": "steps", "start_rps": 10, "step_rps": 10, "steps": "many", "step_duration": "1m"},
+     "'steps' has an invalid 'steps': 'many'"),
+    ({"type": "soak", "rps": 10, "duration": "ten minutes"}, "'soak' has an invalid 'duration'"),
+    ({"type": "spike", "base_rps": 10, "spike_rps": 100, "duration": "5m", "spike_at": "4m",
+      "spike_duration": "2m"}, "must lie within the phase's 300s"),
+])
+def test_malformed_phases_name_the_phase_and_key(phase, message):
+    with pytest.raises(ValueError, match=re.escape(message)):
+        LoadProfile.from_spec([phase])
+
+
+def test_malformed_profile_shapes():
+    for spec in ({"stages": []}, ["soak"]):
+        with pytest.raises(ValueError):
+            LoadProfile.from_spec(spec)
+
+
+def test_cli_rejects_a_malformed_profile_file(tmp_path, capsys):
+    path = tmp_path / "profile.json"
+    path.write_text('[{"type": "soak", "duration": "1m"}]')
+    with pytest.raises(SystemExit) as error:
+        cli.parse_args(["--profile", str(path)])
+    assert error.value.code == 2
+    assert "'soak' is missing 'rps'" in capsys.readouterr().err
+
+
+def test_interval_series_reports_the_profile_target():
+    profile = LoadProfile.from_spec([
+        {"type": "soak", "name": "low", "rps": 10, "duration": 10},
+        {"type": "soak", "name": "high", "rps": 50, "duration": 10},
+    ])
+    series = IntervalSeries(10, started_at=1000.0)
+    for i in range(20):
+        series.record_response(i * 0.5, 200, 1000)
+    series.record_error(15.0, TimeoutError(), 2000)
+    other = IntervalSeries(10, started_at=1000.0)
+    other.record_response(12.0, 503, 4000)
+    series.merge(other)
+
+    low, high = series.to_list(20.0, profile)
+    assert (low["phase"], low["target_rps"], low["requests"]) == ("low", 10, 20)
+    assert (high["phase"], high["target_rps"], high["requests"]) == ("high", 50, 2)
+    assert high["offset_s"] == 10
+    assert (high["errors"]["timeout"], high["errors"]["5xx"]) == (1, 1)
+    assert high["latency_ms"]["max"] == pytest.approx(4, rel=0.02)
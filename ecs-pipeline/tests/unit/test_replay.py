@@ -0,0 +1,38 @@
+import gzip
+
+import pytest
+
+from loadtest.client import Target
+from loadtest.engine import LoadTestConfig, run
+from loadtest.replay import LogReplay, parse_line
+
+ALB = ('http 2024-05-01T10:00:00.250000Z app/alb/abc 10.0.0.1:5000 10.0.1.2:80 0.001 0.002 0.000 '
+       '200 200 120 540 "GET http://example.com:80/items?page=2 HTTP/1.1" "curl/8.0" - -')
+NGINX = '10.0.0.1 - - [01/May/2024:10:00:01 +0000] "GET /health HTTP/1.1" 200 2 "-" "curl/8.0"'
+
+
+def test_parse_line():
+    assert parse_line(ALB)[1:] == ("GET", "/items?page=2")
+    assert parse_line(NGINX)[1:] == ("GET", "/health")
+    assert parse_line("not a log line") is None
+
+
+def test_lines_sharing_a_second_are_spread(tmp_path):
+    log = tmp_path / "access.log.gz"
+    lines = [NGINX.replace("/health", f"/{i}") for i in range(4)]
+    lines.append(NGINX.replace("10:00:01", "10:00:03").replace("GET", "POST"))
+    lines.append(NGINX.replace("10:00:01", "10:00:05"))
+    with gzip.open(log, "wt") as f:
+        f.write("\n".join(lines) + "\n")
+    replay = LogReplay(str(log), Target.from_url("http://example.com/"), speed=2.0)
+    offsets = [offset for offset, _ in replay]
+    assert offsets == [0.0, 0.125, 0.25, 0.375, 2.0]
+    assert replay.skipped == 1
+
+
+def test_profile_run_ends_with_the_profile(http_server):
+    config = LoadTestConfig(url=http_server(), concurrency=4, duration=30,
+                            profile={"phases": [{"type": "soak", "rps": 50, "duration": 1}]})
+    result = run(config)
+    assert result.elapsed == pytest.approx(1.0, abs=0.5)
+    assert result.stats.requests == pytest.approx(50, abs=2)
@@ -0,0 +1,68 @@
+import aws_cdk as core
+import aws_cdk.assertions as assertions
+import pytest
+
+from pipelines.app import add_deployment
+
+SIZING = ("TASK_CPU", "TASK_MEMORY_MIB", "DESIRED_COUNT", "MIN_CAPACITY", "MAX_CAPACITY",
+          "SUBNET_CIDR_MASK", "DEPLOYMENT_MAX_PERCENT")
+
+
+@pytest.fixture
+def rolling(monkeypatch):
+    """Builds the rolling deployment from .env, with any settings given on top."""
+    for name in SIZING:
+        monkeypatch.delenv(name, raising=False)
+
+    def build(**settings):
+        for name, value in settings.items():
+            monkeypatch.setenv(name, value)
+        return add_deployment(core.App(), "rolling")
+    return build
+
+
+def test_scaling_bounds_and_task_size_come_from_config(rolling):
+    _, app_stack = rolling(DESIRED_COUNT="2", MIN_CAPACITY="2", MAX_CAPACITY="6",
+                           TASK_CPU="512", TASK_MEMORY_MIB="1024")
+    template = assertions.Template.from_stack(app_stack.ecs_stack)
+    template.has_resource_properties("AWS::ECS::Service", {"DesiredCount": 2})
+    template.has_resource_properties("AWS::ApplicationAutoScaling::ScalableTarget", {
+        "MinCapacity": 2,
+        "MaxCapacity": 6,
+    })
+    template.has_resource_properties("AWS::ECS::TaskDefinition", {"Cpu": "512", "Memory": "1024"})
+
+
+def test_previous_sizes_by_default(rolling):
+    _, app_stack = rolling()
+    template = assertions.Template.from_stack(app_stack.ecs_stack)
+    template.has_resource_properties("AWS::ECS::TaskDefinition", {"Cpu": "256", "Memory": "512"})
+    template.has_resource_properties("AWS::ApplicationAutoScaling::ScalableTarget", {
+        "MinCapacity": 1,
+        "MaxCapacity": 5,
+    })
+
+
+def test_service_deploys_at_the_planned_maximum_percent(rolling):
+    base_stack, app_stack = rolling(MAX_CAPACITY="100", DEPLOYMENT_MAX_PERCENT="150")
+    assert base_stack.network_stack.subnet_plan.peak_tasks == 150
+    template = assertions.Template.from_stack(app_stack.ecs_stack)
+    template.has_resource_properties("AWS::ECS::Service", {
+        "DeploymentConfiguration": assertions.Match.object_like({"MaximumPercent": 150}),
+    })
+
+
+def test_traffic_profile_adds_scheduled_minimums(rolling):
+    _, app_stack = rolling(TRAFFIC_PROFILE="traffic-profiles/daily.json", MAX_CAPACITY="20")
+    target = assertions.Template.from_stack(app_stack.ecs_stack).find_resources(
+        "AWS::ApplicationAutoScaling::ScalableTarget")
+    (properties,) = [resource["Properties"] for resource in target.values()]
+    actions = properties["ScheduledActions"]
+    assert actions
+    assert all(action["ScalableTargetAction"]["MinCapacity"] <= 20 for action in actions)
+
+
+def test_single_target_group(rolling):
+    base_stack, _ = rolling()
+    template = assertions.Template.from_stack(base_stack.alb_stack)
+    template.resource_count_is("AWS::ElasticLoadBalancingV2::TargetGroup", 1)
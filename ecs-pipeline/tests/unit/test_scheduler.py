@@ -0,0 +1,53 @@
+import statistics
+
+import pytest
+
+from loadtest.engine import LoadTestConfig, run
+from loadtest.scheduler import ArrivalProcess
+
+
+def test_constant_gaps():
+    assert ArrivalProcess("constant").gap(200) == 0.005
+
+
+def test_poisson_gaps_have_the_same_mean():
+    arrivals = ArrivalProcess("poisson", seed=7)
+    gaps = [arrivals.gap(100) for _ in range(20000)]
+    assert statistics.mean(gaps) == pytest.approx(0.01, rel=0.05)
+    assert len(set(gaps)) > 19000
+
+
+def test_invalid_arrivals():
+    with pytest.raises(ValueError):
+        ArrivalProcess("bursty")
+    with pytest.raises(ValueError):
+        ArrivalProcess().gap(0)
+
+
+def test_open_model_sends_at_the_scheduled_rate(http_server):
+    config = LoadTestConfig(url=http_server(), rate=100, duration=1.0, concurrency=20)
+    report = run(config).to_dict(config)
+    schedule = report["schedule"]
+    # The last send is due 10 ms before the deadline; on a busy host it can wake past it
+    assert schedule["scheduled"] in (99, 100)
+    assert schedule["dropped"] == 0
+    assert report["requests"] == schedule["scheduled"]
+
+
+def test_requests_over_the_in_flight_cap_are_dropped(http_server):
+    # A single request in flight cannot keep up with 2000 sends per second
+    config = LoadTestConfig(url=http_server(), rate=2000, duration=0.5, concurrency=1)
+    report = run(config).to_dict(config)
+    schedule = report["schedule"]
+    assert schedule["dropped"] > 0
+    assert schedule["scheduled"] == report["requests"] + schedule["dropped"]
+    # Sends whose wake-up lands past the deadline are not scheduled any more
+    assert schedule["scheduled"] == pytest.approx(1000, rel=0.05)
+
+
+def test_profile_run_reports_the_scheduled_rate(http_server):
+    config = LoadTestConfig(url=http_server(), profile=[{"type": "soak", "rps": 2000, "duration": 0.5}],
+                            concurrency=1)
+    schedule = run(config).to_dict(config)["schedule"]
+    assert schedule["target_rps"] == pytest.approx(2000, rel=0.1)
+    assert schedule["dropped"] > 0
@@ -0,0 +1,35 @@
+import pytest
+
+from loadtest.engine import LoadTestConfig, run
+from loadtest.server import ServerConfig, free_port, start_servers, stop_servers
+
+
+@pytest.fixture(scope="module")
+def stand_in():
+    config = ServerConfig(port=free_port(), version="v7")
+    servers = start_servers(config)
+    yield f"http://{config.host}:{config.port}/"
+    stop_servers(servers)
+
+
+def load(url: str, **kwargs) -> dict:
+    config = LoadTestConfig(url=url, concurrency=2, requests=40, **kwargs)
+    return run(config).to_dict(config)
+
+
+def test_serves_the_page(stand_in):
+    report = load(stand_in, cutover=True)
+    assert report["statuses"] == {"200": 40}
+    assert report["cutover"]["blue"] == "v7"
+    assert report["tasks"]["task_count"] == 1
+
+
+def test_injected_latency(stand_in):
+    report = load(stand_in + "?latency_ms=20", expected_interval_ms=20)
+    assert report["latency_uncorrected_ms"]["p50"] == pytest.approx(20, abs=10)
+
+
+def test_injected_errors(stand_in):
+    assert load(stand_in + "?error_rate=1")["statuses"] == {"503": 40}
+    report = load(stand_in + "?reset_rate=1", timeout=2.0)
+    assert sum(report["errors"].values()) == 40
@@ -0,0 +1,42 @@
+from scaling.policy import from_spec
+from scaling.simulator import RateSeries, Simulation, TaskModel
+
+SPEC = {
+    "min_capacity": 1, "max_capacity": 5, "period": 60, "evaluation_periods": 1, "cooldown": 60,
+    "scaling_steps": [{"change": -1, "upper": 20}, {"change": 1, "lower": 60}],
+}
+# 50 rps, then three times that for five minutes, then almost nothing
+SERIES = [(0, 50), (300, 150), (600, 10), (1200, 10)]
+MODEL = TaskModel(capacity_rps=100, base_cpu_pct=0, startup_s=60, metric_delay_s=0)
+
+
+def simulate(config):
+    simulation = Simulation(config, MODEL)
+    simulation.run(RateSeries(SERIES))
+    return [(action["t"], action["from"], action["to"]) for action in simulation.actions], simulation.summary()
+
+
+def test_spec_policy_directions():
+    lower, upper = from_spec(SPEC).policies
+    assert (lower.alarm.threshold, lower.alarm.comparison) == (20, "LessThanOrEqualToThreshold")
+    assert (upper.alarm.threshold, upper.alarm.comparison) == (60, "GreaterThanOrEqualToThreshold")
+    assert upper.scales_out and not lower.scales_out
+
+
+def test_replay_scales_out_then_in():
+    actions, summary = simulate(from_spec(SPEC))
+    # Each busy minute adds a task until CPU drops below 60%; each idle one removes one
+    assert actions == [
+        (360.0, 1, 2), (420.0, 2, 3), (480.0, 3, 4),
+        (660.0, 4, 3), (720.0, 3, 2), (780.0, 2, 1),
+    ]
+    assert (summary["scale_out"], summary["scale_in"], summary["reversals"]) == (3, 3, 1)
+    assert summary["max_desired"] == 4
+
+
+def test_alarms_with_different_periods():
+    config = from_spec(SPEC)
+    config.policies[0].alarm.period = 300
+    actions, _ = simulate(config)
+    # The pending 300s datapoint must not hold back the 60s ones due before it
+    assert actions == [(360.0, 1, 2), (420.0, 2, 3), (480.0, 3, 4), (900.0, 4, 3)]
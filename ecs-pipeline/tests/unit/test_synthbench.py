@@ -0,0 +1,23 @@
+import json
+import os
+import subprocess
+import sys
+
+from synthbench import harness
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def test_harness_leaves_no_assemblies_behind(tmp_path):
+    output = tmp_path / "result.json"
+    scratch = tmp_path / "tmp"
+    scratch.mkdir()
+    env = dict(os.environ, TMPDIR=str(scratch), CDK_SYNTH_CACHE="0")
+    env.pop("CDK_OUTDIR", None)
+    subprocess.run([sys.executable, harness.__file__, str(output), "--warm", "1"],
+                   cwd=APP_DIR, env=env, check=True, capture_output=True)
+    result = json.loads(output.read_text())
+    assert len(result["warm"]) == 1
+    assert result["cold"]["synth"] > 0
+    # Every iteration wrote into a directory of the harness, which removed it
+    assert not [name for name in os.listdir(scratch) if name.startswith(("cdk.out", "synthbench-"))]
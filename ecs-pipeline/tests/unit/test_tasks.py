@@ -0,0 +1,72 @@
+from loadtest.engine import LoadTestConfig, run
+from loadtest.tasks import TaskBreakdown
+
+
+def record(breakdown, second, counts):
+    for name, n in counts.items():
+        for i in range(n):
+            breakdown.record(second + i / n, {"x-served-by": name}, 200, 1000)
+
+
+def test_scale_out_tasks_are_judged_from_when_they_joined():
+    breakdown = TaskBreakdown(1.0)
+    for second in range(4):
+        record(breakdown, second, {"a": 50, "b": 50})
+    record(breakdown, 4, {"a": 45, "b": 45, "c": 10})
+    for second in range(5, 8):
+        record(breakdown, second, {"a": 34, "b": 33, "c": 33})
+    breakdown.record(7.5, {}, 200, 1000)
+
+    report = breakdown.to_dict(8.0)
+    assert report["task_count"] == 3
+    assert report["untagged"] == 1
+    assert list(report["tasks"]) == ["a", "b", "c"]
+    assert report["tasks"]["c"]["first_seen_s"] == 4.0
+    assert report["tasks"]["c"]["time_to_fair_share_s"] == 1.0
+    assert report["tasks"]["a"]["time_to_fair_share_s"] == 0.0
+    assert report["hot_tasks"] == []
+
+    skew = breakdown.interval_skew()
+    assert skew[0] == (1.0, 2)
+    assert skew[4] == (1.35, 3)
+
+
+def test_drained_tasks_leave_the_fair_share():
+    breakdown = TaskBreakdown(1.0)
+    for second in range(2):
+        record(breakdown, second, {"a": 33, "b": 33, "c": 33})
+    for second in range(2, 4):
+        record(breakdown, second, {"a": 50, "b": 50})
+    record(breakdown, 4, {"a": 40, "b": 40, "d": 20})
+    record(breakdown, 5, {"a": 34, "b": 33, "d": 33})
+
+    report = breakdown.to_dict(6.0)
+    # Three tasks answered at 4s, so d's 20 of 100 is still short of a fair share
+    assert report["tasks"]["d"]["time_to_fair_share_s"] == 1.0
+    assert breakdown.interval_skew()[4] == (1.2, 3)
+
+
+def test_hot_task():
+    breakdown = TaskBreakdown(1.0)
+    for second in range(4):
+        record(breakdown, second, {"a": 80, "b": 20})
+    report = breakdown.to_dict(4.0)
+    assert report["hot_tasks"] == ["a"]
+    assert report["skew"] == 4.0
+
+
+def test_breakdown_survives_state_round_trip():
+    breakdown = TaskBreakdown(1.0)
+    record(breakdown, 0, {"a": 3})
+    restored = TaskBreakdown.from_state(breakdown.state())
+    restored.merge(breakdown)
+    assert restored.tasks["a"].requests == 6
+    assert restored.tasks["a"].per_interval[0] == 6
+
+
+def test_run_reports_the_serving_task(http_server):
+    config = LoadTestConfig(url=http_server(**{"X-Served-By": "task-1"}), concurrency=2, requests=20)
+    report = run(config).to_dict(config)
+    assert report["tasks"]["task_count"] == 1
+    assert report["tasks"]["tasks"]["task-1"]["requests"] == 20
+    assert report["tasks"]["untagged"] == 0
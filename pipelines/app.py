@@ -0,0 +1,58 @@
+from typing import Optional, Sequence
+
+from aws_cdk import App, Environment
+from pipelines.base_stack import BaseStack
+from pipelines.bluegreen.app_stack import AppStack as BlueGreenAppStack
+from pipelines.deployments import deployment_config
+from pipelines.profiling import construct_profile
+from pipelines.rolling.app_stack import AppStack as RollingAppStack
+from pipelines.template_budget import enforce
+
+APP_STACKS = {
+    "rolling": RollingAppStack,
+    "bluegreen": BlueGreenAppStack,
+}
+
+
+def add_deployment(app: App, name: str):
+    config = deployment_config(name)
+    env_name = config.env
+    cdk_env = Environment(account=config.account, region=config.region)
+
+    base_stack = BaseStack(
+        app,
+        f"{config.project_name}-{env_name}-BaseStack",
+        config=config,
+        env_name=env_name,
+        blue_green=name == "bluegreen",
+        env=cdk_env,
+    )
+
+    app_stack = APP_STACKS[name](
+        app,
+        f"{config.project_name}-{env_name}-AppStack",
+        config=config,
+        env_name=env_name,
+        env=cdk_env,
+        base_stack=base_stack,
+    )
+
+    app_stack.add_dependency(base_stack)
+    return base_stack, app_stack
+
+
+def build_app(deployments: Sequence[str], outdir: Optional[str] = None, context: Optional[dict] = None):
+    """Synthesizes the given deployment styles in one App, and so one jsii runtime.
+
+    ``outdir`` and ``context`` default to what the CDK CLI passes through the
+    environment. A process that synthesizes more than once has to pass them:
+    the jsii runtime keeps the environment it was started with.
+    """
+    # No-op unless CDK_PROFILE_CONSTRUCTS is set
+    with construct_profile():
+        app = App(outdir=outdir, context=context)
+        for name in deployments:
+            add_deployment(app, name)
+        assembly = app.synth()
+    # Fails synthesis when a template is over its budget or a CloudFormation limit
+    enforce(assembly.directory)
@@ -0,0 +1,55 @@
+from aws_cdk import Stack
+from constructs import Construct
+from pipelines.config import Config
+from pipelines.vpc.networking_stack import BasicNetworkingStack
+from pipelines.ec2.alb_stack import ALBStack
+from pipelines.ecr.ecr_stack import EcrStack
+
+
+class BaseStack(Stack):
+    def __init__(self, scope: Construct, id: str, config: Config, env_name: str, *, blue_green: bool = False, **kwargs):
+        super().__init__(scope, id, **kwargs)
+
+        self.network_stack = BasicNetworkingStack(
+            self,
+            "BasicNetworkingStack",
+            vpc_name=f"{config.project_name}-{env_name}-vpc",
+            vpc_cidr=config.vpc_cidr,
+            num_public_subnets=config.num_public_subnets,
+            num_private_subnets=config.num_private_subnets,
+            max_capacity=config.max_capacity,
+            # CodeDeploy runs two full task sets during a blue/green swap, whatever the setting
+            deployment_max_percent=200 if blue_green else config.deployment_max_percent,
+            cidr_mask=config.subnet_cidr_mask,
+            # The blue/green VPC was first deployed under this id
+            vpc_construct_id="vpc_name" if blue_green else "Vpc",
+        )
+
+        # Blue/green gets a blue and a green target group behind a weighted listener
+        self.alb_stack = ALBStack(
+            self,
+            "ALBStack",
+            vpc=self.network_stack.vpc,
+            env_name=env_name,
+            project_name=config.project_name,
+            blue_green=blue_green,
+        )
+
+        # Instantiate EcrStack and reuse repository
+        self.ecr_stack = EcrStack(
+            self,
+            "EcrStack",
+            project_name=config.project_name,
+            env_name=env_name,
+        )
+
+        # Export shared resources
+        self.vpc = self.network_stack.vpc
+        self.alb = self.alb_stack.alb
+        self.listener = self.alb_stack.listener
+        if blue_green:
+            self.blue_target_group = self.alb_stack.blue_tg
+            self.green_target_group = self.alb_stack.green_tg
+        else:
+            self.target_group = self.alb_stack.target_group
+        self.repository = self.ecr_stack.repository
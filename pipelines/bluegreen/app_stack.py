@@ -1,13 +1,14 @@
 from aws_cdk import Stack
 from constructs import Construct
-from stacks.base_stack import BaseStack
-from stacks.ecs.ecs_fargate_stack import ECSFargateBlueGreenStack
-from stacks.codebuild.codepipeline_with_build_stack import PipelineWithBuildStack
-from stacks.codebuild.codedeploy_stack import DeployStack
+from pipelines.config import Config
+from pipelines.base_stack import BaseStack
+from pipelines.bluegreen.ecs_fargate_stack import ECSFargateBlueGreenStack
+from pipelines.bluegreen.codepipeline_with_build_stack import PipelineWithBuildStack
+from pipelines.bluegreen.codedeploy_stack import DeployStack
 
 
 class AppStack(Stack):
-    def __init__(self, scope: Construct, id: str, config: dict, env_name: str, *, base_stack: BaseStack, **kwargs):
+    def __init__(self, scope: Construct, id: str, config: Config, env_name: str, *, base_stack: BaseStack, **kwargs):
         super().__init__(scope, id, **kwargs)
 
         # Access shared resources from base_stack
@@ -25,25 +26,30 @@ class AppStack(Stack):
             blue_tg=blue_tg,
             green_tg=green_tg,
             repository=repository,
-            project_name=config["PROJECT_NAME"],
+            project_name=config.project_name,
             env_name=env_name,
+            desired_count=config.desired_count,
+            min_capacity=config.min_capacity,
+            max_capacity=config.max_capacity,
+            task_cpu=config.task_cpu,
+            task_memory_mib=config.task_memory_mib,
         )
 
         self.pipeline_stack = PipelineWithBuildStack(
             self,
             "PipelineStack",
-            project_name=config["PROJECT_NAME"],
+            project_name=config.project_name,
             env_name=env_name,
-            connection_arn=config["CONNECTION_ARN"],
-            repo_owner=config["REPO_OWNER"],
-            repo_name=config["REPO_NAME"],
-            branch_name=config["BRANCH_NAME"],
+            connection_arn=config.connection_arn,
+            repo_owner=config.repo_owner,
+            repo_name=config.repo_name,
+            branch_name=config.branch_name,
         )
 
         self.deploy_stack = DeployStack(
             self,
             "DeployStack",
-            project_name=config["PROJECT_NAME"],
+            project_name=config.project_name,
             env_name=env_name,
             ecs_cluster=self.ecs_stack.cluster,
             ecs_service_name=self.ecs_stack.ecs_service.service_name,
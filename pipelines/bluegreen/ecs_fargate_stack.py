@@ -5,6 +5,7 @@ from aws_cdk import (
     aws_iam as iam,
     aws_logs as logs,
     aws_ecr as ecr,
+    aws_applicationautoscaling as appscaling,
     NestedStack,
     Tags
 )
@@ -22,6 +23,11 @@ class ECSFargateBlueGreenStack(NestedStack):
         repository: ecr.Repository,  # ✅ NEW
         project_name: str,
         env_name: str,
+        desired_count: int = 1,
+        min_capacity: int = 1,
+        max_capacity: int = 5,
+        task_cpu: int = 256,
+        task_memory_mib: int = 512,
         **kwargs
     ) -> None:
         super().__init__(scope, id, **kwargs)
@@ -74,8 +80,8 @@ class ECSFargateBlueGreenStack(NestedStack):
         task_def = ecs.FargateTaskDefinition(
             self, "TaskDef",
             family=f"{project_name}-{env_name}-taskdef",
-            memory_limit_mib=512,
-            cpu=256,
+            memory_limit_mib=task_memory_mib,
+            cpu=task_cpu,
             execution_role=execution_role,
             task_role=task_role,
         )
@@ -101,7 +107,7 @@ class ECSFargateBlueGreenStack(NestedStack):
             cluster=cluster.cluster_arn,
             task_definition=task_def.task_definition_arn,
             launch_type="FARGATE",
-            desired_count=1,
+            desired_count=desired_count,
             network_configuration=ecs.CfnService.NetworkConfigurationProperty(
                 awsvpc_configuration=ecs.CfnService.AwsVpcConfigurationProperty(
                     assign_public_ip="ENABLED",
@@ -121,6 +127,17 @@ class ECSFargateBlueGreenStack(NestedStack):
             ]
         )
 
+        # 📈 Task count bounds (MIN_CAPACITY/MAX_CAPACITY in .env)
+        self.scalable_target = appscaling.ScalableTarget(
+            self, "ServiceTaskCount",
+            service_namespace=appscaling.ServiceNamespace.ECS,
+            resource_id=f"service/{cluster.cluster_name}/{self.ecs_service.attr_name}",
+            scalable_dimension="ecs:service:DesiredCount",
+            min_capacity=min_capacity,
+            max_capacity=max_capacity,
+        )
+        self.scalable_target.node.add_dependency(self.ecs_service)
+
         # 🏷️ Tags
         Tags.of(self.ecs_service).add("Name", f"{project_name}-{env_name}-ecs-service")
         Tags.of(self.ecs_service).add("Environment", env_name)
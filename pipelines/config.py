@@ -0,0 +1,159 @@
+"""Typed deployment settings, read from a ``.env`` file and the environment.
+
+Everything is parsed and checked in one pass, without importing ``aws_cdk``,
+so a typo in ``.env`` is reported with every other problem in the file before
+the jsii runtime starts. Variables set in the environment win over the file.
+A loaded ``Config`` is immutable and cached per file contents and the values
+of the variables it reads from the environment.
+"""
+import functools
+import ipaddress
+import os
+import re
+from dataclasses import MISSING, dataclass, fields
+from typing import Dict, List, Optional, Tuple
+
+from dotenv import dotenv_values
+
+ACCOUNT_PATTERN = re.compile(r"^\d{12}$")
+REGION_PATTERN = re.compile(r"^[a-z]{2}(-gov|-iso[a-z]*)?-[a-z]+-\d$")
+CONNECTION_ARN_PATTERN = re.compile(
+    r"^arn:aws[a-z-]*:(codestar-connections|codeconnections):[a-z0-9-]+:\d{12}:connection/\S+$")
+# Older .env files name the connection this way
+ALIASES = {"CONNECTION_ARN": ("CODESTAR_CONNECTION_ARN",)}
+
+
+class ConfigError(ValueError):
+    def __init__(self, env_file: str, problems: List[str]):
+        self.env_file = env_file
+        self.problems = problems
+        super().__init__(f"{env_file}: {len(problems)} problem(s)\n" + "\n".join(f"  - {p}" for p in problems))
+
+
+@dataclass(frozen=True)
+class Config:
+    project_name: str
+    env: str
+    region: str
+    account: str
+    vpc_cidr: str
+    num_public_subnets: int
+    num_private_subnets: int
+    connection_arn: str
+    repo_owner: str
+    repo_name: str
+    branch_name: str = "main"
+    # Task size and counts, see `scale.py plan`
+    task_cpu: int = 256
+    task_memory_mib: int = 512
+    desired_count: int = 1
+    min_capacity: int = 1
+    max_capacity: int = 5
+    # Hourly traffic percentiles for scheduled scaling (rolling only), see pipelines/schedule.py;
+    # relative to the .env file
+    traffic_profile: Optional[str] = None
+    # Subnet sizing, see pipelines/ip_capacity.py
+    subnet_cidr_mask: int = 24
+    # Also the rolling service's maximum percent; blue/green always plans for 200
+    deployment_max_percent: int = 200
+
+    @staticmethod
+    def variable(field_name: str) -> str:
+        return field_name.upper()
+
+
+def _variables() -> List[str]:
+    names = [Config.variable(field.name) for field in fields(Config)]
+    return names + [alias for aliases in ALIASES.values() for alias in aliases]
+
+
+def _raw_values(env_file: str, environment: Dict[str, str]) -> Dict[str, str]:
+    values = {}
+    # Empty values count as unset, in the file and in the environment
+    for source in (dotenv_values(env_file), environment):
+        values.update((key, value.strip()) for key, value in source.items() if value and value.strip())
+    return values
+
+
+def _parse(env_file: str, values: Dict[str, str], problems: List[str]) -> dict:
+    parsed = {}
+    for field in fields(Config):
+        name = Config.variable(field.name)
+        value = values.get(name)
+        for alias in ALIASES.get(name, ()):
+            value = value or values.get(alias)
+        if value is None:
+            if field.default is MISSING:
+                problems.append(f"{name} is not set")
+            continue
+        if field.type is int:
+            try:
+                parsed[field.name] = int(value)
+            except ValueError:
+                problems.append(f"{name} must be a whole number, got {value!r}")
+        elif field.name == "traffic_profile":
+            parsed[field.name] = os.path.join(os.path.dirname(os.path.abspath(env_file)), value)
+        else:
+            parsed[field.name] = value
+    return parsed
+
+
+def _check(parsed: dict, problems: List[str]):
+    def check(name, ok, message):
+        if name in parsed and not ok(parsed[name]):
+            problems.append(f"{Config.variable(name)} {message}, got {parsed[name]!r}")
+
+    check("account", ACCOUNT_PATTERN.match, "must be a 12-digit AWS account id")
+    check("region", REGION_PATTERN.match, "must be an AWS region such as ap-south-1")
+    check("connection_arn", CONNECTION_ARN_PATTERN.match, "must be a CodeStar/CodeConnections connection ARN")
+    check("vpc_cidr", _is_vpc_cidr, "must be an IPv4 network with a /16 to /28 prefix")
+    for name in ("num_public_subnets", "num_private_subnets", "task_cpu", "task_memory_mib", "max_capacity"):
+        check(name, lambda v: v >= 1, "must be at least 1")
+    for name in ("desired_count", "min_capacity"):
+        check(name, lambda v: v >= 0, "must not be negative")
+    check("subnet_cidr_mask", lambda v: 16 <= v <= 28, "must be between 16 and 28")
+    check("deployment_max_percent", lambda v: v >= 100, "must be at least 100")
+    check("traffic_profile", os.path.isfile, "must be an existing file")
+    if problems:
+        return
+    low, high, desired = parsed["min_capacity"], parsed["max_capacity"], parsed["desired_count"]
+    if low > high:
+        problems.append(f"MIN_CAPACITY must not exceed MAX_CAPACITY, got {low} > {high}")
+    elif not low <= desired <= high:
+        problems.append(f"DESIRED_COUNT must be within MIN_CAPACITY..MAX_CAPACITY, got {desired} outside {low}..{high}")
+
+
+def _is_vpc_cidr(value: str) -> bool:
+    try:
+        return 16 <= ipaddress.IPv4Network(value).prefixlen <= 28
+    except ValueError:
+        return False
+
+
+def _file_contents(env_file: str) -> Optional[bytes]:
+    try:
+        with open(env_file, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def _load_config(env_file: str, contents: Optional[bytes], environment: Tuple[Tuple[str, str], ...]) -> Config:
+    # contents only keys the cache: an edited file is a different entry
+    problems = []
+    parsed = _parse(env_file, _raw_values(env_file, dict(environment)), problems)
+    parsed.setdefault("min_capacity", Config.min_capacity)
+    parsed.setdefault("max_capacity", Config.max_capacity)
+    # Without DESIRED_COUNT the service starts at its minimum, and with at least one task
+    parsed.setdefault("desired_count", max(parsed["min_capacity"], Config.desired_count))
+    _check(parsed, problems)
+    if problems:
+        raise ConfigError(env_file, problems)
+    return Config(**parsed)
+
+
+def load_config(env_file: str) -> Config:
+    """Reads and validates ``env_file``; raises ``ConfigError`` listing every problem found."""
+    environment = tuple((name, os.environ[name]) for name in _variables() if name in os.environ)
+    return _load_config(env_file, _file_contents(env_file), environment)
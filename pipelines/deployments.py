@@ -0,0 +1,71 @@
+"""The deployment styles the shared app can synthesize, and which ones a run selects.
+
+Each style keeps its own directory with the ``.env`` it is configured from,
+next to its Dockerfile and build files. This module imports nothing from
+``aws_cdk``, so the selection and configuration are known before the jsii
+runtime starts.
+"""
+import json
+import os
+import sys
+from typing import Dict, Optional, Sequence, Tuple
+
+from pipelines.config import Config, ConfigError, load_config
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEPLOYMENTS = {
+    # Rolling ECS deployments with a single target group
+    "rolling": os.path.join(REPO_ROOT, "ecs-pipeline"),
+    # CodeDeploy blue/green deployments between two target groups
+    "bluegreen": os.path.join(REPO_ROOT, "bluegreen-pipeline"),
+}
+# `cdk synth -c deployments=rolling` or CDK_DEPLOYMENTS=rolling,bluegreen
+CONTEXT_KEY = "deployments"
+ENV_VAR = "CDK_DEPLOYMENTS"
+
+
+def deployment_config(name: str) -> Config:
+    return load_config(os.path.join(DEPLOYMENTS[name], ".env"))
+
+
+def require_configs(deployments: Sequence[str]) -> Dict[str, Config]:
+    """Loads every deployment's config, or exits listing all that is wrong with them.
+
+    Called by the entry points before ``aws_cdk`` is imported, so a bad
+    ``.env`` fails in milliseconds instead of after the jsii runtime started.
+    """
+    configs, errors = {}, []
+    for name in deployments:
+        try:
+            configs[name] = deployment_config(name)
+        except ConfigError as exc:
+            errors.append(f"{name} deployment, {exc}")
+    if errors:
+        sys.exit("Invalid configuration:\n" + "\n".join(errors))
+    return configs
+
+
+def _context_value() -> Optional[str]:
+    # The CLI passes large contexts through a file instead of the variable
+    overflow = os.environ.get("CONTEXT_OVERFLOW_LOCATION_ENV")
+    if overflow and os.path.exists(overflow):
+        with open(overflow) as f:
+            context = json.load(f)
+    else:
+        context = json.loads(os.environ.get("CDK_CONTEXT_JSON") or "{}")
+    return context.get(CONTEXT_KEY)
+
+
+def parse_deployments(value: str) -> Tuple[str, ...]:
+    names = tuple(name.strip() for name in value.split(",") if name.strip())
+    unknown = [name for name in names if name not in DEPLOYMENTS]
+    if unknown or not names:
+        raise ValueError(f"unknown deployment(s) {', '.join(unknown) or repr(value)}; "
+                         f"choose from {', '.join(DEPLOYMENTS)}")
+    return names
+
+
+def selected_deployments(default: Sequence[str] = tuple(DEPLOYMENTS)) -> Tuple[str, ...]:
+    """The deployments named by the environment or the CDK context, else ``default``."""
+    value = os.environ.get(ENV_VAR) or _context_value()
+    return parse_deployments(value) if value else tuple(default)
@@ -17,6 +17,7 @@ class ALBStack(NestedStack):
         vpc: ec2.Vpc,
         env_name: str,
         project_name: str,
+        blue_green: bool = False,
         **kwargs,
     ) -> None:
         super().__init__(scope, construct_id, **kwargs)
@@ -57,21 +58,37 @@ class ALBStack(NestedStack):
             open=True,  # Allows connections from anywhere
         )
 
-        # Target Group without blue-green complexity
-        self.target_group = elbv2.ApplicationTargetGroup(
+        if blue_green:
+            # Blue and green target groups for CodeDeploy, 100% to blue initially
+            self.blue_tg = self._target_group(vpc, "BlueTargetGroup", f"{project_name}-{env_name}-blueTG")
+            self.green_tg = self._target_group(vpc, "GreenTargetGroup", f"{project_name}-{env_name}-greenTG")
+            self.listener.add_action(
+                "WeightedForwardAction",
+                action=elbv2.ListenerAction.weighted_forward(
+                    target_groups=[
+                        elbv2.WeightedTargetGroup(target_group=self.blue_tg, weight=100),
+                        elbv2.WeightedTargetGroup(target_group=self.green_tg, weight=0),
+                    ]
+                ),
+            )
+        else:
+            # Target Group without blue-green complexity
+            self.target_group = self._target_group(vpc, "TargetGroup", f"{project_name}-{env_name}-tg")
+
+            # Attach Target Group to listener with default forwarding
+            self.listener.add_target_groups(
+                "DefaultTargetGroup",
+                target_groups=[self.target_group],
+            )
+
+    def _target_group(self, vpc: ec2.Vpc, construct_id: str, name: str) -> elbv2.ApplicationTargetGroup:
+        return elbv2.ApplicationTargetGroup(
             self,
-            "TargetGroup",
+            construct_id,
             vpc=vpc,
-            target_group_name=f"{project_name}-{env_name}-tg",
+            target_group_name=name,
             protocol=elbv2.ApplicationProtocol.HTTP,
             port=80,
             target_type=elbv2.TargetType.IP,
-            # target_type=elbv2.TargetType.INSTANCE,
             health_check=elbv2.HealthCheck(path="/"),
         )
-
-        # Attach Target Group to listener with default forwarding
-        self.listener.add_target_groups(
-            "DefaultTargetGroup",
-            target_groups=[self.target_group],
-        )
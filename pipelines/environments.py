@@ -0,0 +1,118 @@
+"""Synthesizes several environments of the app in parallel worker processes.
+
+An environment matrix maps environment names to the settings that differ from
+``.env``::
+
+    {
+      "dev":  {"ACCOUNT": "111111111111", "MAX_CAPACITY": 2},
+      "prod": {"ACCOUNT": "222222222222", "MIN_CAPACITY": 2, "MAX_CAPACITY": 10}
+    }
+
+``ENV`` defaults to the environment's name. The settings apply to every
+deployment style synthesized, on top of each one's ``.env``. Each environment
+is synthesized in a spawned worker (jsii cannot be shared across a fork) into
+its own output directory, which ``cdk deploy --app DIR`` accepts. A worker
+reuses its jsii runtime for later environments, so the output directory and
+context are passed to the App rather than through the environment.
+"""
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+from pipelines.deployments import REPO_ROOT, require_configs
+from pipelines.template_budget import TemplateBudgetError
+
+DEFAULT_OUTDIR = os.path.join(REPO_ROOT, "cdk.envs")
+
+
+def load_matrix(path: str, names: Optional[List[str]] = None) -> Dict[str, Dict[str, str]]:
+    with open(path) as f:
+        matrix = json.load(f)
+    if not isinstance(matrix, dict) or not all(isinstance(v, dict) for v in matrix.values()):
+        raise ValueError(f"{path}: expected an object of environment name -> settings")
+    unknown = sorted(set(names or ()) - set(matrix))
+    if unknown:
+        raise ValueError(f"{path}: no environment(s) {', '.join(unknown)}; defined: {', '.join(matrix)}")
+    return {
+        name: {"ENV": name, **{key: str(value) for key, value in settings.items()}}
+        for name, settings in matrix.items()
+        if not names or name in names
+    }
+
+
+def cli_context(app_dir: str = REPO_ROOT) -> str:
+    # What the CDK CLI would pass the app: cdk.json context with cdk.context.json on top
+    context = {}
+    for name in ("cdk.json", "cdk.context.json"):
+        path = os.path.join(app_dir, name)
+        if os.path.exists(path):
+            with open(path) as f:
+                data = json.load(f)
+            context.update(data.get("context", {}) if name == "cdk.json" else data)
+    return json.dumps(context)
+
+
+_base_environ = None
+
+
+def _init_worker(app_dir: str):
+    global _base_environ
+    os.chdir(app_dir)
+    sys.path.insert(0, REPO_ROOT)
+    # Settings from the matrix are applied over this per task
+    _base_environ = dict(os.environ)
+
+
+def _synth(name: str, settings: Dict[str, str], outdir: str, context: str, app_dir: str,
+           deployments: Sequence[str]) -> dict:
+    os.environ.clear()
+    os.environ.update(_base_environ)
+    os.environ.update(settings)
+    os.environ["CDK_OUTDIR"] = outdir
+    os.environ["CDK_CONTEXT_JSON"] = context
+    os.makedirs(outdir, exist_ok=True)
+    started = time.perf_counter()
+    try:
+        from pipelines.synth_cache import SynthCache
+
+        require_configs(deployments)
+        cache = SynthCache.from_environment(app_dir, deployments)
+        cached = cache.hit()
+        if not cached:
+            from pipelines.app import build_app
+            build_app(deployments, outdir=outdir, context=json.loads(context))
+            cache.store()
+    except SystemExit as exc:
+        return {"env": name, "ok": False, "outdir": outdir, "error": str(exc.code)}
+    except TemplateBudgetError as exc:
+        return {"env": name, "ok": False, "outdir": outdir, "error": str(exc)}
+    except Exception:
+        return {"env": name, "ok": False, "outdir": outdir, "error": traceback.format_exc()}
+    if not os.path.exists(os.path.join(outdir, "manifest.json")):
+        return {"env": name, "ok": False, "outdir": outdir, "error": f"no cloud assembly written to {outdir}"}
+    return {"env": name, "ok": True, "outdir": outdir, "cached": cached,
+            "seconds": round(time.perf_counter() - started, 3)}
+
+
+def synth_all(matrix: Dict[str, Dict[str, str]], deployments: Sequence[str], outdir: str = DEFAULT_OUTDIR,
+              workers: Optional[int] = None, app_dir: str = REPO_ROOT) -> List[dict]:
+    """Synthesizes ``deployments`` for every environment of ``matrix`` into ``outdir/<name>``, in matrix order."""
+    workers = workers or min(len(matrix), os.cpu_count() or 1)
+    context = cli_context(app_dir)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(app_dir,),
+    ) as pool:
+        futures = [
+            pool.submit(_synth, name, settings, os.path.abspath(os.path.join(outdir, name)), context, app_dir,
+                        tuple(deployments))
+            for name, settings in matrix.items()
+        ]
+        return [future.result() for future in futures]
@@ -0,0 +1,101 @@
+"""Synth-time check that the service's subnets hold enough IP addresses.
+
+Every awsvpc Fargate task takes one ENI, and therefore one IP, in the subnet
+it runs in. The peak demand is reached during a deployment, when the old and
+the new tasks run side by side: up to ``deployment_max_percent`` of the
+maximum task count for a rolling update, both full task sets for a blue/green
+swap. The ALB and the NAT gateway share the same public subnets.
+"""
+import ipaddress
+import math
+from dataclasses import dataclass
+
+# AWS keeps the first four and the last address of every subnet
+AWS_RESERVED_IPS = 5
+# AWS asks for at least 8 free addresses per subnet for the ALB to scale into
+ALB_IPS_PER_SUBNET = 8
+NAT_GATEWAY_IPS = 1
+# Largest and smallest subnets a VPC accepts
+MIN_SUBNET_MASK = 16
+MAX_SUBNET_MASK = 28
+
+
+class SubnetCapacityError(ValueError):
+    pass
+
+
+@dataclass
+class SubnetPlan:
+    cidr_mask: int  # for the subnets the tasks run in
+    azs: int
+    peak_tasks: int
+    tasks_per_az: int
+    demand_per_subnet: int
+    usable_per_subnet: int
+
+    def describe(self) -> str:
+        return (
+            f"Task subnets /{self.cidr_mask}: {self.usable_per_subnet} usable IPs per AZ, peak demand "
+            f"{self.demand_per_subnet} ({self.tasks_per_az} of {self.peak_tasks} tasks, ALB and NAT) "
+            f"in each of {self.azs} AZs"
+        )
+
+
+def usable_ips(cidr_mask: int) -> int:
+    return 2 ** (32 - cidr_mask) - AWS_RESERVED_IPS
+
+
+def peak_tasks(max_capacity: int, deployment_max_percent: int) -> int:
+    """Tasks running at once while a deployment replaces ``max_capacity`` tasks."""
+    return max(max_capacity, math.ceil(max_capacity * deployment_max_percent / 100.0))
+
+
+def plan_task_subnets(
+    *,
+    vpc_cidr: str,
+    max_azs: int,
+    max_capacity: int,
+    deployment_max_percent: int = 200,
+    cidr_mask: int = 24,
+    other_cidr_masks: tuple = (24,),
+    nat_gateways: int = 1,
+) -> SubnetPlan:
+    """Size the public subnets the tasks, the ALB and the NAT gateway share.
+
+    ``cidr_mask`` is kept when it holds the peak demand, so an existing VPC's
+    subnets are not replaced; otherwise the largest mask that does is chosen.
+    ``other_cidr_masks`` are the VPC's remaining subnet groups, which have to
+    fit next to the task subnets. Raises SubnetCapacityError when no mask fits.
+    """
+    if not MIN_SUBNET_MASK <= cidr_mask <= MAX_SUBNET_MASK:
+        raise SubnetCapacityError(
+            f"Subnet mask /{cidr_mask} is outside the /{MIN_SUBNET_MASK}../{MAX_SUBNET_MASK} AWS allows"
+        )
+    tasks = peak_tasks(max_capacity, deployment_max_percent)
+    # ECS spreads a service's tasks evenly across AZs
+    tasks_per_az = math.ceil(tasks / max_azs)
+    # Worst case all NAT gateways land in the same AZ
+    demand = tasks_per_az + ALB_IPS_PER_SUBNET + min(nat_gateways, max_azs) * NAT_GATEWAY_IPS
+
+    mask = cidr_mask
+    while usable_ips(mask) < demand and mask > MIN_SUBNET_MASK:
+        mask -= 1
+    if usable_ips(mask) < demand:
+        raise SubnetCapacityError(
+            f"A deployment can run {tasks} tasks ({max_capacity} max capacity at "
+            f"{deployment_max_percent}% during deployments), {tasks_per_az} per AZ across {max_azs} AZs. "
+            f"With the ALB and NAT gateway that needs {demand} IPs per subnet, more than the largest "
+            f"subnet (/{MIN_SUBNET_MASK}) holds. Lower MAX_CAPACITY or add AZs."
+        )
+
+    vpc = ipaddress.ip_network(vpc_cidr)
+    needed = max_azs * sum(2 ** (32 - m) for m in (mask, *other_cidr_masks))
+    if mask < vpc.prefixlen or needed > vpc.num_addresses:
+        raise SubnetCapacityError(
+            f"A deployment can run {tasks} tasks ({max_capacity} max capacity at "
+            f"{deployment_max_percent}% during deployments), which needs /{mask} task subnets with "
+            f"{demand} IPs each. {max_azs} AZs of /{mask} plus the other subnets "
+            f"({', '.join(f'/{m}' for m in other_cidr_masks)}) need {needed} addresses, but VPC_CIDR "
+            f"{vpc_cidr} has {vpc.num_addresses}. Use a larger VPC_CIDR or lower MAX_CAPACITY."
+        )
+    return SubnetPlan(mask, max_azs, tasks, tasks_per_az, demand, usable_ips(mask))
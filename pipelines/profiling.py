@@ -0,0 +1,187 @@
+"""Opt-in per-construct profiling of the app's construction and synthesis.
+
+Set ``CDK_PROFILE_CONSTRUCTS`` to an output prefix and run ``cdk synth`` (or
+``python app.py``) as usual::
+
+    CDK_PROFILE_CONSTRUCTS=profile/synth cdk synth
+
+Every construct created from Python, from the app's own stacks down to
+library constructs such as ``ec2.Vpc`` or ``ecs.FargateService``, gets a frame
+with its wall time and the number of jsii kernel round-trips made while it was
+being built. Constructs that the library creates internally (the Vpc's
+subnets, for example) are counted in the frame of the construct that created
+them. Two files are written:
+
+* ``PREFIX.txt``: constructs sorted by self time, with inclusive time and
+  jsii calls.
+* ``PREFIX.folded``: one ``frame;frame;frame microseconds`` line per path,
+  the input of flamegraph.pl, speedscope and similar tools.
+"""
+import functools
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+# Kernel requests that cross from Python into the jsii runtime. The jsii
+# package binds them to its kernel as module attributes at import, and the
+# generated bindings call those (jsii.create, jsii.invoke, ...).
+JSII_REQUESTS = ("create", "invoke", "ainvoke", "sinvoke", "get", "set", "sget", "sset", "delete")
+REPORT_TOP = 25
+
+
+class _Frame:
+    __slots__ = ("obj", "label", "started", "children", "calls", "child_calls")
+
+    def __init__(self, obj, label: str):
+        self.obj = obj
+        self.label = label
+        self.started = time.perf_counter()
+        self.children = 0.0
+        self.calls = 0
+        self.child_calls = 0
+
+
+class ConstructProfiler:
+    def __init__(self):
+        self._frames = []
+        self._patched = []
+        # path tuple -> [count, inclusive s, self s, inclusive calls, self calls]
+        self.nodes = {}
+
+    def _push(self, obj, label: str):
+        self._frames.append(_Frame(obj, label.replace(";", ":")))
+
+    def _pop(self):
+        frame = self._frames[-1]
+        inclusive = time.perf_counter() - frame.started
+        calls = frame.calls + frame.child_calls
+        path = tuple(f.label for f in self._frames)
+        self._frames.pop()
+        if self._frames:
+            parent = self._frames[-1]
+            parent.children += inclusive
+            parent.child_calls += calls
+        node = self.nodes.setdefault(path, [0, 0.0, 0.0, 0, 0])
+        node[0] += 1
+        node[1] += inclusive
+        node[2] += inclusive - frame.children
+        node[3] += calls
+        node[4] += frame.calls
+
+    def _patch(self, owner, name: str, replacement):
+        # None: inherited, restored by deleting the override
+        self._patched.append((owner, name, vars(owner).get(name)))
+        setattr(owner, name, replacement)
+
+    def _wrap_init(self, cls):
+        profiler = self
+        init = cls.__init__
+
+        @functools.wraps(init)
+        def profiled_init(obj, *args, **kwargs):
+            # super().__init__ of the same construct stays in its frame
+            if profiler._frames and profiler._frames[-1].obj is obj:
+                return init(obj, *args, **kwargs)
+            construct_id = args[1] if len(args) > 1 else kwargs.get("id", kwargs.get("construct_id"))
+            profiler._push(obj, f"{construct_id} ({type(obj).__name__})" if construct_id else type(obj).__name__)
+            try:
+                return init(obj, *args, **kwargs)
+            finally:
+                profiler._pop()
+        return profiled_init
+
+    def _wrap_call(self, function, label: Optional[str] = None):
+        profiler = self
+
+        @functools.wraps(function)
+        def profiled(*args, **kwargs):
+            if label is None:
+                if profiler._frames:
+                    profiler._frames[-1].calls += 1
+                return function(*args, **kwargs)
+            profiler._push(None, label)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                profiler._pop()
+        return profiled
+
+    def install(self):
+        from aws_cdk import App
+        from constructs import Construct
+
+        pending, seen = [Construct], set()
+        while pending:
+            cls = pending.pop()
+            if cls in seen:
+                continue
+            seen.add(cls)
+            pending.extend(cls.__subclasses__())
+            if "__init__" in vars(cls):
+                self._patch(cls, "__init__", self._wrap_init(cls))
+        self._patch(App, "synth", self._wrap_call(App.synth, "synth"))
+
+        import jsii
+
+        for name in JSII_REQUESTS:
+            if name in vars(jsii):
+                self._patch(jsii, name, self._wrap_call(vars(jsii)[name]))
+        self._push(None, "app")
+
+    def uninstall(self):
+        while self._frames:
+            self._pop()
+        for owner, name, original in reversed(self._patched):
+            if original is None:
+                delattr(owner, name)
+            else:
+                setattr(owner, name, original)
+        self._patched = []
+
+    def report(self) -> str:
+        total = sum(node[1] for path, node in self.nodes.items() if len(path) == 1) or 1.0
+        rows = sorted(self.nodes.items(), key=lambda item: -item[1][2])
+        lines = [f"{'self ms':>9} {'self %':>6} {'incl ms':>9} {'jsii':>7} {'jsii incl':>9}  construct"]
+        for path, (count, inclusive, own, calls, own_calls) in rows:
+            times = f" x{count}" if count > 1 else ""
+            lines.append(
+                f"{own * 1000:>9.1f} {100.0 * own / total:>5.1f}% {inclusive * 1000:>9.1f} {own_calls:>7}"
+                f" {calls:>9}  {'/'.join(path[1:]) or path[0]}{times}"
+            )
+        return "\n".join(lines)
+
+    def folded(self) -> str:
+        return "\n".join(
+            f"{';'.join(path)} {round(node[2] * 1_000_000)}" for path, node in self.nodes.items() if node[2] > 0
+        )
+
+    def write(self, prefix: str):
+        directory = os.path.dirname(prefix)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        report = self.report()
+        with open(f"{prefix}.txt", "w") as f:
+            f.write(report + "\n")
+        with open(f"{prefix}.folded", "w") as f:
+            f.write(self.folded() + "\n")
+        head = report.splitlines()[: REPORT_TOP + 1]
+        print("\n".join(head), file=sys.stderr)
+        print(f"Construct profile written to {prefix}.txt and {prefix}.folded", file=sys.stderr)
+
+
+@contextmanager
+def construct_profile(prefix: Optional[str] = None):
+    """Profile the constructs built inside the block when ``prefix`` (or CDK_PROFILE_CONSTRUCTS) is set."""
+    prefix = prefix or os.getenv("CDK_PROFILE_CONSTRUCTS")
+    if not prefix:
+        yield None
+        return
+    profiler = ConstructProfiler()
+    profiler.install()
+    try:
+        yield profiler
+    finally:
+        profiler.uninstall()
+        profiler.write(prefix)
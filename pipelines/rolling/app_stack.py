@@ -45,12 +45,13 @@
 
 from aws_cdk import Stack, Environment
 from constructs import Construct
-from stacks.ecs.ecs_stack import ECSFargateSimpleStack
-from stacks.codebuild.codebuild_stack import PipelineWithASGStack
+from pipelines.config import Config
+from pipelines.rolling.ecs_stack import ECSFargateSimpleStack
+from pipelines.rolling.codebuild_stack import PipelineWithASGStack
 
 
 class AppStack(Stack):
-    def __init__(self, scope: Construct, id: str, *, config: dict, env_name: str, base_stack, **kwargs):
+    def __init__(self, scope: Construct, id: str, *, config: Config, env_name: str, base_stack, **kwargs):
         super().__init__(scope, id, **kwargs)
 
         # ECS Fargate service using BaseStack resources
@@ -60,9 +61,15 @@ class AppStack(Stack):
             vpc=base_stack.vpc,
             target_group=base_stack.target_group,
             repository=base_stack.repository,
-            project_name=config["PROJECT_NAME"],
+            project_name=config.project_name,
             env_name=env_name,
-            desired_count=1,  # default or override as needed
+            desired_count=config.desired_count,
+            min_capacity=config.min_capacity,
+            max_capacity=config.max_capacity,
+            task_cpu=config.task_cpu,
+            task_memory_mib=config.task_memory_mib,
+            traffic_profile=config.traffic_profile,
+            max_healthy_percent=config.deployment_max_percent,
         )
 
 
@@ -70,12 +77,12 @@ class AppStack(Stack):
         self.pipeline_stack = PipelineWithASGStack(
             self,
             "PipelineWithASGStack",
-            project_name=config["PROJECT_NAME"],
+            project_name=config.project_name,
             env_name=env_name,
-            connection_arn=config["CODESTAR_CONNECTION_ARN"],  # from config
-            repo_owner=config["REPO_OWNER"],
-            repo_name=config["REPO_NAME"],
-            branch_name=config.get("BRANCH_NAME", "main"),  # default to 'main'
+            connection_arn=config.connection_arn,  # from config
+            repo_owner=config.repo_owner,
+            repo_name=config.repo_name,
+            branch_name=config.branch_name,
             ecs_service=self.ecs_stack.service,
             repository=self.ecs_stack.repository,
         )
\ No newline at end of file
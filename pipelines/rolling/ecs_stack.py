@@ -140,8 +140,10 @@ from aws_cdk import (
     aws_applicationautoscaling as appscaling,
     Tags,
     Duration,
+    TimeZone,
 )
 from constructs import Construct
+from pipelines.schedule import load_traffic_profile, scheduled_minimums
 
 
 class ECSFargateSimpleStack(NestedStack):
@@ -156,6 +158,12 @@ class ECSFargateSimpleStack(NestedStack):
         project_name: str,
         env_name: str,
         desired_count: int = 1,
+        min_capacity: int = 1,
+        max_capacity: int = 5,
+        task_cpu: int = 256,
+        task_memory_mib: int = 512,
+        traffic_profile: str = None,
+        max_healthy_percent: int = 200,
         **kwargs,
     ) -> None:
         super().__init__(scope, id, **kwargs)
@@ -214,8 +222,8 @@ class ECSFargateSimpleStack(NestedStack):
             self,
             "TaskDefinition",
             family=f"{project_name}-{env_name}-taskdef",
-            memory_limit_mib=512,
-            cpu=256,
+            memory_limit_mib=task_memory_mib,
+            cpu=task_cpu,
             execution_role=execution_role,
             task_role=task_role,
         )
@@ -241,6 +249,8 @@ class ECSFargateSimpleStack(NestedStack):
             service_name=f"{project_name}-{env_name}-service",
             task_definition=task_def,
             desired_count=desired_count,
+            # Must match what BasicNetworkingStack sized the subnets for
+            max_healthy_percent=max_healthy_percent,
             security_groups=[ecs_sg],
             assign_public_ip=True,
             vpc_subnets=ec2.SubnetSelection(subnet_type=ec2.SubnetType.PUBLIC),
@@ -263,21 +273,33 @@ class ECSFargateSimpleStack(NestedStack):
 
         # Enable AutoScaling with 1-minute evaluation period and scaling steps
         scalable_target = fargate_service.auto_scale_task_count(
-            min_capacity=1,
-            max_capacity=5,
+            min_capacity=min_capacity,
+            max_capacity=max_capacity,
         )
         scalable_target.scale_on_metric(
             "CpuScalingWith1MPeriod",
             metric=cpu_metric_1m,
             scaling_steps=[
-                appscaling.ScalingInterval(change=-1, upper=4),  # scale OUT if > 5%
-                appscaling.ScalingInterval(change=+1, lower=6),  # scale IN if < 5%
+                appscaling.ScalingInterval(change=-1, upper=4),  # scale IN if <= 4%
+                appscaling.ScalingInterval(change=+1, lower=6),  # scale OUT if >= 6%
             ],
             evaluation_periods=1,                     # 1 datapoint in 1 minute
             adjustment_type=appscaling.AdjustmentType.CHANGE_IN_CAPACITY,
             cooldown=Duration.seconds(60),
         )
 
+        # Raise the minimum ahead of the daily peaks in the traffic profile;
+        # the CPU steps above still handle anything the profile doesn't predict
+        if traffic_profile:
+            profile = load_traffic_profile(traffic_profile)
+            for action in scheduled_minimums(profile, min_capacity=min_capacity, max_capacity=max_capacity):
+                scalable_target.scale_on_schedule(
+                    action.name,
+                    schedule=appscaling.Schedule.cron(hour=str(action.hour), minute=str(action.minute)),
+                    time_zone=TimeZone.of(profile.timezone) if profile.timezone else None,
+                    min_capacity=action.min_capacity,
+                )
+
         # Tags
         Tags.of(fargate_service).add("Name", f"{project_name}-{env_name}-ecs-service")
         Tags.of(fargate_service).add("Environment", env_name)
@@ -0,0 +1,103 @@
+"""Scheduled minimum task counts from a daily traffic profile.
+
+The profile holds request-rate percentiles per hour of the day, e.g. from a
+few weeks of ALB ``RequestCount`` metrics::
+
+    {"timezone": "Asia/Kolkata", "percentile": "p95", "task_rps": 380,
+     "headroom_pct": 30, "lead_minutes": 15,
+     "hours": [{"hour": 8, "p50": 900, "p95": 1400}, ...]}
+
+Hours left out are expected to need no more than the configured minimum.
+For every hour that needs more tasks than the one before, the minimum is
+raised ``lead_minutes`` ahead so the tasks are running when the traffic
+arrives; it is lowered again at the start of the first quieter hour. Lowering
+the minimum does not remove tasks by itself, the reactive policy does that.
+"""
+import json
+import math
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+MINUTES_PER_DAY = 24 * 60
+
+
+@dataclass
+class TrafficProfile:
+    hourly_rps: List[float]  # 24 entries, at the chosen percentile
+    task_rps: float  # sustained requests per second of one task
+    headroom_pct: float = 30.0
+    lead_minutes: int = 15
+    timezone: Optional[str] = None  # IANA name; None is UTC
+    percentile: str = "p95"
+
+
+@dataclass
+class ScheduledMinimum:
+    hour: int
+    minute: int
+    min_capacity: int
+    reason: str = field(default="", compare=False)
+
+    @property
+    def name(self) -> str:
+        return f"MinCapacity{self.hour:02d}{self.minute:02d}"
+
+
+def load_traffic_profile(path: str, percentile: Optional[str] = None) -> TrafficProfile:
+    with open(path) as f:
+        spec = json.load(f)
+    percentile = percentile or spec.get("percentile", "p95")
+    hourly = [0.0] * 24
+    for entry in spec["hours"]:
+        hour = int(entry["hour"])
+        if not 0 <= hour < 24:
+            raise ValueError(f"{path}: hour {hour} is outside 0..23")
+        if percentile not in entry:
+            raise ValueError(f"{path}: hour {hour} has no {percentile} value")
+        hourly[hour] = float(entry[percentile])
+    task_rps = float(spec["task_rps"])
+    if task_rps <= 0:
+        raise ValueError(f"{path}: task_rps must be positive")
+    return TrafficProfile(
+        hourly_rps=hourly,
+        task_rps=task_rps,
+        headroom_pct=float(spec.get("headroom_pct", 30.0)),
+        lead_minutes=int(spec.get("lead_minutes", 15)),
+        timezone=spec.get("timezone"),
+        percentile=percentile,
+    )
+
+
+def hourly_minimums(profile: TrafficProfile, *, min_capacity: int, max_capacity: int) -> List[int]:
+    factor = 1 + profile.headroom_pct / 100.0
+    return [
+        min(max(math.ceil(rps * factor / profile.task_rps), min_capacity), max_capacity)
+        for rps in profile.hourly_rps
+    ]
+
+
+def scheduled_minimums(profile: TrafficProfile, *, min_capacity: int, max_capacity: int) -> List[ScheduledMinimum]:
+    """Daily scheduled actions, ordered by time of day."""
+    needed = hourly_minimums(profile, min_capacity=min_capacity, max_capacity=max_capacity)
+    lead = profile.lead_minutes
+
+    def required(minute: int) -> tuple:
+        # The most any hour starting within the lead time needs, this one included
+        hours = range(minute // 60, (minute + lead) // 60 + 1)
+        return max((needed[hour % 24], hour % 24) for hour in hours)
+
+    # The minimum only changes at hour starts or lead minutes before them
+    times = sorted({(hour * 60 - lead) % MINUTES_PER_DAY for hour in range(24)} | {hour * 60 for hour in range(24)})
+    actions = []
+    previous = required(times[-1])[0]
+    for minute in times:
+        count, hour = required(minute)
+        if count != previous:
+            rps = profile.hourly_rps[hour]
+            actions.append(ScheduledMinimum(minute // 60, minute % 60, count,
+                                            f"{profile.percentile} {rps:g} rps at {hour:02d}:00"))
+        previous = count
+    if not actions and needed[0] != min_capacity:
+        # The same minimum all day long
+        actions.append(ScheduledMinimum(0, 0, needed[0], f"{profile.percentile} needs {needed[0]} tasks all day"))
+    return actions
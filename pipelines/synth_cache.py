@@ -0,0 +1,183 @@
+"""Skips synthesis when nothing that goes into cdk.out has changed.
+
+The key covers the app's sources (its entry point, this package and the
+template budgets), the resolved ``Config`` of every deployment it
+synthesizes, the aws-cdk-lib version, the context the CDK CLI passes in
+(``cdk.json``, ``cdk.context.json`` and ``-c`` flags) and the Python
+version. It is stored next to the assembly after every synthesis, with a
+digest of each assembly file. When the next run computes the same key and
+every assembly file still matches its digest, app.py exits before importing
+``aws_cdk`` and the CLI picks up the existing cdk.out. A miss logs what
+changed.
+
+Only used under the CDK CLI (which sets ``CDK_OUTDIR``); ``CDK_SYNTH_CACHE=0``
+turns it off.
+"""
+import hashlib
+import json
+import os
+import sys
+from dataclasses import asdict
+from importlib import metadata
+from typing import Dict, List, Optional, Sequence
+
+from pipelines.deployments import deployment_config
+from pipelines.template_budget import budgets_path
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(PACKAGE_DIR)
+# Everything under these (relative to the app directory) is hashed as source, with this package
+SOURCES = ("app.py", "cdk.json", "cdk.context.json")
+KEY_FILE = ".synth-cache.json"
+# Shown per component before the rest of a miss is summarized
+MAX_REASONS = 5
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _file_digest(path: str) -> str:
+    with open(path, "rb") as f:
+        return _digest(f.read())
+
+
+def _source_files(app_dir: str) -> List[str]:
+    files = []
+    for path in [os.path.join(app_dir, source) for source in SOURCES] + [PACKAGE_DIR]:
+        if os.path.isfile(path):
+            files.append(path)
+        for root, dirs, names in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+            files.extend(os.path.join(root, name) for name in sorted(names) if not name.endswith(".pyc"))
+    return files
+
+
+def _context() -> str:
+    # The CLI passes large contexts through a file instead of the variable
+    overflow = os.environ.get("CONTEXT_OVERFLOW_LOCATION_ENV")
+    if overflow and os.path.exists(overflow):
+        with open(overflow, "rb") as f:
+            return _digest(f.read())
+    return _digest(os.environ.get("CDK_CONTEXT_JSON", "").encode())
+
+
+def _cdk_version() -> Optional[str]:
+    try:
+        return metadata.version("aws-cdk-lib")
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def compute_key(app_dir: str, deployments: Sequence[str]) -> dict:
+    sources = {os.path.relpath(path, REPO_ROOT): _file_digest(path) for path in _source_files(app_dir)}
+    config = {}
+    for name in deployments:
+        for key, value in asdict(deployment_config(name)).items():
+            config[f"{name}.{key}"] = _digest(json.dumps(value).encode())
+            # Files the config points at are inputs too
+            if isinstance(value, str) and os.path.isfile(value):
+                sources[os.path.relpath(value, REPO_ROOT)] = _file_digest(value)
+    # A cached assembly has only passed the budgets it was checked against
+    budgets = budgets_path()
+    if budgets == "0":
+        sources["CDK_TEMPLATE_BUDGETS=0"] = _digest(b"off")
+    elif os.path.isfile(budgets):
+        sources[os.path.relpath(budgets, REPO_ROOT)] = _file_digest(budgets)
+    return {
+        "deployments": list(deployments),
+        "sources": sources,
+        "config": config,
+        "cdk_version": _cdk_version(),
+        "context": _context(),
+        "python": "%d.%d" % sys.version_info[:2],
+    }
+
+
+def _differences(name: str, before, after) -> List[str]:
+    if isinstance(after, dict) and isinstance(before, dict):
+        changed = sorted(k for k in after if k in before and after[k] != before[k])
+        added = sorted(k for k in after if k not in before)
+        removed = sorted(k for k in before if k not in after)
+        reasons = ([f"{name} {k} changed" for k in changed] + [f"{name} {k} added" for k in added]
+                   + [f"{name} {k} removed" for k in removed])
+        if len(reasons) > MAX_REASONS:
+            reasons = reasons[:MAX_REASONS] + [f"{len(reasons) - MAX_REASONS} more {name} changes"]
+        return reasons
+    if before != after:
+        return [f"{name} changed" if name == "context" else f"{name} {before} -> {after}"]
+    return []
+
+
+def explain_miss(previous: Optional[dict], key: dict) -> List[str]:
+    if previous is None:
+        return ["no previous synthesis in this output directory"]
+    reasons = _differences("deployments", previous.get("deployments"), key["deployments"])
+    # Other deployments have other settings; no point listing them
+    components = ("sources", "cdk_version", "context", "python") if reasons else \
+        ("sources", "config", "cdk_version", "context", "python")
+    for name in components:
+        reasons.extend(_differences(name, previous.get(name), key[name]))
+    return reasons
+
+
+class SynthCache:
+    def __init__(self, outdir: Optional[str], app_dir: str, deployments: Sequence[str]):
+        self.outdir = outdir
+        self.app_dir = app_dir
+        self.deployments = tuple(deployments)
+        self.key = None
+
+    @classmethod
+    def from_environment(cls, app_dir: str, deployments: Sequence[str]) -> "SynthCache":
+        enabled = (
+            os.environ.get("CDK_SYNTH_CACHE", "1") != "0"
+            # A profiling run has to construct everything
+            and not os.environ.get("CDK_PROFILE_CONSTRUCTS")
+        )
+        return cls(os.environ.get("CDK_OUTDIR") if enabled else None, app_dir, deployments)
+
+    @property
+    def _key_path(self) -> str:
+        return os.path.join(self.outdir, KEY_FILE)
+
+    def _load(self) -> Optional[dict]:
+        try:
+            with open(self._key_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _assembly_files(self) -> Dict[str, str]:
+        files = {}
+        for root, _, names in os.walk(self.outdir):
+            for name in names:
+                path = os.path.join(root, name)
+                relative = os.path.relpath(path, self.outdir)
+                if relative != KEY_FILE and not name.endswith(".lock"):
+                    files[relative] = _file_digest(path)
+        return files
+
+    def hit(self) -> bool:
+        if self.outdir is None:
+            return False
+        self.key = compute_key(self.app_dir, self.deployments)
+        stored = self._load()
+        previous = stored and stored["key"]
+        reasons = explain_miss(previous, self.key)
+        if not reasons:
+            present = self._assembly_files()
+            missing = [name for name, digest in stored["assembly"].items() if present.get(name) != digest]
+            if not missing:
+                print(f"synth cache: hit, reusing {self.outdir}", file=sys.stderr)
+                return True
+            reasons = [f"{len(missing)} assembly file(s) missing or modified, e.g. {missing[0]}"]
+        print(f"synth cache: miss ({'; '.join(reasons)})", file=sys.stderr)
+        return False
+
+    def store(self):
+        if self.outdir is None or not os.path.exists(os.path.join(self.outdir, "manifest.json")):
+            return
+        key = self.key or compute_key(self.app_dir, self.deployments)
+        with open(self._key_path, "w") as f:
+            json.dump({"key": key, "assembly": self._assembly_files()}, f, indent=1, sort_keys=True)
@@ -0,0 +1,252 @@
+"""Size and resource-count budgets for the synthesized CloudFormation templates.
+
+Every stack and nested stack (networking, ALB, ECR, ECS, pipeline,
+CodeDeploy) is its own template in ``cdk.out``. For each one this module
+measures the template size and counts its resources, parameters, outputs and
+mappings. It checks them against CloudFormation's hard limits and against
+the budgets in ``template-budgets.json``::
+
+    {
+      "default": {"size_bytes": 300000, "resources": 150},
+      "warn_pct": 90,
+      "stacks": {"*ECSFargateSimpleStack*": {"resources": 80}}
+    }
+
+Stack patterns are ``fnmatch`` globs over the stack name; the first matching
+pattern's values override the defaults. Without the file, the budgets are
+80% of the limits. After every synthesis, ``build_app`` checks the templates
+and raises ``TemplateBudgetError`` when one is over its budget or limit; the
+entry points turn it into a failed exit. With ``CDK_TEMPLATE_HISTORY=1`` (or
+``budget.py check --record``) a run that changed any template is appended to
+``benchmarks/templates.jsonl``, so growth shows up over commits
+(``budget.py history``).
+"""
+import fnmatch
+import json
+import os
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BUDGETS = os.path.join(REPO_ROOT, "template-budgets.json")
+DEFAULT_HISTORY = os.path.join(REPO_ROOT, "benchmarks", "templates.jsonl")
+# CloudFormation quotas; CDK uploads templates to S3, so the size limit is the 1 MB one
+LIMITS = {
+    "size_bytes": 1_048_576,
+    "resources": 500,
+    "parameters": 200,
+    "outputs": 200,
+    "mappings": 200,
+}
+METRICS = tuple(LIMITS)
+DEFAULT_BUDGET_PCT = 80
+DEFAULT_WARN_PCT = 90
+# Most severe first
+LEVELS = ("limit", "budget", "warn")
+TEMPLATE_SUFFIXES = (".nested.template.json", ".template.json")
+
+
+@dataclass
+class TemplateStats:
+    stack: str
+    file: str
+    nested: bool
+    size_bytes: int
+    resources: int
+    parameters: int
+    outputs: int
+    mappings: int
+
+
+@dataclass
+class Finding:
+    stack: str
+    metric: str
+    value: int
+    allowed: int
+    level: str  # one of LEVELS
+
+    def describe(self) -> str:
+        what = {"limit": "over the CloudFormation limit", "budget": "over budget",
+                "warn": "close to its budget"}[self.level]
+        return f"{self.stack}: {self.metric} {self.value} is {what} ({self.allowed})"
+
+
+class TemplateBudgetError(Exception):
+    def __init__(self, message: str, findings: List[Finding]):
+        self.findings = findings
+        super().__init__(message)
+
+
+def _stack_name(file_name: str) -> str:
+    for suffix in TEMPLATE_SUFFIXES:
+        if file_name.endswith(suffix):
+            return file_name[: -len(suffix)]
+    return file_name
+
+
+def collect(cdk_out: str) -> List[TemplateStats]:
+    """Stats of every template in an assembly directory, nested stages included."""
+    stats = []
+    for root, dirs, names in os.walk(cdk_out):
+        dirs.sort()
+        for name in sorted(names):
+            if not name.endswith(".template.json"):
+                continue
+            path = os.path.join(root, name)
+            with open(path) as f:
+                template = json.load(f)
+            stats.append(TemplateStats(
+                stack=_stack_name(name),
+                file=os.path.relpath(path, cdk_out),
+                nested=name.endswith(".nested.template.json"),
+                size_bytes=os.path.getsize(path),
+                resources=len(template.get("Resources", {})),
+                parameters=len(template.get("Parameters", {})),
+                outputs=len(template.get("Outputs", {})),
+                mappings=len(template.get("Mappings", {})),
+            ))
+    return stats
+
+
+def budgets_path() -> str:
+    # CDK_TEMPLATE_BUDGETS names another budgets file, or is 0 to skip the check
+    return os.environ.get("CDK_TEMPLATE_BUDGETS") or DEFAULT_BUDGETS
+
+
+def load_budgets(path: Optional[str] = DEFAULT_BUDGETS) -> dict:
+    budgets = {"default": {}, "warn_pct": DEFAULT_WARN_PCT, "stacks": {}}
+    if path and os.path.exists(path):
+        with open(path) as f:
+            budgets.update(json.load(f))
+    unknown = sorted({metric for values in [budgets["default"], *budgets["stacks"].values()]
+                      for metric in values} - set(METRICS))
+    if unknown:
+        raise ValueError(f"{path}: unknown budget metric(s) {', '.join(unknown)}; use {', '.join(METRICS)}")
+    return budgets
+
+
+def budget_for(budgets: dict, stack: str) -> Dict[str, int]:
+    budget = {metric: LIMITS[metric] * DEFAULT_BUDGET_PCT // 100 for metric in METRICS}
+    budget.update(budgets["default"])
+    for pattern, values in budgets["stacks"].items():
+        if fnmatch.fnmatchcase(stack, pattern):
+            budget.update(values)
+            break
+    return budget
+
+
+def check(stats: List[TemplateStats], budgets: dict) -> List[Finding]:
+    findings = []
+    for template in stats:
+        budget = budget_for(budgets, template.stack)
+        for metric in METRICS:
+            value = getattr(template, metric)
+            if value > LIMITS[metric]:
+                findings.append(Finding(template.stack, metric, value, LIMITS[metric], "limit"))
+            elif value > budget[metric]:
+                findings.append(Finding(template.stack, metric, value, budget[metric], "budget"))
+            elif value * 100 >= budget[metric] * budgets["warn_pct"]:
+                findings.append(Finding(template.stack, metric, value, budget[metric], "warn"))
+    return findings
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path: str = DEFAULT_HISTORY) -> List[dict]:
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _latest(history: List[dict]) -> Dict[str, dict]:
+    latest = {}
+    for record in history:
+        for template in record["templates"]:
+            latest[template["stack"]] = template
+    return latest
+
+
+def trend(stats: List[TemplateStats], history: List[dict]) -> Dict[str, Dict[str, int]]:
+    """Change of every metric against the last recorded value of the same stack."""
+    previous = _latest(history)
+    return {
+        template.stack: {
+            metric: getattr(template, metric) - previous[template.stack][metric] for metric in METRICS
+        }
+        for template in stats
+        if template.stack in previous
+    }
+
+
+def record(stats: List[TemplateStats], path: str = DEFAULT_HISTORY, history: Optional[List[dict]] = None) -> bool:
+    """Appends the stats when any template differs from its last record; returns whether it did."""
+    history = load_history(path) if history is None else history
+    previous = _latest(history)
+    current = [asdict(template) for template in stats]
+    if all(previous.get(template["stack"]) == template for template in current):
+        return False
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    line = json.dumps({"recorded_at": round(time.time(), 3), "commit": _git_commit(), "templates": current},
+                      sort_keys=True) + "\n"
+    # One write per record: parallel syntheses (synth.py) append to the same file
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line.encode())
+    finally:
+        os.close(fd)
+    return True
+
+
+def format_report(stats: List[TemplateStats], findings: List[Finding],
+                  changes: Optional[Dict[str, Dict[str, int]]] = None) -> str:
+    changes = changes or {}
+    flagged = {}
+    for finding in sorted(findings, key=lambda f: LEVELS.index(f.level), reverse=True):
+        flagged[finding.stack] = finding.level
+    lines = [f"{'stack':<56} {'bytes':>9} {'change':>7} {'res':>4} {'par':>4} {'out':>4}"]
+    for template in sorted(stats, key=lambda t: -t.size_bytes):
+        change = changes.get(template.stack, {}).get("size_bytes")
+        lines.append(
+            f"{template.stack[:56]:<56} {template.size_bytes:>9} {'' if change is None else f'{change:+d}':>7} "
+            f"{template.resources:>4} {template.parameters:>4} {template.outputs:>4}"
+            f"{'  ' + flagged[template.stack].upper() if template.stack in flagged else ''}"
+        )
+    lines.extend(finding.describe() for finding in findings)
+    return "\n".join(lines)
+
+
+def enforce(cdk_out: str, budgets_file: Optional[str] = None, history_path: str = DEFAULT_HISTORY):
+    """Run after synthesis: reports templates near or over budget and raises ``TemplateBudgetError`` on a breach.
+
+    The stats are appended to ``history_path`` only when ``CDK_TEMPLATE_HISTORY=1``.
+    """
+    if os.environ.get("CDK_TEMPLATE_BUDGETS") == "0":
+        return
+    budgets_file = budgets_file or budgets_path()
+    budgets = load_budgets(budgets_file)
+    stats = collect(cdk_out)
+    findings = check(stats, budgets)
+    history = load_history(history_path)
+    changes = trend(stats, history)
+    if os.environ.get("CDK_TEMPLATE_HISTORY") == "1":
+        record(stats, history_path, history)
+    failures = [finding for finding in findings if finding.level != "warn"]
+    if failures:
+        raise TemplateBudgetError(
+            format_report(stats, findings, changes)
+            + f"\n{len(failures)} template budget breach(es), see {os.path.relpath(budgets_file)}",
+            failures,
+        )
+    for finding in findings:
+        print(f"template budget: {finding.describe()}", file=sys.stderr)
@@ -0,0 +1,62 @@
+from aws_cdk import Annotations, NestedStack, aws_ec2 as ec2
+from constructs import Construct
+from pipelines.ip_capacity import plan_task_subnets
+
+
+class BasicNetworkingStack(NestedStack):
+    def __init__(
+        self,
+        scope: Construct,
+        construct_id: str,
+        *,
+        vpc_name: str,
+        vpc_cidr: str,
+        num_public_subnets: int,
+        num_private_subnets: int,
+        max_capacity: int = 5,
+        deployment_max_percent: int = 200,
+        cidr_mask: int = 24,
+        vpc_construct_id: str = "Vpc",
+        **kwargs,
+    ) -> None:
+        super().__init__(scope, construct_id, **kwargs)
+
+        max_azs = 2
+        nat_gateways = 1
+
+        # Tasks, the ALB and the NAT gateway share the public subnets; make sure
+        # they hold every task of a deployment (fails synthesis if they can't)
+        self.subnet_plan = plan_task_subnets(
+            vpc_cidr=vpc_cidr,
+            max_azs=max_azs,
+            max_capacity=max_capacity,
+            deployment_max_percent=deployment_max_percent,
+            cidr_mask=cidr_mask,
+            other_cidr_masks=(cidr_mask,),
+            nat_gateways=nat_gateways,
+        )
+        Annotations.of(self).add_info(self.subnet_plan.describe())
+
+        # Modern CDK prefers ipAddresses over cidr (cidr is deprecated). The
+        # construct id is part of every VPC resource's logical id, so each
+        # deployment style keeps the one it was first deployed with
+        self.vpc = ec2.Vpc(
+            self,
+            vpc_construct_id,
+            vpc_name=vpc_name,
+            ip_addresses=ec2.IpAddresses.cidr(vpc_cidr),
+            max_azs=max_azs,  # AZ count limited by subnet counts
+            subnet_configuration=[
+                ec2.SubnetConfiguration(
+                    name="public",
+                    subnet_type=ec2.SubnetType.PUBLIC,
+                    cidr_mask=self.subnet_plan.cidr_mask,
+                ),
+                ec2.SubnetConfiguration(
+                    name="private",
+                    subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS,
+                    cidr_mask=cidr_mask,
+                ),
+            ],
+            nat_gateways=nat_gateways,
+        )
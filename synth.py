@@ -0,0 +1,52 @@
+import argparse
+import json
+import sys
+import time
+
+from pipelines.deployments import DEPLOYMENTS, parse_deployments
+from pipelines.environments import DEFAULT_OUTDIR, load_matrix, synth_all
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Synthesize the app for several environments in parallel, one output directory each")
+    parser.add_argument("--matrix", default="environments.json",
+                        help="JSON object of environment name -> settings that override .env")
+    parser.add_argument("--deployments", type=parse_deployments, default=tuple(DEPLOYMENTS),
+                        help=f"Comma-separated deployment styles (default: {','.join(DEPLOYMENTS)})")
+    parser.add_argument("--env", action="append", metavar="NAME",
+                        help="Only this environment (repeatable, default: all in the matrix)")
+    parser.add_argument("--outdir", default=DEFAULT_OUTDIR, help="Each environment is written to OUTDIR/NAME")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: one per environment, up to the CPUs)")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args(argv)
+    try:
+        args.matrix = load_matrix(args.matrix, args.env)
+    except (OSError, ValueError) as exc:
+        parser.error(str(exc))
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    started = time.perf_counter()
+    results = synth_all(args.matrix, args.deployments, args.outdir, args.workers)
+    elapsed = time.perf_counter() - started
+
+    if args.json:
+        json.dump({"seconds": round(elapsed, 3), "environments": results}, sys.stdout, indent=2)
+        print()
+    else:
+        for result in results:
+            if result["ok"]:
+                note = " (cached)" if result["cached"] else ""
+                print(f"{result['env']:<12} {result['seconds']:>7.2f}s  {result['outdir']}{note}")
+            else:
+                print(f"{result['env']:<12} FAILED\n{result['error']}")
+        print(f"{len(results)} environment(s) in {elapsed:.2f}s")
+    if not all(result["ok"] for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
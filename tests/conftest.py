@@ -0,0 +1,39 @@
+from dataclasses import fields
+
+import pytest
+
+from pipelines.config import ALIASES, Config
+
+VALID_ENV = {
+    "PROJECT_NAME": "demo",
+    "ENV": "test",
+    "REGION": "ap-south-1",
+    "ACCOUNT": "123456789012",
+    "VPC_CIDR": "10.0.0.0/16",
+    "NUM_PUBLIC_SUBNETS": "2",
+    "NUM_PRIVATE_SUBNETS": "2",
+    "CONNECTION_ARN": "arn:aws:codeconnections:ap-south-1:123456789012:connection/abc",
+    "REPO_OWNER": "owner",
+    "REPO_NAME": "repo",
+}
+
+
+@pytest.fixture
+def clean_env(monkeypatch):
+    """No config or CDK variables from the calling shell."""
+    names = [Config.variable(field.name) for field in fields(Config)]
+    names += [alias for aliases in ALIASES.values() for alias in aliases]
+    names += ["CDK_OUTDIR", "CDK_CONTEXT_JSON", "CDK_SYNTH_CACHE", "CDK_PROFILE_CONSTRUCTS", "CDK_TEMPLATE_BUDGETS"]
+    for name in names:
+        monkeypatch.delenv(name, raising=False)
+    return monkeypatch
+
+
+@pytest.fixture
+def write_env(tmp_path):
+    def write(**overrides):
+        values = {**VALID_ENV, **overrides}
+        path = tmp_path / ".env"
+        path.write_text("".join(f"{key}={value}\n" for key, value in values.items() if value is not None))
+        return str(path)
+    return write
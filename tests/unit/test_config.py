@@ -0,0 +1,114 @@
+import dataclasses
+import os
+
+import pytest
+
+from pipelines import deployments
+from pipelines.config import ConfigError, load_config
+
+
+def problems(env_file):
+    with pytest.raises(ConfigError) as error:
+        load_config(env_file)
+    return error.value.problems
+
+
+def test_valid_file_with_defaults(clean_env, write_env):
+    config = load_config(write_env())
+    assert config.project_name == "demo"
+    assert config.num_public_subnets == 2
+    assert (config.min_capacity, config.desired_count, config.max_capacity) == (1, 1, 5)
+    assert config.deployment_max_percent == 200
+    assert config.traffic_profile is None
+
+
+def test_config_is_immutable_and_cached(clean_env, write_env):
+    path = write_env()
+    config = load_config(path)
+    assert load_config(path) is config
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        config.max_capacity = 10
+
+
+def test_cache_follows_the_environment_and_the_file(clean_env, write_env):
+    path = write_env()
+    assert load_config(path).max_capacity == 5
+    clean_env.setenv("MAX_CAPACITY", "8")
+    assert load_config(path).max_capacity == 8
+    clean_env.delenv("MAX_CAPACITY")
+    write_env(MAX_CAPACITY="7")
+    assert load_config(path).max_capacity == 7
+    # Unrelated variables do not make a new entry
+    config = load_config(path)
+    clean_env.setenv("UNRELATED", "1")
+    assert load_config(path) is config
+
+
+def test_environment_wins_over_the_file_unless_empty(clean_env, write_env):
+    clean_env.setenv("MAX_CAPACITY", "8")
+    clean_env.setenv("REGION", "")
+    config = load_config(write_env())
+    assert config.max_capacity == 8
+    assert config.region == "ap-south-1"
+
+
+def test_connection_arn_alias(clean_env, write_env):
+    arn = "arn:aws:codestar-connections:ap-south-1:123456789012:connection/old"
+    assert load_config(write_env(CONNECTION_ARN=None, CODESTAR_CONNECTION_ARN=arn)).connection_arn == arn
+
+
+def test_every_problem_is_reported_at_once(clean_env, write_env):
+    path = write_env(
+        ACCOUNT="1234",
+        REGION="Mumbai",
+        VPC_CIDR="10.0.0.0/8",
+        NUM_PUBLIC_SUBNETS="two",
+        REPO_NAME=None,
+        SUBNET_CIDR_MASK="30",
+        TRAFFIC_PROFILE="missing.json",
+    )
+    # The profile is relative to the .env file
+    profile = os.path.join(os.path.dirname(path), "missing.json")
+    assert problems(path) == [
+        "NUM_PUBLIC_SUBNETS must be a whole number, got 'two'",
+        "REPO_NAME is not set",
+        "ACCOUNT must be a 12-digit AWS account id, got '1234'",
+        "REGION must be an AWS region such as ap-south-1, got 'Mumbai'",
+        "VPC_CIDR must be an IPv4 network with a /16 to /28 prefix, got '10.0.0.0/8'",
+        "SUBNET_CIDR_MASK must be between 16 and 28, got 30",
+        f"TRAFFIC_PROFILE must be an existing file, got {profile!r}",
+    ]
+
+
+def test_error_message_lists_the_file_and_problems(clean_env, write_env):
+    path = write_env(ACCOUNT="x", MAX_CAPACITY="0")
+    with pytest.raises(ConfigError) as error:
+        load_config(path)
+    assert isinstance(error.value, ValueError)
+    assert error.value.env_file == path
+    assert str(error.value).startswith(f"{path}: 2 problem(s)\n  - ")
+
+
+@pytest.mark.parametrize("min_capacity, desired", [("3", 3), ("0", 1)])
+def test_desired_count_defaults_to_the_minimum(clean_env, write_env, min_capacity, desired):
+    assert load_config(write_env(MIN_CAPACITY=min_capacity)).desired_count == desired
+
+
+@pytest.mark.parametrize("settings, message", [
+    ({"MIN_CAPACITY": "6", "MAX_CAPACITY": "4"}, "MIN_CAPACITY must not exceed MAX_CAPACITY, got 6 > 4"),
+    ({"MIN_CAPACITY": "3", "DESIRED_COUNT": "1"},
+     "DESIRED_COUNT must be within MIN_CAPACITY..MAX_CAPACITY, got 1 outside 3..5"),
+])
+def test_capacity_consistency(clean_env, write_env, settings, message):
+    assert problems(write_env(**settings)) == [message]
+
+
+def test_require_configs_reports_every_deployment(clean_env, write_env, tmp_path):
+    write_env(ACCOUNT="x")
+    clean_env.setitem(deployments.DEPLOYMENTS, "rolling", str(tmp_path))
+    clean_env.setitem(deployments.DEPLOYMENTS, "bluegreen", str(tmp_path))
+    with pytest.raises(SystemExit) as error:
+        deployments.require_configs(("rolling", "bluegreen"))
+    message = str(error.value.code)
+    assert message.startswith("Invalid configuration:\nrolling deployment, ")
+    assert "\nbluegreen deployment, " in message
@@ -0,0 +1,42 @@
+import json
+import os
+
+import pytest
+
+from pipelines.environments import cli_context, load_matrix, synth_all
+
+
+@pytest.fixture
+def matrix_file(tmp_path):
+    path = tmp_path / "environments.json"
+    path.write_text(json.dumps({"dev": {"MAX_CAPACITY": 2}, "stage": {"MAX_CAPACITY": 3},
+                                "prod": {"ENV": "production", "MIN_CAPACITY": 2}}))
+    return str(path)
+
+
+def test_load_matrix(matrix_file):
+    matrix = load_matrix(matrix_file)
+    assert matrix["dev"] == {"ENV": "dev", "MAX_CAPACITY": "2"}
+    assert matrix["prod"]["ENV"] == "production"
+    assert list(load_matrix(matrix_file, ["stage"])) == ["stage"]
+    with pytest.raises(ValueError, match="no environment"):
+        load_matrix(matrix_file, ["qa"])
+
+
+def test_cli_context_reads_cdk_json():
+    assert "@aws-cdk/core:target-partitions" in json.loads(cli_context())
+
+
+def test_each_environment_gets_its_own_assembly(matrix_file, tmp_path):
+    # One worker synthesizes all three in turn with the same jsii runtime
+    results = synth_all(load_matrix(matrix_file), ("rolling",), str(tmp_path / "cdk.envs"), workers=1)
+    assert [result["env"] for result in results] == ["dev", "stage", "prod"]
+    assert all(result["ok"] for result in results), results
+    stacks = []
+    for result, env_name in zip(results, ("dev", "stage", "production")):
+        with open(os.path.join(result["outdir"], "manifest.json")) as f:
+            artifacts = json.load(f)["artifacts"]
+        names = sorted(name for name in artifacts if name.endswith("Stack"))
+        assert names == [f"ecspipeline-{env_name}-AppStack", f"ecspipeline-{env_name}-BaseStack"]
+        stacks.append(names)
+    assert len({tuple(names) for names in stacks}) == 3
@@ -0,0 +1,60 @@
+import pytest
+
+from pipelines.ip_capacity import SubnetCapacityError, peak_tasks, plan_task_subnets, usable_ips
+
+
+@pytest.mark.parametrize("max_capacity, percent, expected", [
+    (5, 200, 10),
+    (5, 150, 8),
+    (5, 100, 5),
+    # A maximum percent under 100 never runs fewer tasks than the service has
+    (5, 50, 5),
+])
+def test_peak_tasks(max_capacity, percent, expected):
+    assert peak_tasks(max_capacity, percent) == expected
+
+
+def test_usable_ips():
+    assert usable_ips(24) == 251
+    assert usable_ips(28) == 11
+
+
+def test_keeps_the_configured_mask_when_it_fits():
+    plan = plan_task_subnets(vpc_cidr="10.0.0.0/16", max_azs=2, max_capacity=5)
+    assert plan.cidr_mask == 24
+    assert (plan.peak_tasks, plan.tasks_per_az) == (10, 5)
+    # Tasks, the ALB's 8 addresses and the NAT gateway
+    assert plan.demand_per_subnet == 5 + 8 + 1
+
+
+def test_grows_the_mask_for_peak_demand():
+    # 1000 tasks at peak, 500 per AZ: 509 addresses do not fit a /23 (507)
+    plan = plan_task_subnets(vpc_cidr="10.0.0.0/16", max_azs=2, max_capacity=500)
+    assert plan.cidr_mask == 22
+    assert plan.usable_per_subnet >= plan.demand_per_subnet == 509
+
+
+def test_lower_maximum_percent_needs_fewer_addresses():
+    plan = plan_task_subnets(vpc_cidr="10.0.0.0/16", max_azs=2, max_capacity=500, deployment_max_percent=100)
+    assert plan.cidr_mask == 23
+
+
+def test_fails_when_no_subnet_is_large_enough():
+    with pytest.raises(SubnetCapacityError) as error:
+        plan_task_subnets(vpc_cidr="10.0.0.0/8", max_azs=2, max_capacity=100000)
+    message = str(error.value)
+    assert "200000 tasks" in message
+    assert "Lower MAX_CAPACITY or add AZs" in message
+
+
+def test_fails_when_the_subnets_outgrow_the_vpc():
+    with pytest.raises(SubnetCapacityError) as error:
+        plan_task_subnets(vpc_cidr="10.0.0.0/24", max_azs=2, max_capacity=60, cidr_mask=26, other_cidr_masks=(26,))
+    message = str(error.value)
+    assert "/25 task subnets" in message
+    assert "VPC_CIDR 10.0.0.0/24 has 256" in message
+
+
+def test_rejects_masks_aws_does_not_allow():
+    with pytest.raises(SubnetCapacityError):
+        plan_task_subnets(vpc_cidr="10.0.0.0/16", max_azs=2, max_capacity=1, cidr_mask=30)
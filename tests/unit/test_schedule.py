@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+from pipelines.schedule import TrafficProfile, hourly_minimums, load_traffic_profile, scheduled_minimums
+
+
+def business_hours(rps=1000.0, **kwargs):
+    hourly = [rps if 8 <= hour < 18 else 0.0 for hour in range(24)]
+    return TrafficProfile(hourly_rps=hourly, task_rps=100.0, headroom_pct=0.0, **kwargs)
+
+
+def test_hourly_minimums_apply_headroom_and_bounds():
+    profile = TrafficProfile(hourly_rps=[0.0] * 23 + [1000.0], task_rps=100.0, headroom_pct=30.0)
+    needed = hourly_minimums(profile, min_capacity=2, max_capacity=20)
+    assert needed[0] == 2
+    assert needed[23] == 13
+
+
+def test_minimum_is_raised_ahead_of_traffic_and_lowered_after():
+    actions = scheduled_minimums(business_hours(), min_capacity=1, max_capacity=20)
+    assert [(a.hour, a.minute, a.min_capacity) for a in actions] == [(7, 45, 10), (18, 0, 1)]
+    assert actions[0].name == "MinCapacity0745"
+    assert actions[0].reason == "p95 1000 rps at 08:00"
+
+
+def test_lead_time_follows_the_profile():
+    actions = scheduled_minimums(business_hours(lead_minutes=30), min_capacity=1, max_capacity=20)
+    assert (actions[0].hour, actions[0].minute) == (7, 30)
+
+
+def test_minimum_is_capped_at_max_capacity():
+    actions = scheduled_minimums(business_hours(rps=5000.0), min_capacity=1, max_capacity=20)
+    assert actions[0].min_capacity == 20
+
+
+def test_flat_profile_sets_one_minimum_for_the_day():
+    profile = TrafficProfile(hourly_rps=[500.0] * 24, task_rps=100.0, headroom_pct=0.0)
+    actions = scheduled_minimums(profile, min_capacity=1, max_capacity=20)
+    assert [(a.hour, a.minute, a.min_capacity) for a in actions] == [(0, 0, 5)]
+
+
+def test_quiet_profile_needs_no_actions():
+    profile = TrafficProfile(hourly_rps=[10.0] * 24, task_rps=100.0)
+    assert scheduled_minimums(profile, min_capacity=1, max_capacity=20) == []
+
+
+def write_profile(tmp_path, **spec):
+    path = tmp_path / "profile.json"
+    path.write_text(json.dumps({"task_rps": 100, **spec}))
+    return str(path)
+
+
+def test_load_traffic_profile(tmp_path):
+    path = write_profile(tmp_path, percentile="p50", hours=[{"hour": 9, "p50": 400, "p95": 900}])
+    profile = load_traffic_profile(path)
+    assert profile.hourly_rps[9] == 400
+    assert profile.hourly_rps[10] == 0
+    assert load_traffic_profile(path, "p95").hourly_rps[9] == 900
+
+
+@pytest.mark.parametrize("spec, message", [
+    ({"hours": [{"hour": 24, "p95": 1}]}, "outside 0..23"),
+    ({"hours": [{"hour": 3, "p50": 1}]}, "has no p95 value"),
+    ({"hours": [], "task_rps": 0}, "task_rps must be positive"),
+])
+def test_load_traffic_profile_errors(tmp_path, spec, message):
+    with pytest.raises(ValueError, match=message):
+        load_traffic_profile(write_profile(tmp_path, **spec))
@@ -0,0 +1,118 @@
+import pytest
+
+from pipelines import deployments
+from pipelines.synth_cache import KEY_FILE, SynthCache, explain_miss
+
+
+@pytest.fixture
+def app(clean_env, write_env, tmp_path):
+    """An app directory and a rolling deployment configured from a temporary .env."""
+    write_env()
+    clean_env.setitem(deployments.DEPLOYMENTS, "rolling", str(tmp_path))
+    app_dir = tmp_path / "app"
+    app_dir.mkdir()
+    (app_dir / "app.py").write_text("print('app')\n")
+    (app_dir / "cdk.json").write_text('{"app": "python3 app.py"}\n')
+    outdir = tmp_path / "cdk.out"
+    outdir.mkdir()
+    clean_env.setenv("CDK_OUTDIR", str(outdir))
+    return app_dir, outdir
+
+
+def synthesize(app_dir, outdir, names=("rolling",)):
+    """What app.py does: check the cache, write an assembly on a miss, store the key."""
+    cache = SynthCache.from_environment(str(app_dir), names)
+    if cache.hit():
+        return True
+    (outdir / "manifest.json").write_text("{}")
+    (outdir / "Stack.template.json").write_text('{"Resources": {}}')
+    cache.store()
+    return False
+
+
+def miss_reason(capsys):
+    return capsys.readouterr().err
+
+
+def test_unchanged_inputs_hit(app, capsys):
+    assert not synthesize(*app)
+    assert "no previous synthesis" in miss_reason(capsys)
+    assert (app[1] / KEY_FILE).exists()
+    assert synthesize(*app)
+    assert "synth cache: hit" in capsys.readouterr().err
+
+
+def test_changed_source_misses(app, capsys):
+    app_dir, outdir = app
+    synthesize(app_dir, outdir)
+    (app_dir / "app.py").write_text("print('changed')\n")
+    assert not synthesize(app_dir, outdir)
+    assert "app/app.py changed" in miss_reason(capsys)
+
+
+def test_changed_config_misses(app, write_env, capsys):
+    synthesize(*app)
+    write_env(MAX_CAPACITY=7)
+    assert not synthesize(*app)
+    reasons = miss_reason(capsys)
+    assert "config rolling.max_capacity changed" in reasons
+    # Derived defaults that did not change are not listed
+    assert "desired_count" not in reasons
+
+
+def test_changed_deployments_skip_the_config_diff(app, clean_env, tmp_path, capsys):
+    synthesize(*app)
+    clean_env.setitem(deployments.DEPLOYMENTS, "bluegreen", str(tmp_path))
+    assert not synthesize(*app, names=("rolling", "bluegreen"))
+    reasons = miss_reason(capsys)
+    assert "deployments" in reasons
+    assert "config" not in reasons
+
+
+def test_changed_budgets_miss(app, clean_env, tmp_path, capsys):
+    synthesize(*app)
+    budgets = tmp_path / "budgets.json"
+    budgets.write_text('{"default": {"resources": 10}}')
+    clean_env.setenv("CDK_TEMPLATE_BUDGETS", str(budgets))
+    assert not synthesize(*app)
+    assert "budgets.json added" in miss_reason(capsys)
+    # Turning the check off changes the key as well
+    synthesize(*app)
+    clean_env.setenv("CDK_TEMPLATE_BUDGETS", "0")
+    assert not synthesize(*app)
+    assert "CDK_TEMPLATE_BUDGETS=0 added" in miss_reason(capsys)
+
+
+def test_modified_assembly_misses(app, capsys):
+    synthesize(*app)
+    (app[1] / "Stack.template.json").write_text('{"Resources": {"Added": {}}}')
+    assert not synthesize(*app)
+    assert "1 assembly file(s) missing or modified, e.g. Stack.template.json" in miss_reason(capsys)
+
+
+def test_assembly_edit_of_the_same_size_misses(app, capsys):
+    synthesize(*app)
+    # Same length as what synthesize() wrote
+    (app[1] / "Stack.template.json").write_text('{"Resources": []}')
+    assert not synthesize(*app)
+    assert "1 assembly file(s) missing or modified, e.g. Stack.template.json" in miss_reason(capsys)
+
+
+def test_disabled_without_the_cli_or_when_asked(app, clean_env):
+    clean_env.setenv("CDK_SYNTH_CACHE", "0")
+    assert SynthCache.from_environment(str(app[0]), ("rolling",)).outdir is None
+    clean_env.delenv("CDK_SYNTH_CACHE")
+    clean_env.delenv("CDK_OUTDIR")
+    cache = SynthCache.from_environment(str(app[0]), ("rolling",))
+    assert not cache.hit()
+    cache.store()
+
+
+def test_explain_miss_summarizes_many_changes():
+    before = {"deployments": ["rolling"], "sources": {f"f{i}": "a" for i in range(8)}, "config": {},
+              "cdk_version": "2.1.0", "context": "x", "python": "3.11"}
+    after = dict(before, sources={f"f{i}": "b" for i in range(8)}, cdk_version="2.2.0")
+    reasons = explain_miss(before, after)
+    assert reasons[:5] == [f"sources f{i} changed" for i in range(5)]
+    assert reasons[5:] == ["3 more sources changes", "cdk_version 2.1.0 -> 2.2.0"]
+    assert explain_miss(before, before) == []
@@ -0,0 +1,103 @@
+import json
+
+import pytest
+
+from pipelines.template_budget import (
+    LIMITS, TemplateBudgetError, TemplateStats, budget_for, check, collect, enforce, load_budgets, load_history, record,
+    trend,
+)
+
+
+def stats(stack="App", **metrics):
+    values = {"size_bytes": 1000, "resources": 10, "parameters": 0, "outputs": 0, "mappings": 0, **metrics}
+    return TemplateStats(stack=stack, file=f"{stack}.template.json", nested=False, **values)
+
+
+def budgets(**overrides):
+    return {"default": {"resources": 100}, "warn_pct": 90, "stacks": {}, **overrides}
+
+
+@pytest.mark.parametrize("resources, level", [
+    (50, None),
+    (90, "warn"),
+    (100, "warn"),
+    (101, "budget"),
+    (501, "limit"),
+])
+def test_check_levels(resources, level):
+    findings = check([stats(resources=resources)], budgets())
+    assert [finding.level for finding in findings] == ([level] if level else [])
+    if level:
+        allowed = LIMITS["resources"] if level == "limit" else 100
+        assert (findings[0].metric, findings[0].value, findings[0].allowed) == ("resources", resources, allowed)
+
+
+def test_finding_description():
+    finding, = check([stats(resources=101)], budgets())
+    assert finding.describe() == "App: resources 101 is over budget (100)"
+
+
+def test_defaults_are_a_share_of_the_limits():
+    budget = budget_for(load_budgets(None), "App")
+    assert budget["size_bytes"] == LIMITS["size_bytes"] * 80 // 100
+    assert budget["resources"] == 400
+
+
+def test_first_matching_stack_pattern_wins():
+    rules = budgets(stacks={"*ECS*": {"resources": 20}, "*": {"resources": 50}})
+    assert budget_for(rules, "prodECSFargateStack")["resources"] == 20
+    assert budget_for(rules, "prodALBStack")["resources"] == 50
+    assert budget_for(rules, "prodALBStack")["size_bytes"] == LIMITS["size_bytes"] * 80 // 100
+
+
+def test_load_budgets_rejects_unknown_metrics(tmp_path):
+    path = tmp_path / "budgets.json"
+    path.write_text(json.dumps({"stacks": {"*": {"resource": 10}}}))
+    with pytest.raises(ValueError, match="unknown budget metric"):
+        load_budgets(str(path))
+
+
+def test_collect_counts_nested_templates(tmp_path):
+    (tmp_path / "App.template.json").write_text(json.dumps({"Resources": {"A": {}}, "Outputs": {"O": {}}}))
+    stage = tmp_path / "assembly-Prod"
+    stage.mkdir()
+    (stage / "Inner.nested.template.json").write_text(json.dumps({"Resources": {"B": {}, "C": {}}}))
+    (tmp_path / "manifest.json").write_text("{}")
+    found = {template.stack: template for template in collect(str(tmp_path))}
+    assert set(found) == {"App", "Inner"}
+    assert (found["App"].resources, found["App"].outputs, found["App"].nested) == (1, 1, False)
+    assert (found["Inner"].resources, found["Inner"].nested) == (2, True)
+    assert found["Inner"].file == "assembly-Prod/Inner.nested.template.json"
+
+
+def test_record_only_appends_changes_and_trend_compares_with_the_last(tmp_path):
+    history = str(tmp_path / "history.jsonl")
+    assert record([stats(resources=10)], history)
+    assert not record([stats(resources=10)], history)
+    assert record([stats(resources=12)], history)
+    assert len(load_history(history)) == 2
+    assert trend([stats(resources=15)], load_history(history))["App"]["resources"] == 3
+
+
+def test_enforce_fails_synthesis_on_a_breach(tmp_path, monkeypatch):
+    monkeypatch.delenv("CDK_TEMPLATE_BUDGETS", raising=False)
+    monkeypatch.delenv("CDK_TEMPLATE_HISTORY", raising=False)
+    assembly = tmp_path / "cdk.out"
+    assembly.mkdir()
+    (assembly / "App.template.json").write_text(json.dumps({"Resources": {str(i): {} for i in range(5)}}))
+    rules = tmp_path / "budgets.json"
+    rules.write_text(json.dumps({"default": {"resources": 4}}))
+    history = str(tmp_path / "history.jsonl")
+    with pytest.raises(TemplateBudgetError, match="1 template budget breach") as error:
+        enforce(str(assembly), str(rules), history)
+    assert "App: resources 5 is over budget (4)" in str(error.value)
+    assert [finding.metric for finding in error.value.findings] == ["resources"]
+    # Only recorded when asked
+    assert load_history(history) == []
+    monkeypatch.setenv("CDK_TEMPLATE_HISTORY", "1")
+    with pytest.raises(TemplateBudgetError):
+        enforce(str(assembly), str(rules), history)
+    assert len(load_history(history)) == 1
+
+    monkeypatch.setenv("CDK_TEMPLATE_BUDGETS", "0")
+    enforce(str(assembly), str(rules), history)